@@ -1,6 +1,7 @@
+import os
 from typing import Optional
 
-from pydantic import Field, SecretStr
+from pydantic import Field, SecretStr, model_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -14,6 +15,7 @@ class AppConfig(BaseSettings):
     log_file: str = "bailiff.log"
     log_level: str = "INFO"
     data_dir: str = "data"
+    offline: bool = False # never contact model hubs; load prefetched models only
 
 class AudioConfig(BaseSettings):
     """
@@ -21,8 +23,43 @@ class AudioConfig(BaseSettings):
     """
     sample_rate: int = 16000
     chunk_size: int = 512
-    vad_threshold: float = 0.5
-    silence_limit: float = 1.0 # seconds
+    source_mode: str = "mixed" # "mixed" (one stream) or "separate" (mic and loopback endpointed apart)
+    vad_threshold: float = 0.5 # smoothed speech probability that starts an utterance
+    vad_stop_threshold: float = 0.35 # smoothed speech probability below which silence is counted
+    vad_smoothing: float = 0.5 # weight of the newest probability in the moving average
+    vad_backend: str = "torch" # "torch" (torch.hub) or "onnx" (ONNX Runtime)
+    vad_onnx_path: Optional[str] = None
+    vad_max_batch: int = 8 # chunks scored per VAD call when a backlog builds up
+    energy_gate: bool = True # skip the VAD model on chunks near the noise floor
+    energy_gate_ratio: float = 3.0 # RMS above the noise floor needed to open the gate
+    energy_gate_hangover: float = 0.3 # seconds
+    silence_limit: float = 0.5 # seconds of silence that end an utterance
+    speech_pad: float = 0.2 # seconds of audio kept before and after speech
+    min_speech_duration: float = 0.25 # seconds; shorter utterances are discarded
+    jitter_buffer: float = 0.1 # seconds of loopback buffered to absorb clock jitter
+    max_segment_duration: float = 15.0 # seconds; longer speech is split to bound ASR latency
+    segment_overlap: float = 0.5 # seconds repeated at the start of the next split segment
+    split_search_window: float = 2.0 # seconds before the limit searched for the quietest cut
+    partial_interval: float = 0.0 # seconds between partial transcript updates during speech; 0 disables
+    preprocessing: list[str] = ["highpass", "agc"] # stages: "highpass", "agc", "noise_gate"
+    shared_buffer_seconds: float = 300.0 # capacity of the shared-memory audio ring
+    replay_mic: Optional[str] = None # replay a recorded mic track instead of capturing
+    replay_loopback: Optional[str] = None # recorded loopback track used with replay_mic
+    replay_speed: float = 1.0 # 1.0 = real time, N = N times faster, 0 = as fast as possible
+    capture_queue: float = 2.0 # seconds of audio buffered per capture thread; older live audio is dropped
+    capture_backend: str = "auto" # "wasapi" (Windows), "pulse" (Linux PulseAudio/PipeWire) or "auto"
+    loopback_source: Optional[str] = None # pulse source for system audio; default sink's monitor if unset
+
+    @model_validator(mode="after")
+    def check_segment_split(self) -> "AudioConfig":
+        # Splitting long speech cuts after the overlap, so the limit must clearly exceed it
+        chunk_duration = self.chunk_size / self.sample_rate
+        if self.segment_overlap < 0:
+            raise ValueError(f"segment_overlap must not be negative, got {self.segment_overlap}")
+        if self.max_segment_duration <= self.segment_overlap + 2 * chunk_duration:
+            raise ValueError(f"max_segment_duration ({self.max_segment_duration}s) must exceed "
+                             f"segment_overlap ({self.segment_overlap}s) by more than two chunks")
+        return self
 
 class ModelsConfig(BaseSettings):
     """
@@ -44,6 +81,8 @@ class DiarizationConfig(BaseSettings):
     inertia_weight: float = 0.1
     merge_timeout: float = 8.0
     segment_timeout: float = 3.0
+    local_speaker: Optional[str] = "You" # label for mic speech in separate-source mode; None clusters it too
+    max_batch: int = 8 # queued utterances embedded in one forward pass when diarization falls behind
 
 class TranscriptionConfig(BaseSettings):
     """
@@ -52,9 +91,50 @@ class TranscriptionConfig(BaseSettings):
     model_size: str = "deepdml/faster-whisper-large-v3-turbo-ct2"
     device: str = "cuda"
     compute_type: str = "float16"
-    language: Optional[str] = None
+    language: Optional[str] = None # None: detected once per session
+    language_votes: int = 3 # confident detections needed to lock the session language
+    language_confidence: float = 0.8
+    language_recheck: int = 25 # utterances between re-detections once locked
+    batch_size: int = 8 # utterances decoded together when the queue backs up
+    batch_wait: float = 0.05 # seconds to wait for more ready utterances before decoding
+    workers: int = 1 # transcription processes, each with its own model
+    cpu_threads: int = 0 # CTranslate2 threads per worker; 0 = automatic
+    word_timestamps: bool = False # per-word timings on every segment (slower decoding)
+    adaptive_decoding: bool = True # degrade beam size (then model) when behind real time
+    fallback_model: Optional[str] = None # smaller model preloaded for heavy load, e.g. "base"
+    degrade_backlog: int = 4 # utterances waiting before decoding degrades
+    degrade_rtf: float = 0.8 # seconds of decoding per second of audio before decoding degrades
+    recover_rtf: float = 0.5 # below this (and an empty queue) full quality comes back
+    filter_hallucinations: bool = True
+    no_speech_threshold: float = 0.6 # with avg_logprob below log_prob_threshold: silence
+    log_prob_threshold: float = -1.0
+    min_log_prob: float = -1.5 # rejected even when speech was detected
+    compression_ratio_threshold: float = 2.4 # higher means looping output
+    max_repeats: int = 4 # times a short phrase may repeat in a row
+    hallucination_blocklist: list[str] = [
+        "subtitles by", "amara.org", "thanks for watching", "thank you for watching",
+        "please subscribe", "like and subscribe",
+    ]
 
 
+class PipelineConfig(BaseSettings):
+    """
+    Sizes and overflow policies of the queues between pipeline stages.
+    Policies: "block" (backpressure), "drop_oldest" or "coalesce" (merge adjacent audio).
+    """
+    transcription_queue_size: int = 16 # utterances
+    transcription_policy: str = "coalesce"
+    diarization_queue_size: int = 16 # utterances
+    diarization_policy: str = "drop_oldest"
+    event_queue_size: int = 256 # text segments, speaker labels, questions and answers
+    max_coalesce: float = 30.0 # seconds; longest chunk built by merging a transcription backlog
+    lag_warning: float = 5.0 # seconds an item may wait in a queue before the UI warns
+    warmup: bool = True # run a dummy inference after loading each model
+    ready_timeout: float = 120.0 # seconds capture waits for transcription and diarization to load
+    thread_budget: bool = True # split the cores between stages instead of every library using all of them
+    cpu_cores: int = 0 # cores the budget divides; 0 = every core available to the process
+    pin_cpus: bool = False # pin each stage process to its own cores (Linux)
+
 class Settings(BaseSettings):
     """
     Global application settings, aggregating all module configurations.
@@ -64,6 +144,7 @@ class Settings(BaseSettings):
     models: ModelsConfig
     diarization: DiarizationConfig
     transcription: TranscriptionConfig
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
 
     class Config:
         env_prefix = "BAILIFF_"
@@ -99,3 +180,7 @@ def load_settings() -> Settings:
     return _settings_instance
 
 settings = load_settings()
+
+if settings.app.offline:
+    # Read by huggingface_hub when it is imported; spawned stage processes inherit it
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
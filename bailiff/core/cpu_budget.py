@@ -0,0 +1,240 @@
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("bailiff.core.cpu_budget")
+
+# Read by OpenMP, MKL and OpenBLAS when they initialise (e.g. torch imported after the budget is applied)
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@dataclass
+class StageDemand:
+    """
+    What a stage asks of the thread budget: a minimum, a share of the spare cores and a cap.
+    """
+    stage: str
+    minimum: int = 1
+    weight: float = 0.0          # share of the cores left after every minimum is met
+    maximum: int | None = None   # more threads stop helping beyond this
+
+
+@dataclass
+class StageThreads:
+    """
+    Threads (and optionally cores) given to one stage process.
+    """
+    stage: str
+    intra_op: int                # threads inside one op / CTranslate2 cpu_threads
+    inter_op: int = 1            # ops run concurrently / CTranslate2 num_workers
+    cpus: list[int] = field(default_factory=list)   # cores the process is pinned to; empty = not pinned
+
+
+def available_cpus() -> list[int]:
+    """
+    Cores this process may run on (respects taskset/cgroup limits where the OS reports them).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_threads(demands: list[StageDemand], cpus: list[int], pin: bool = False) -> dict[str, StageThreads]:
+    """
+    Split `cpus` between stages: every stage gets its minimum, then spare cores go one at a
+    time to the stage with the highest weight per thread already held (below its maximum).
+
+    With `pin`, stages get consecutive, disjoint slices of `cpus` in demand order. When the
+    minimums alone exceed the cores, the largest are cut down (to one thread at least) so
+    the slices fit; only with more stages than cores do they wrap around and share cores.
+    Unpinned stages keep their minimums and the OS shares the cores.
+    """
+    threads = {d.stage: d.minimum for d in demands}
+    spare = len(cpus) - sum(threads.values())
+    if spare < 0:
+        logger.warning("Thread minimums (%s) exceed the %d available cores%s",
+                       ", ".join(f"{stage} {n}" for stage, n in threads.items()), len(cpus),
+                       ", reducing the largest to fit" if pin and len(demands) <= len(cpus)
+                       else "; stages will share cores")
+    while pin and spare < 0:
+        stage = max(threads, key=threads.get)
+        if threads[stage] <= 1:
+            break
+        threads[stage] -= 1
+        spare += 1
+    while spare > 0:
+        growing = [d for d in demands if d.weight > 0 and (d.maximum is None or threads[d.stage] < d.maximum)]
+        if not growing:
+            break
+        best = max(growing, key=lambda d: d.weight / threads[d.stage])
+        threads[best.stage] += 1
+        spare -= 1
+
+    plan = {}
+    offset = 0
+    for d in demands:
+        pinned = [cpus[(offset + i) % len(cpus)] for i in range(threads[d.stage])] if pin and cpus else []
+        offset += threads[d.stage]
+        plan[d.stage] = StageThreads(d.stage, threads[d.stage], 1, pinned)
+    return plan
+
+
+def pipeline_demands(transcription_workers: int = 1, device: str = "cpu",
+                     cpu_threads: int = 0) -> list[StageDemand]:
+    """
+    Thread demands of the stages that run native inference. Merge and the assistant only
+    move Python objects and wait on HTTP, so they are left out of the budget.
+    """
+    if cpu_threads > 0:
+        # An explicit transcription.cpu_threads is kept as is
+        tx = dict(minimum=cpu_threads, maximum=cpu_threads)
+    elif device == "cpu":
+        tx = dict(minimum=1, weight=3.0)
+    else:
+        # Decoding runs on the GPU; the CPU only feeds it
+        tx = dict(minimum=1, maximum=2, weight=1.0)
+    names = ["transcription"] if transcription_workers <= 1 else [
+        f"transcription-worker-{i}" for i in range(transcription_workers)
+    ]
+    return [
+        # Silero scores one 32 ms window at a time; a single thread is the fastest
+        StageDemand("audio-ingest", minimum=1, maximum=1),
+        *[StageDemand(name, **tx) for name in names],
+        # ECAPA on a few seconds of audio stops scaling after a handful of threads
+        StageDemand("diarization", minimum=1, weight=1.0, maximum=4),
+        StageDemand("memory", minimum=1, maximum=1),
+    ]
+
+
+def apply_threads(threads: StageThreads | None):
+    """
+    Apply a stage's share of the budget in its own process, before its models load.
+    """
+    if threads is None:
+        return
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads.intra_op)
+
+    if threads.cpus:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, threads.cpus)
+        else:
+            logger.warning("CPU pinning is not supported on this platform, %s runs unpinned", threads.stage)
+
+    # Stages that already imported torch (VAD, SpeechBrain) need it set directly
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads.intra_op)
+        try:
+            torch.set_num_interop_threads(threads.inter_op)
+        except RuntimeError:
+            # Only possible before torch starts its inter-op pool (e.g. inherited through fork)
+            logger.debug("torch inter-op threads already started, keeping %d", torch.get_num_interop_threads())
+
+    logger.info("Thread budget for %s: %d intra-op, %d inter-op%s", threads.stage, threads.intra_op,
+                threads.inter_op, f", pinned to {threads.cpus}" if threads.cpus else "")
+
+
+def _bench_stage(stage: str, threads: StageThreads | None, audio, rounds: int, start, results):
+    """
+    Benchmark worker: load one stage's model, wait at `start` for every stage, then time
+    `rounds` inferences on `audio` while the other stages run theirs.
+    """
+    import time
+
+    import numpy as np
+
+    apply_threads(threads)
+    if stage == "audio-ingest":
+        from bailiff.core.config import settings
+        from bailiff.features.audio_ingest.vad import VADEngine
+        vad = VADEngine(backend=settings.audio.vad_backend, onnx_path=settings.audio.vad_onnx_path)
+        windows = audio[:len(audio) // 512 * 512].reshape(-1, 512)
+        run = lambda: [vad.speech_probs(windows[i:i + 1]) for i in range(len(windows))]
+    elif stage == "diarization":
+        from bailiff.core.config import settings
+        from bailiff.core.events import AudioChunk
+        from bailiff.features.diarization.engine import DiarizationEngine
+        engine = DiarizationEngine(None, None, model_source=settings.models.voice_embedding)
+        chunk = AudioChunk(audio, 16000, 0.0, len(audio) / 16000)
+        run = lambda: engine.embed_batch([chunk])
+    else:
+        from bailiff.core.config import settings
+        from bailiff.features.transcription.engine import WhisperEngine
+        from bailiff.features.transcription.pool import worker_threads
+        # Without a budget: what SessionManager did before, cores split evenly across workers
+        engine = WhisperEngine(
+            cpu_threads=threads.intra_op if threads else worker_threads(
+                max(1, settings.transcription.workers), settings.transcription.cpu_threads),
+            num_workers=threads.inter_op if threads else 1,
+        )
+        engine.load()
+        run = lambda: engine.transcribe(audio)
+
+    run()   # warm up
+    start.wait()
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - started)
+    results.put((stage, float(np.mean(latencies)), float(np.percentile(latencies, 95))))
+
+
+if __name__ == "__main__":
+    """
+    Library default thread pools vs the thread budget, with every CPU-heavy stage busy at once.
+
+    Usage: python -m bailiff.core.cpu_budget SPEECH.wav [ROUNDS]
+    Each stage process repeatedly runs its model on a 5 s clip of the file (VAD window by
+    window); reports mean and p95 latency per stage and the wall-clock time of the run.
+    """
+    import multiprocessing
+    import time
+
+    import numpy as np
+    from scipy.signal import resample_poly
+
+    from bailiff.core.config import settings
+    from bailiff.features.audio_ingest.replay import load_audio
+
+    frames, rate = load_audio(sys.argv[1])
+    audio = frames.mean(axis=1).astype(np.float32)
+    if rate != 16000:
+        audio = resample_poly(audio, 16000, rate).astype(np.float32)
+    audio = audio[:5 * 16000]
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    workers = max(1, settings.transcription.workers)
+    demands = [d for d in pipeline_demands(workers, settings.transcription.device,
+                                           settings.transcription.cpu_threads) if d.stage != "memory"]
+    cpus = available_cpus()
+    print(f"{len(cpus)} cores, model {settings.transcription.model_size}, {workers} transcription worker(s)")
+
+    budgets = {
+        "defaults": {d.stage: None for d in demands},   # every library sizes its own pools
+        "budget": plan_threads(demands, cpus),
+        "budget+pin": plan_threads(demands, cpus, pin=True),
+    }
+    for label, plan in budgets.items():
+        # Every process loads and warms up its model, then all start together with the clock
+        start = multiprocessing.Barrier(len(plan) + 1)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_bench_stage, args=(stage, threads, audio, rounds, start, results),
+                                             daemon=True)
+                     for stage, threads in plan.items()]
+        for p in processes:
+            p.start()
+        start.wait()
+        started = time.perf_counter()
+        stats = sorted(results.get() for _ in processes)
+        elapsed = time.perf_counter() - started
+        for p in processes:
+            p.join()
+
+        print(f"\n{label}: {elapsed:.1f}s")
+        for stage, mean, p95 in stats:
+            threads = plan[stage]
+            shape = f"{threads.intra_op}x{threads.inter_op}" if threads else "default"
+            print(f"  {stage:24} threads {shape:8} mean {mean * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms")
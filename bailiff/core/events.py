@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 
@@ -12,6 +12,33 @@ class AudioChunk:
     timestamp: float
     duration: float
     is_speech: bool = True
+    source: str = "mixed"   # "mixed", or "mic" / "loopback" in separate-source mode
+    is_final: bool = True   # False: audio appended to an utterance still in progress
+    seq: int | None = None  # dispatch order inside a transcription worker pool
+
+@dataclass
+class AudioChunkRef:
+    """
+    Descriptor of an AudioChunk whose samples live in a SharedAudioBuffer.
+    """
+    offset: int
+    length: int
+    sample_rate: int
+    timestamp: float
+    duration: float
+    is_speech: bool = True
+    source: str = "mixed"
+    is_final: bool = True
+
+@dataclass
+class WordTiming:
+    """
+    A transcribed word and when it was spoken.
+    """
+    word: str
+    start_time: float
+    end_time: float
+    probability: float = 1.0
 
 @dataclass
 class TranscriptionSegment:
@@ -24,6 +51,9 @@ class TranscriptionSegment:
     duration: float
     speaker: str = "unknown"
     is_final: bool = True
+    source: str = "mixed"
+    words: list[WordTiming] = field(default_factory=list)  # with transcription.word_timestamps
+    decoder: str | None = None  # model and beam size that produced the text, e.g. "small beam=5"
 
 @dataclass
 class SearchRequest:
@@ -42,4 +72,5 @@ class DiarizationResult:
     speaker: str
     start_time: float
     end_time: float
+    source: str = "mixed"
 
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+
+from bailiff.core.config import settings
+
+logger = logging.getLogger("bailiff.core.model_registry")
+
+WHISPER = "whisper"
+SILERO_VAD = "silero-vad"
+SILERO_VAD_ONNX = "silero-vad-onnx"
+ECAPA = "ecapa"
+EMBEDDING = "embedding"
+
+CHROMA_EMBEDDING = "all-MiniLM-L6-v2"   # Chroma's default embedding model
+
+
+@dataclass
+class ModelEntry:
+    """
+    A model stored in the registry: where it came from, where it is and its file checksums.
+    """
+    kind: str
+    source: str
+    path: str                                   # relative to the registry root
+    format: str = ""
+    files: dict[str, str] = field(default_factory=dict)   # relative path -> sha256
+    fetched: float = 0.0
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Local store of every model the pipeline loads, under `app.data_dir/models`.
+
+    `bailiff models prefetch` downloads each model once, records the checksum of every file
+    in `registry.json`, and engines then load from the local path returned by `resolve()`
+    instead of asking Hugging Face or torch.hub, so startup works offline.
+    """
+    MANIFEST = "registry.json"
+
+    def __init__(self, root: str | None = None):
+        self.root = os.path.abspath(root or os.path.join(settings.app.data_dir, "models"))
+        self._entries: dict[str, ModelEntry] | None = None
+
+    @staticmethod
+    def key(kind: str, source: str) -> str:
+        return f"{kind}:{source}"
+
+    def entries(self) -> dict[str, ModelEntry]:
+        if self._entries is None:
+            manifest = os.path.join(self.root, self.MANIFEST)
+            try:
+                with open(manifest) as f:
+                    self._entries = {key: ModelEntry(**entry) for key, entry in json.load(f).items()}
+            except FileNotFoundError:
+                self._entries = {}
+        return self._entries
+
+    def directory(self, kind: str, source: str) -> str:
+        """
+        Where a model is (or will be) stored.
+        """
+        return os.path.join(self.root, kind, re.sub(r"[^\w.-]+", "--", source))
+
+    def resolve(self, kind: str, source: str) -> str | None:
+        """
+        Absolute path of a registered model, or None if it was not prefetched.
+        """
+        entry = self.entries().get(self.key(kind, source))
+        if entry is None:
+            return None
+        path = os.path.join(self.root, entry.path)
+        if not os.path.exists(path):
+            logger.warning("Registered model %s is missing from %s", self.key(kind, source), path)
+            return None
+        return path
+
+    def register(self, kind: str, source: str, path: str, format: str = "") -> ModelEntry:
+        """
+        Record a model stored at `path` (a file or a directory inside the registry).
+        """
+        path = os.path.abspath(path)
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(folder, name) for folder, _, names in os.walk(path) for name in names
+        ]
+        entry = ModelEntry(
+            kind=kind,
+            source=source,
+            path=os.path.relpath(path, self.root),
+            format=format,
+            files={os.path.relpath(f, self.root): _sha256(f) for f in sorted(files)},
+            fetched=time.time(),
+        )
+        self.entries()[self.key(kind, source)] = entry
+        self._save()
+        logger.info("Registered %s (%d files) at %s", self.key(kind, source), len(entry.files), entry.path)
+        return entry
+
+    def verify(self, key: str) -> list[str]:
+        """
+        Files of a registered model that are missing or whose checksum changed.
+        """
+        entry = self.entries()[key]
+        bad = []
+        for name, checksum in entry.files.items():
+            path = os.path.join(self.root, name)
+            if not os.path.isfile(path) or _sha256(path) != checksum:
+                bad.append(name)
+        return bad
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        manifest = os.path.join(self.root, self.MANIFEST)
+        with open(manifest + ".tmp", "w") as f:
+            json.dump({key: asdict(entry) for key, entry in self.entries().items()}, f, indent=2)
+        os.replace(manifest + ".tmp", manifest)
+
+
+def prefetch_whisper(registry: ModelRegistry, model: str, convert: bool = False,
+                     quantization: str | None = None) -> ModelEntry:
+    """
+    Download a faster-whisper (CTranslate2) model. With `convert`, a Hugging Face
+    Transformers Whisper checkpoint (e.g. openai/whisper-small) is converted to CTranslate2
+    first; a failed conversion is an error, not a silent fallback to downloading.
+    """
+    from faster_whisper import available_models, download_model
+
+    target = registry.directory(WHISPER, model)
+    if convert and model in available_models():
+        # Size names (small, large-v3, ...) already resolve to CTranslate2 repositories
+        logger.warning("%s is already a CTranslate2 model, downloading it without conversion", model)
+    elif convert and not os.path.isdir(model):
+        from ctranslate2.converters import TransformersConverter
+        try:
+            converter = TransformersConverter(model, copy_files=["tokenizer.json", "preprocessor_config.json"])
+            converter.convert(target, quantization=quantization, force=True)
+        except Exception as e:
+            logger.error("Could not convert %s to CTranslate2: %s", model, e)
+            raise RuntimeError(f"Converting Whisper model '{model}' failed; pass a Transformers "
+                               f"checkpoint or drop --convert") from e
+        return registry.register(WHISPER, model, target, "ctranslate2")
+
+    download_model(model, output_dir=target)
+    return registry.register(WHISPER, model, target, "ctranslate2")
+
+
+def prefetch_silero(registry: ModelRegistry, repo: str = "snakers4/silero-vad", onnx: bool = False) -> list[ModelEntry]:
+    """
+    Download the Silero VAD torch.hub repository; with `onnx`, also register its ONNX model
+    for the onnx VAD backend.
+    """
+    import torch
+
+    target = registry.directory(SILERO_VAD, repo)
+    hub_dir = os.path.join(registry.root, "torch_hub")
+    torch.hub.set_dir(hub_dir)
+    torch.hub.load(repo, model="silero_vad", force_reload=True, onnx=False, trust_repo=True)
+    owner, name = repo.split("/")
+    downloaded = [os.path.join(hub_dir, d) for d in os.listdir(hub_dir) if d.startswith(f"{owner}_{name}_")]
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    shutil.copytree(downloaded[0], target)
+    entries = [registry.register(SILERO_VAD, repo, target, "torch.hub")]
+
+    if onnx:
+        models = [os.path.join(folder, f) for folder, _, names in os.walk(target)
+                  for f in names if f == "silero_vad.onnx"]
+        if models:
+            onnx_target = registry.directory(SILERO_VAD_ONNX, repo) + ".onnx"
+            shutil.copyfile(models[0], onnx_target)
+            entries.append(registry.register(SILERO_VAD_ONNX, repo, onnx_target, "onnx"))
+        else:
+            logger.warning("No ONNX model in the %s repository", repo)
+    return entries
+
+
+def prefetch_ecapa(registry: ModelRegistry, source: str) -> ModelEntry:
+    """
+    Download the SpeechBrain speaker embedding model.
+    """
+    from speechbrain.pretrained import EncoderClassifier
+
+    target = registry.directory(ECAPA, source)
+    EncoderClassifier.from_hparams(source=source, savedir=target, run_opts={"device": "cpu"})
+    return registry.register(ECAPA, source, target, "speechbrain")
+
+
+def prefetch_embedding(registry: ModelRegistry) -> ModelEntry:
+    """
+    Download the ONNX sentence embedding model Chroma uses for transcript search.
+    """
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    target = registry.directory(EMBEDDING, CHROMA_EMBEDDING)
+    embedding_fn = ONNXMiniLM_L6_V2()
+    embedding_fn.DOWNLOAD_PATH = target
+    embedding_fn(["prefetch"])
+    return registry.register(EMBEDDING, CHROMA_EMBEDDING, target, "onnx")
+
+
+def prefetch_all(registry: ModelRegistry, convert: bool = False, only: list[str] | None = None) -> list[ModelEntry]:
+    """
+    Fetch every model the configured pipeline uses.
+    """
+    wanted = lambda kind: only is None or kind in only
+    entries = []
+    if wanted(WHISPER):
+        models = [settings.transcription.model_size]
+        if settings.transcription.fallback_model:
+            models.append(settings.transcription.fallback_model)
+        for model in models:
+            entries.append(prefetch_whisper(registry, model, convert, settings.transcription.compute_type))
+    if wanted(SILERO_VAD):
+        entries += prefetch_silero(registry, onnx=convert or settings.audio.vad_backend == "onnx")
+    if wanted(ECAPA):
+        entries.append(prefetch_ecapa(registry, settings.models.voice_embedding))
+    if wanted(EMBEDDING):
+        entries.append(prefetch_embedding(registry))
+    return entries
@@ -0,0 +1,230 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from bailiff.core.events import AudioChunk
+
+logger = logging.getLogger("bailiff.core.queues")
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+# Indexes into the shared statistics array
+_PUT, _GOT, _DROPPED, _MERGED, _WAIT_TOTAL, _WAIT_MAX, _WAIT_LAST = range(7)
+
+
+@dataclass
+class QueueStats:
+    """
+    Snapshot of a BoundedQueue's counters.
+    """
+    name: str
+    policy: str
+    maxsize: int
+    backlog: int
+    put: int
+    taken: int          # items taken off the queue (including discarded ones)
+    dropped: int
+    merged: int
+    mean_wait: float   # seconds an item spent in the queue
+    max_wait: float
+    last_wait: float
+
+
+def merge_audio_chunks(first: AudioChunk, second: AudioChunk) -> AudioChunk:
+    """
+    Join two chunks of the same source into one, on the same timeline: a gap between them
+    becomes silence and audio they share (split overlap) is kept once.
+    """
+    gap = int(round((second.timestamp - first.timestamp - first.duration) * first.sample_rate))
+    if gap >= 0:
+        data = np.concatenate((first.data, np.zeros(gap, dtype=np.float32), second.data))
+    else:
+        data = np.concatenate((first.data, second.data[min(-gap, len(second.data)):]))
+    return AudioChunk(
+        data=data,
+        sample_rate=first.sample_rate,
+        timestamp=first.timestamp,
+        duration=len(data) / first.sample_rate,
+        is_speech=first.is_speech or second.is_speech,
+        source=first.source,
+    )
+
+
+class BoundedQueue:
+    """
+    Queue with a maximum size, an overflow policy and statistics.
+
+    - `block`: put() waits for room, pushing back on the producer.
+    - `drop_oldest`: put() discards the oldest item to make room and counts the drop.
+    - `coalesce`: put() waits like `block`, while get() merges the queued AudioChunks that
+      follow the one it takes (same source, at most `max_gap` seconds apart) into a chunk
+      of up to `max_coalesce` seconds, so a slow consumer catches up with fewer, longer
+      calls. Only the first chunk that does not fit is held back outside the queue.
+
+    Items are stamped when enqueued to record how long they waited. With `local=True` the
+    queue is a thread queue inside one process; otherwise a multiprocessing queue whose
+    statistics live in shared memory and can be read from any process.
+    """
+    def __init__(self, name: str, maxsize: int = 0, policy: str = BLOCK, local: bool = False,
+                 max_coalesce: float = 30.0, max_gap: float = 1.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_coalesce = max_coalesce
+        self.max_gap = max_gap
+        if local:
+            self._queue = queue.Queue(maxsize)
+            self._stats = [0.0] * 7
+            self._lock = threading.Lock()
+        else:
+            self._queue = multiprocessing.Queue(maxsize)
+            self._stats = multiprocessing.Array("d", 7, lock=False)
+            self._lock = multiprocessing.Lock()
+        self._pending = deque()   # items already taken off the queue by this consumer
+
+    def put(self, item, block: bool = True, timeout: float | None = None):
+        entry = (time.time(), item)
+        if self.policy != DROP_OLDEST or item is None:
+            # The end-of-stream marker is never dropped
+            self._queue.put(entry, block, timeout)
+        else:
+            while True:
+                try:
+                    self._queue.put_nowait(entry)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get(timeout=0.05)
+                    except queue.Empty:
+                        continue
+                    self._count(_DROPPED)
+        self._count(_PUT)
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def offer(self, item) -> bool:
+        """
+        Put `item` only if there is room right now, whatever the policy; otherwise discard
+        it and count the drop. For items that are worthless once late.
+        """
+        try:
+            self._queue.put_nowait((time.time(), item))
+        except queue.Full:
+            self._count(_DROPPED)
+            return False
+        self._count(_PUT)
+        return True
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        while not self._pending:
+            self._take(self._queue.get(block, timeout))
+        if self.policy == COALESCE:
+            # Merge what is already queued into the next item (also one held back last time),
+            # stopping at the first item that does not fit: at most one item waits outside
+            # the queue's bound
+            taken = 0
+            while len(self._pending) <= 1:
+                try:
+                    self._take(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                taken += 1
+            if taken >= len(self._pending):
+                logger.debug("[%s] Coalesced %d queued chunks", self.name, taken)
+        return self._pending.popleft()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def _take(self, entry: tuple):
+        """
+        Accept an entry taken off the queue: record its wait, prepare it and add it to the
+        pending items, merged into the last one where the policy allows.
+        """
+        enqueued, item = entry
+        self._record_wait(time.time() - enqueued)
+        if item is not None:
+            item = self._prepare(item)
+            if item is None:
+                self._count(_DROPPED)
+                return
+        if self.policy == COALESCE and self._pending and self._can_merge(self._pending[-1], item):
+            self._pending[-1] = merge_audio_chunks(self._pending[-1], item)
+            self._count(_MERGED)
+        else:
+            self._pending.append(item)
+
+    def _prepare(self, item):
+        """
+        Hook applied to each received item; returning None discards it.
+        """
+        return item
+
+    def _can_merge(self, previous, item) -> bool:
+        return (isinstance(previous, AudioChunk) and isinstance(item, AudioChunk)
+                and previous.is_final and item.is_final
+                and previous.source == item.source
+                and previous.sample_rate == item.sample_rate
+                and item.timestamp - previous.timestamp - previous.duration <= self.max_gap
+                and item.timestamp + item.duration - previous.timestamp <= self.max_coalesce)
+
+    def _count(self, index: int, n: int = 1):
+        with self._lock:
+            self._stats[index] += n
+
+    def _record_wait(self, wait: float):
+        with self._lock:
+            self._stats[_GOT] += 1
+            self._stats[_WAIT_TOTAL] += wait
+            self._stats[_WAIT_LAST] = wait
+            if wait > self._stats[_WAIT_MAX]:
+                self._stats[_WAIT_MAX] = wait
+
+    def qsize(self) -> int:
+        try:
+            return self._queue.qsize() + len(self._pending)
+        except NotImplementedError:   # multiprocessing queues on macOS
+            return len(self._pending)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def stats(self) -> QueueStats:
+        with self._lock:
+            values = list(self._stats)
+        got = int(values[_GOT])
+        return QueueStats(
+            name=self.name,
+            policy=self.policy,
+            maxsize=self.maxsize,
+            backlog=self.qsize(),
+            put=int(values[_PUT]),
+            taken=got,
+            dropped=int(values[_DROPPED]),
+            merged=int(values[_MERGED]),
+            mean_wait=values[_WAIT_TOTAL] / got if got else 0.0,
+            max_wait=values[_WAIT_MAX],
+            last_wait=values[_WAIT_LAST],
+        )
+
+    def close(self):
+        if hasattr(self._queue, "close"):
+            self._queue.close()
+
+    def __getstate__(self):
+        # Taken-but-undelivered items belong to the consumer that took them
+        state = self.__dict__.copy()
+        state["_pending"] = deque()
+        return state
@@ -0,0 +1,124 @@
+import logging
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger("bailiff.core.readiness")
+
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class StageStatus:
+    """
+    Startup progress of one pipeline stage, sent over the control channel.
+    """
+    stage: str
+    state: str
+    detail: str = ""
+    elapsed: float = 0.0   # seconds since the stage process started
+
+
+class ReadinessReporter:
+    """
+    Reports a stage's model loading to the SessionManager. Created in the parent and passed
+    to the stage process; with no channel, reports are only logged.
+    """
+    def __init__(self, stage: str, channel=None):
+        self.stage = stage
+        self.channel = channel
+        self.started = time.monotonic()
+
+    def __getstate__(self):
+        # The clock starts when the stage process starts
+        state = self.__dict__.copy()
+        state["started"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.started = time.monotonic()
+
+    def loading(self, detail: str):
+        self._report(LOADING, detail)
+
+    def ready(self, detail: str = ""):
+        self._report(READY, detail)
+
+    def failed(self, error: Exception | str):
+        self._report(FAILED, str(error))
+
+    def _report(self, state: str, detail: str):
+        status = StageStatus(self.stage, state, detail, time.monotonic() - self.started)
+        logger.info("[%s] %s %s (%.1fs)", self.stage, state, detail, status.elapsed)
+        if self.channel is not None:
+            try:
+                self.channel.put_nowait(status)
+            except queue.Full:
+                pass
+
+
+def load_parallel(loaders: dict[str, Callable], reporter: ReadinessReporter | None = None) -> dict:
+    """
+    Run independent model loaders in threads (model loading is mostly I/O and native code
+    that releases the GIL) and return their results by name. The first failure is raised.
+    """
+    if len(loaders) == 1:
+        name, loader = next(iter(loaders.items()))
+        if reporter is not None:
+            reporter.loading(name)
+        return {name: loader()}
+
+    if reporter is not None:
+        reporter.loading(", ".join(loaders))
+    with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="model-load") as pool:
+        futures = {name: pool.submit(loader) for name, loader in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+class ReadinessBoard:
+    """
+    Collects StageStatus reports in the SessionManager: which stages are still loading,
+    which failed, and how long the whole pipeline took to become ready. A stage that failed
+    is settled (nothing waits for it any longer) but not ready.
+    """
+    def __init__(self, stages: list[str]):
+        self.started = time.monotonic()
+        self.statuses = {stage: StageStatus(stage, LOADING, "starting") for stage in stages}
+        self.ready_time: float | None = None
+
+    def update(self, status: StageStatus):
+        self.statuses[status.stage] = status
+        if self.ready_time is None and self.all_ready:
+            self.ready_time = time.monotonic() - self.started
+            logger.info("Pipeline ready in %.1fs (%s)", self.ready_time, ", ".join(
+                f"{s.stage} {s.elapsed:.1f}s" for s in self.statuses.values()))
+        elif status.state == FAILED:
+            logger.error("Stage %s failed to start: %s", status.stage, status.detail)
+
+    def is_settled(self, stages: list[str]) -> bool:
+        """Whether none of `stages` is still loading (each is ready or failed)."""
+        return all(self.statuses[stage].state != LOADING for stage in stages if stage in self.statuses)
+
+    def is_ready(self, stages: list[str]) -> bool:
+        return all(self.statuses[stage].state == READY for stage in stages if stage in self.statuses)
+
+    @property
+    def all_settled(self) -> bool:
+        return self.is_settled(list(self.statuses))
+
+    @property
+    def all_ready(self) -> bool:
+        return self.is_ready(list(self.statuses))
+
+    @property
+    def any_failed(self) -> bool:
+        return any(s.state == FAILED for s in self.statuses.values())
+
+    @property
+    def failed(self) -> list[StageStatus]:
+        return [s for s in self.statuses.values() if s.state == FAILED]
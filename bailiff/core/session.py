@@ -1,16 +1,26 @@
 import logging
 import multiprocessing
-import queue
 import threading
 
-from bailiff.core.config import AudioConfig
+from bailiff.core.config import settings
+from bailiff.core.cpu_budget import StageThreads, available_cpus, pipeline_demands, plan_threads
 from bailiff.core.db import SessionLocal
+from bailiff.core.queues import BLOCK, BoundedQueue, QueueStats
+from bailiff.core.readiness import ReadinessBoard, ReadinessReporter, StageStatus
+from bailiff.core.shared_audio import AudioBroadcast, SharedAudioBuffer
 from bailiff.features.assistant.service import run_assistant_service
 from bailiff.features.audio_ingest.service import run_ingest_service
 from bailiff.features.diarization.merge import run_merge_service
 from bailiff.features.diarization.service import run_diarization_service
 from bailiff.features.memory.service import run_memory_service
 from bailiff.features.memory.storage import MeetingStorage
+from bailiff.features.transcription.language import SessionLanguage
+from bailiff.features.transcription.pool import (
+    create_work_queues,
+    run_transcription_pool,
+    run_transcription_worker,
+    worker_threads,
+)
 from bailiff.features.transcription.service import run_transcription_service
 
 logger = logging.getLogger("bailiff.core.session")
@@ -18,123 +28,284 @@ logger = logging.getLogger("bailiff.core.session")
 class SessionManager:
     """
     Manages the lifecycle of a recording session, including background processes and data flow.
+
+    Pass the `session_id` of an existing session to process more audio into it; its stored
+    transcription language is reused instead of being detected again.
+
+    Every stage loads its models as soon as its process starts and reports progress over a
+    control channel (`readiness`); audio capture waits until transcription and diarization
+    are ready.
+
+    With `pipeline.thread_budget`, the cores are split between the stages that run native
+    inference (see `cpu_budget`) so that their thread pools do not oversubscribe the CPU.
     """
-    def __init__(self, log_file="bailiff.log"):
+    def __init__(self, log_file="bailiff.log", session_id: int | None = None):
         self.log_file = log_file
+        self.audio_config = settings.audio   # config.yaml and BAILIFF_AUDIO__* apply
+
+        # Shared audio samples; the audio queues only carry AudioChunkRef descriptors
+        self.audio_buffer = SharedAudioBuffer.create(
+            int(self.audio_config.shared_buffer_seconds * self.audio_config.sample_rate)
+        )
+
+        # Ingest publishes once, every audio consumer subscribes directly
+        pipeline = settings.pipeline
+        self.audio_bus = AudioBroadcast(self.audio_buffer.name)
+        self.q_audio_tx = self.audio_bus.subscribe(
+            "transcription", pipeline.transcription_queue_size, pipeline.transcription_policy,
+            max_coalesce=pipeline.max_coalesce, partials=self.audio_config.partial_interval > 0,
+        )
+        self.q_audio_diar = self.audio_bus.subscribe(
+            "diarization", pipeline.diarization_queue_size, pipeline.diarization_policy,
+        )
         
         # Queues
-        self.q_audio_raw = multiprocessing.Queue()    # ingest output
-        self.q_audio_tx = multiprocessing.Queue()     # copy for transcription
-        self.q_audio_diar = multiprocessing.Queue()   # copy for diarization
-
-        self.q_text = multiprocessing.Queue()          # transcription output
-        self.q_diarization = multiprocessing.Queue()   # diarization output
-        self.q_merged = multiprocessing.Queue()        # merge output -> UI
-
-        self.q_memory = multiprocessing.Queue()
-        self.q_question = multiprocessing.Queue()
-        self.q_answer = multiprocessing.Queue()
-        self.q_rag = multiprocessing.Queue()
+        event_queue = lambda name: BoundedQueue(name, pipeline.event_queue_size, BLOCK)
+        self.q_text = event_queue("text")                 # transcription output
+        self.q_diarization = event_queue("speakers")      # diarization output
+        self.q_merged = event_queue("merged")             # merge output -> UI
+
+        self.q_memory = event_queue("memory")
+        self.q_question = event_queue("question")
+        self.q_answer = event_queue("answer")
+        self.q_rag = event_queue("rag")
         
+        # Transcription worker pool (only with more than one worker)
+        self.tx_workers = max(1, settings.transcription.workers)
+        self.q_tx_work = create_work_queues(self.tx_workers) if self.tx_workers > 1 else []
+        self.q_tx_results = multiprocessing.Queue() if self.tx_workers > 1 else None
+        self.tx_backlog = multiprocessing.Value("i", 0, lock=False) if self.tx_workers > 1 else None
+        self.tx_heartbeats = multiprocessing.Array("d", self.tx_workers, lock=False) if self.tx_workers > 1 else None
+        self.threads = self._plan_threads()   # CPU share of each stage process
+
         # Session ID initialization
-        self.session_id = self._create_session()
+        self.session_id, language = self._open_session(session_id)
+        self.language = SessionLanguage(settings.transcription.language or language)
         
-        self._fanout_stop = threading.Event()
+        # Startup handshake
+        self.q_status = multiprocessing.Queue()
+        self.audio_ready = multiprocessing.Event()
+        self.readiness: ReadinessBoard | None = None
+        self._status_thread = None
+
         self.processes = []
-        self._fanout_thread = None
 
-    def _create_session(self):
+    def _open_session(self, session_id: int | None) -> tuple[int, str | None]:
         db = SessionLocal()
         try:
             storage = MeetingStorage(db)
-            session = storage.create_session()
-            return session.id
+            session = storage.get_session(session_id) if session_id is not None else None
+            if session is None:
+                session = storage.create_session()
+            return session.id, session.language
         finally:
             db.close()
 
-    def _audio_fanout(self):
+    def _plan_threads(self) -> dict[str, StageThreads]:
         """
-        Duplicate audio chunks from ingest to both transcription and diarization queues.
+        Threads (and cores, when pinning) of each stage; empty when the budget is disabled.
         """
-        while not self._fanout_stop.is_set():
-            try:
-                chunk = self.q_audio_raw.get(timeout=0.5)
-            except queue.Empty:
-                continue
-            if chunk is None:
-                self.q_audio_tx.put(None)
-                self.q_audio_diar.put(None)
-                break  # poison pill forwarded to both consumers
-            self.q_audio_tx.put(chunk)
-            self.q_audio_diar.put(chunk)
+        pipeline = settings.pipeline
+        if not pipeline.thread_budget:
+            return {}
+        cpus = available_cpus()
+        if 0 < pipeline.cpu_cores < len(cpus):
+            cpus = cpus[:pipeline.cpu_cores]
+        demands = pipeline_demands(self.tx_workers, settings.transcription.device,
+                                   settings.transcription.cpu_threads)
+        plan = plan_threads(demands, cpus, pin=pipeline.pin_cpus)
+        logger.info("Thread budget over %d cores: %s", len(cpus),
+                    ", ".join(f"{t.stage} {t.intra_op}" for t in plan.values()))
+        return plan
 
-    def start(self):
+    def _save_language(self):
+        language = self.language.get()
+        if language is None or settings.transcription.language is not None:
+            return
+        db = SessionLocal()
+        try:
+            MeetingStorage(db).set_session_language(self.session_id, language)
+        finally:
+            db.close()
+
+    def pipeline_status(self) -> list[QueueStats]:
+        """
+        Statistics of every queue between stages, readable while the pipeline runs.
+        """
+        queues = list(self.audio_bus.subscriptions.values()) + self.q_tx_work + [
+            self.q_text, self.q_diarization, self.q_merged,
+            self.q_memory, self.q_question, self.q_answer, self.q_rag,
+        ]
+        return [q.stats() for q in queues]
+
+    def is_lagging(self) -> bool:
+        """
+        True when some stage is falling behind real time: the last item out of its input
+        queue waited longer than `pipeline.lag_warning` and more are still waiting.
+        """
+        return any(s.last_wait > settings.pipeline.lag_warning and s.backlog > 0
+                   for s in self.pipeline_status())
+
+    def _reporter(self, stage: str) -> ReadinessReporter:
+        return ReadinessReporter(stage, self.q_status)
+
+    def _watch_readiness(self, gating: list[str]):
+        """
+        Collect stage reports; open the audio gate once no audio consumer is still loading
+        (a failed one is not waited for: pool workers that did load can still transcribe).
+        """
+        while True:
+            status: StageStatus = self.q_status.get()
+            if status is None:
+                break
+            self.readiness.update(status)
+            if not self.audio_ready.is_set() and self.readiness.is_settled(gating):
+                if self.readiness.is_ready(gating):
+                    logger.info("Audio consumers ready, starting capture")
+                else:
+                    logger.warning("Starting capture although some audio consumers failed to load")
+                self.audio_ready.set()
+
+    def stage_status(self) -> list[StageStatus]:
         """
-        Start all background processes and the fanout thread.
+        Startup progress of every stage, for display while the pipeline loads.
         """
-        # Fan-out thread
-        self._fanout_thread = threading.Thread(
-            target=self._audio_fanout, daemon=True, name="audio-fanout"
+        return list(self.readiness.statuses.values()) if self.readiness is not None else []
+
+    @property
+    def startup_failed(self) -> list[StageStatus]:
+        """
+        Stages that failed to start, once none is still loading (empty until then).
+        """
+        if self.readiness is None or not self.readiness.all_settled or not self.readiness.any_failed:
+            return []
+        return self.readiness.failed
+
+    @property
+    def time_to_ready(self) -> float | None:
+        """
+        Seconds from start() until every stage was ready (None while loading).
+        """
+        return self.readiness.ready_time if self.readiness is not None else None
+
+    def _transcription_process(self) -> multiprocessing.Process:
+        """
+        The transcription stage: a single service, or the dispatcher of a worker pool.
+        """
+        if self.tx_workers == 1:
+            return multiprocessing.Process(
+                target=run_transcription_service,
+                args=(self.q_audio_tx, self.q_text, self.log_file, self.language),
+                kwargs={"readiness": self._reporter("transcription"), "threads": self.threads.get("transcription")},
+                daemon=True,
+                name="transcription",
+            )
+        return multiprocessing.Process(
+            target=run_transcription_pool,
+            args=(self.q_audio_tx, self.q_text, self.q_tx_work, self.q_tx_results, self.log_file),
+            kwargs={"readiness": self._reporter("transcription"), "backlog": self.tx_backlog,
+                    "heartbeats": self.tx_heartbeats},
+            daemon=True,
+            name="transcription",
         )
-        self._fanout_thread.start()
 
+    def start(self):
+        """
+        Start all background processes.
+        """
         # Processes
         self.processes = [
             multiprocessing.Process(
                 target=run_ingest_service,
-                args=(self.q_audio_raw, AudioConfig(), self.log_file),
+                args=(self.audio_bus, self.audio_config, self.log_file, self.audio_buffer.name),
+                kwargs={"readiness": self._reporter("audio-ingest"), "start_gate": self.audio_ready,
+                        "threads": self.threads.get("audio-ingest")},
                 daemon=True,
                 name="audio-ingest",
             ),
-            multiprocessing.Process(
-                target=run_transcription_service,
-                args=(self.q_audio_tx, self.q_text, self.log_file),
-                daemon=True,
-                name="transcription",
-            ),
+            self._transcription_process(),
             multiprocessing.Process(
                 target=run_diarization_service,
                 args=(self.q_audio_diar, self.q_diarization, self.log_file),
+                kwargs={"readiness": self._reporter("diarization"), "threads": self.threads.get("diarization")},
                 daemon=True,
                 name="diarization",
             ),
             multiprocessing.Process(
                 target=run_merge_service,
                 args=(self.q_text, self.q_diarization, self.q_merged, self.log_file),
+                kwargs={"readiness": self._reporter("merge")},
                 daemon=True,
                 name="merge",
             ),
             multiprocessing.Process(
                 target=run_memory_service,
                 args=(self.q_memory, self.q_rag, self.session_id, self.log_file),
+                kwargs={"readiness": self._reporter("memory"), "threads": self.threads.get("memory")},
                 daemon=True,
                 name="memory",
             ),
             multiprocessing.Process(
                 target=run_assistant_service,
                 args=(self.q_question, self.q_answer, self.q_memory, self.q_rag, self.session_id, self.log_file),
+                kwargs={"readiness": self._reporter("assistant")},
                 daemon=True,
                 name="assistant",
             ),
         ]
 
+        # Pool workers go last so the first stages keep their positions
+        cpu_threads = worker_threads(self.tx_workers, settings.transcription.cpu_threads)
+        for i, q in enumerate(self.q_tx_work):
+            name = f"transcription-worker-{i}"
+            threads = self.threads.get(name)
+            self.processes.append(multiprocessing.Process(
+                target=run_transcription_worker,
+                args=(i, q, self.q_tx_results, threads.intra_op if threads else cpu_threads,
+                      self.log_file, self.language),
+                kwargs={"readiness": self._reporter(name), "threads": threads,
+                        "upstream_backlog": self.tx_backlog, "heartbeats": self.tx_heartbeats},
+                daemon=True,
+                name=name,
+            ))
+
+        # Capture waits for the stages that consume audio; all stages count towards "ready"
+        self.readiness = ReadinessBoard([p.name for p in self.processes])
+        gating = ["transcription", "diarization"] + [f"transcription-worker-{i}" for i in range(len(self.q_tx_work))]
+        self._status_thread = threading.Thread(target=self._watch_readiness, args=(gating,),
+                                               name="readiness", daemon=True)
+        self._status_thread.start()
+
         for p in self.processes:
             p.start()
             
     def stop(self):
         """
-        Stop all processes and threads, and close queues.
+        Stop all processes and close queues.
         """
-        self._fanout_stop.set()
-        
+        for stats in self.pipeline_status():
+            logger.info("Queue %s (%s, max %d): %d put, %d dropped, %d merged, wait mean %.2fs max %.2fs",
+                        stats.name, stats.policy, stats.maxsize, stats.put, stats.dropped,
+                        stats.merged, stats.mean_wait, stats.max_wait)
+
         for p in self.processes:
             if p.is_alive():
                 p.terminate()
                 p.join(timeout=3)
+
+        if self._status_thread is not None:
+            self.q_status.put(None)
+            self._status_thread.join(timeout=1)
+            self._status_thread = None
+
+        try:
+            self._save_language()
+        except Exception as e:
+            logger.error("Error saving session language: %s", e)
                 
         # Close queues
-        for q in [
-            self.q_audio_raw, self.q_audio_tx, self.q_audio_diar,
+        for q in self.q_tx_work + [
+            self.audio_bus,
             self.q_text, self.q_diarization, self.q_merged,
             self.q_memory, self.q_answer, self.q_rag # q_question is input only usually? but good to close
         ]:
@@ -149,3 +320,5 @@ class SessionManager:
             self.q_question.close()
         except Exception:
             pass
+
+        self.audio_buffer.close()
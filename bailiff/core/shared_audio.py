@@ -0,0 +1,240 @@
+import logging
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bailiff.core.events import AudioChunk, AudioChunkRef
+from bailiff.core.queues import BLOCK, BoundedQueue
+
+logger = logging.getLogger("bailiff.core.shared_audio")
+
+_HEADER_BYTES = 64  # [write cursor, capacity] as uint64, padded to a cache line
+
+
+class SharedAudioBuffer:
+    """
+    Single-writer ring buffer of float32 samples in shared memory.
+
+    The ingest process writes each utterance once and only a small AudioChunkRef travels
+    over the queues. Consumers attach to the buffer by name and copy the samples out when
+    they take a descriptor off their queue: the writer does not wait for readers, so a view
+    kept through a long decode could be overwritten underneath it. Writes never wrap
+    mid-chunk (the tail of the ring is skipped instead), so a block is always contiguous.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool, capacity: int | None = None):
+        self._shm = shm
+        self._owner = owner
+        self._header = np.ndarray((2,), dtype=np.uint64, buffer=shm.buf)
+        if owner:
+            self._header[0] = 0
+            self._header[1] = capacity
+        self.capacity = int(self._header[1])
+        self._samples = np.ndarray((self.capacity,), dtype=np.float32,
+                                   buffer=shm.buf, offset=_HEADER_BYTES)
+
+    @classmethod
+    def create(cls, capacity: int) -> "SharedAudioBuffer":
+        """
+        Allocate a new buffer holding `capacity` samples. The creator owns (and unlinks) it.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER_BYTES + capacity * 4)
+        logger.info("Shared audio buffer created: name=%s, capacity=%d samples", shm.name, capacity)
+        return cls(shm, owner=True, capacity=capacity)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedAudioBuffer":
+        """
+        Attach to an existing buffer created by another process.
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def cursor(self) -> int:
+        """Total number of sample slots handed out since creation."""
+        return int(self._header[0])
+
+    def write(self, frames: np.ndarray | list[np.ndarray]) -> int:
+        """
+        Copy `frames` (one array or a list of arrays) into the ring as one contiguous block.
+        Returns the absolute offset of the block.
+        """
+        if isinstance(frames, np.ndarray):
+            frames = [frames]
+        length = sum(len(f) for f in frames)
+        if length > self.capacity:
+            raise ValueError(f"Chunk of {length} samples exceeds buffer capacity {self.capacity}")
+
+        offset = self.cursor
+        pos = offset % self.capacity
+        if pos + length > self.capacity:
+            offset += self.capacity - pos
+            pos = 0
+
+        for frame in frames:
+            self._samples[pos:pos + len(frame)] = frame
+            pos += len(frame)
+
+        # Publish the new cursor only after the samples are in place
+        self._header[0] = offset + length
+        return offset
+
+    def is_valid(self, offset: int) -> bool:
+        """
+        Whether the block at `offset` is still intact (not yet overwritten by the writer).
+        """
+        return self.cursor <= offset + self.capacity
+
+    def read(self, offset: int, length: int, copy: bool = False) -> np.ndarray:
+        """
+        Return a block previously returned by `write`: a zero-copy view (only safe for the
+        writer), or with `copy` a private copy, checked again once taken.
+        """
+        if not self.is_valid(offset):
+            raise RuntimeError(
+                f"Audio at offset {offset} was overwritten (cursor={self.cursor}, capacity={self.capacity})"
+            )
+        pos = offset % self.capacity
+        block = self._samples[pos:pos + length]
+        if not copy:
+            return block
+        block = block.copy()
+        if not self.is_valid(offset):
+            raise RuntimeError(f"Audio at offset {offset} was overwritten while it was read")
+        return block
+
+    def resolve(self, item: AudioChunk | AudioChunkRef) -> AudioChunk:
+        """
+        Turn an AudioChunkRef into an AudioChunk holding a copy of its samples.
+        Plain AudioChunks are passed through unchanged.
+        """
+        if not isinstance(item, AudioChunkRef):
+            return item
+        return AudioChunk(
+            data=self.read(item.offset, item.length, copy=True),
+            sample_rate=item.sample_rate,
+            timestamp=item.timestamp,
+            duration=item.duration,
+            is_speech=item.is_speech,
+            source=item.source,
+            is_final=item.is_final,
+        )
+
+    def close(self):
+        """
+        Detach from the buffer. The owner also releases the shared memory segment.
+        """
+        # Views into the segment must be dropped before it can be closed
+        self._header = None
+        self._samples = None
+        try:
+            self._shm.close()
+        except BufferError as e:
+            logger.warning("Shared audio buffer still in use, leaving it mapped: %s", e)
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class AudioSubscription(BoundedQueue):
+    """
+    Consumer end of an AudioBroadcast.
+
+    Behaves like the input queue of a service: `get()` returns AudioChunks whose data is
+    copied from the shared buffer (attached lazily in the consuming process), or None when
+    the stream ends. Descriptors whose audio was already overwritten are dropped. Size,
+    overflow policy and statistics work as in BoundedQueue.
+    """
+    def __init__(self, name: str, buffer_name: str, maxsize: int = 0, policy: str = BLOCK,
+                 partials: bool = False, **kwargs):
+        super().__init__(name, maxsize, policy, **kwargs)
+        self.buffer_name = buffer_name
+        self.partials = partials   # also receive in-progress (is_final=False) audio
+        self._buffer = None
+
+    def _prepare(self, item: AudioChunk | AudioChunkRef) -> AudioChunk | None:
+        if self._buffer is None:
+            self._buffer = SharedAudioBuffer.attach(self.buffer_name)
+        try:
+            return self._buffer.resolve(item)
+        except RuntimeError as e:
+            logger.warning("[%s] Dropping chunk: %s", self.name, e)
+            return None
+
+    def close(self):
+        super().close()
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def __getstate__(self):
+        # The attached buffer is per-process; children attach on first use
+        state = super().__getstate__()
+        state["_buffer"] = None
+        return state
+
+
+class AudioBroadcast:
+    """
+    Publish/subscribe channel for audio written to a SharedAudioBuffer.
+
+    Stages subscribe before the pipeline starts; the ingest process then publishes each
+    descriptor once, straight into every subscriber queue. Adding a consumer costs one
+    small descriptor per chunk, never another copy of the audio or a relay thread.
+    """
+    def __init__(self, buffer_name: str):
+        self.buffer_name = buffer_name
+        self.subscriptions: dict[str, AudioSubscription] = {}
+
+    def subscribe(self, name: str, maxsize: int = 0, policy: str = BLOCK, partials: bool = False,
+                  **kwargs) -> AudioSubscription:
+        """
+        Register a new consumer. Must be called before the publisher process starts.
+        Only subscribers created with `partials=True` receive in-progress audio.
+        """
+        if name in self.subscriptions:
+            raise ValueError(f"Subscriber '{name}' already registered")
+        subscription = AudioSubscription(name, self.buffer_name, maxsize, policy, partials, **kwargs)
+        self.subscriptions[name] = subscription
+        return subscription
+
+    def put(self, item: AudioChunk | AudioChunkRef | None):
+        """
+        Publish an item (or the None end-of-stream marker) to every subscriber.
+        In-progress audio goes through `offer` instead.
+        """
+        if item is not None and not item.is_final:
+            self.offer(item)
+            return
+        for subscription in self.subscriptions.values():
+            subscription.put(item)
+
+    def offer(self, item: AudioChunk | AudioChunkRef) -> bool:
+        """
+        Publish in-progress audio to the subscribers that take partials, without waiting:
+        a full queue skips it (counted as a drop) rather than pushing back on ingest.
+        Returns whether every such subscriber took it.
+        """
+        taken = True
+        for subscription in self.subscriptions.values():
+            if subscription.partials:
+                taken = subscription.offer(item) and taken
+        return taken
+
+    def qsize(self) -> int:
+        """Backlog of the slowest subscriber."""
+        return max((s.qsize() for s in self.subscriptions.values()), default=0)
+
+    def close(self):
+        for subscription in self.subscriptions.values():
+            try:
+                subscription.close()
+            except Exception as e:
+                logger.error("Error closing subscription %s: %s", subscription.name, e)
@@ -3,6 +3,7 @@ import queue
 from multiprocessing.queues import Queue as ProcessQueue
 
 from bailiff.core.logging import setup_logging
+from bailiff.core.readiness import ReadinessReporter
 from bailiff.features.assistant.llm import LLMClient, LLMClientSettings
 from bailiff.features.assistant.rag import RagEngine
 
@@ -23,7 +24,8 @@ class AssistantService:
         answer_queue: ProcessQueue,
         memory_queue: ProcessQueue,
         rag_queue: ProcessQueue,
-        session_id: int
+        session_id: int,
+        readiness: ReadinessReporter | None = None,
     ):
         self.question_queue = question_queue
         self.answer_queue = answer_queue
@@ -33,6 +35,7 @@ class AssistantService:
         self.llm = None
         self.vector_db = None
         self.session_id = str(session_id) 
+        self.readiness = readiness
     
     def run(self):
         """
@@ -50,12 +53,18 @@ class AssistantService:
 
         if not model:
             logger.error("LLM Model not configured.")
+            if self.readiness is not None:
+                self.readiness.failed("LLM model not configured")
             return
 
+        if self.readiness is not None:
+            self.readiness.loading("LLM client")
         llm_settings = LLMClientSettings(api_key=api_key, base_url=base_url, model=model)
 
         self.llm = LLMClient(llm_settings)
         self.rag_engine = RagEngine(llm=self.llm, memory_queue=self.memory_queue, rag_queue=self.rag_queue)
+        if self.readiness is not None:
+            self.readiness.ready()
 
         while True:
             try:
@@ -74,8 +83,9 @@ class AssistantService:
                 logger.error("Error answering question: %s", e)
                 continue
 
-def run_assistant_service(question_queue: ProcessQueue, answer_queue: ProcessQueue, memory_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int, log_file: str):
+def run_assistant_service(question_queue: ProcessQueue, answer_queue: ProcessQueue, memory_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int, log_file: str,
+                          readiness: ReadinessReporter | None = None):
     setup_logging(log_file=log_file)
-    service = AssistantService(question_queue, answer_queue, memory_queue, rag_queue, session_id)
+    service = AssistantService(question_queue, answer_queue, memory_queue, rag_queue, session_id, readiness)
     service.run()         
         
\ No newline at end of file
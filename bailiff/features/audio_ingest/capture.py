@@ -1,20 +1,97 @@
 import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from abc import ABC, abstractmethod
 
-import pyaudiowpatch as pyaudio
+import numpy as np
+
+try:
+    import pyaudiowpatch as pyaudio   # Windows build with WASAPI loopback support
+except ImportError:
+    import pyaudio
 
 logger = logging.getLogger("bailiff.audio.capture")
 
 
-class AudioCaptureManager:
+class CallbackStream:
     """
-    Manages audio input devices and streams.
+    PyAudio input stream running in callback mode.
 
-    Handles discovery of microphones and loopback devices (system audio), and provides methods
-    to open PyAudio streams for capturing audio data.
+    PortAudio's callback copies each buffer into a preallocated float32 ring; `read` blocks
+    until enough samples are available and returns a view into that ring instead of a new
+    bytes object. The view stays valid until the ring wraps around (`n_blocks` buffers
+    later). If the reader falls behind, the oldest samples are overwritten and counted in
+    `overflows`.
     """
+    def __init__(self, pa: "pyaudio.PyAudio", device_index: int, channels: int, sample_rate: int,
+                 frames_per_buffer: int, n_blocks: int = 64, timeout: float = 2.0):
+        self.channels = channels
+        self._frames_per_buffer = frames_per_buffer
+        self.timeout = timeout
+        self._ring = np.zeros(frames_per_buffer * channels * n_blocks, dtype=np.float32)
+        self._written = 0   # samples, monotonic
+        self._read = 0
+        self._cond = threading.Condition()
+        self.overflows = 0
+
+        self._stream = pa.open(
+            format=pyaudio.paFloat32,
+            channels=channels,
+            rate=sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=self._callback,
+        )
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        samples = np.frombuffer(in_data, dtype=np.float32)
+        capacity = len(self._ring)
+        with self._cond:
+            start = self._written % capacity
+            first = min(len(samples), capacity - start)
+            self._ring[start:start + first] = samples[:first]
+            self._ring[:len(samples) - first] = samples[first:]
+            self._written += len(samples)
+            if self._written - self._read > capacity:
+                self.overflows += 1
+                self._read = self._written - capacity
+            self._cond.notify()
+        return None, pyaudio.paContinue
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> np.ndarray:
+        needed = num_frames * self.channels
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._written - self._read >= needed, self.timeout):
+                raise TimeoutError(f"No audio received for {self.timeout:.1f}s")
+            start = self._read % len(self._ring)
+            self._read += needed
+        if start + needed <= len(self._ring):
+            return self._ring[start:start + needed]
+        return np.concatenate((self._ring[start:], self._ring[:start + needed - len(self._ring)]))
+
+    def stop_stream(self):
+        self._stream.stop_stream()
+
+    def close(self):
+        self._stream.close()
+
+
+class CaptureBackend(ABC):
+    """
+    Base class for live capture backends built on PyAudio/PortAudio.
+
+    Handles discovery of microphones and loopback devices (system audio) and opens
+    callback-mode streams. Subclasses only decide how system audio is found and opened.
+    """
+    name = "base"
+
     def __init__(self):
         self.pa = pyaudio.PyAudio()
-        logger.info("PyAudio initialized")
+        logger.info("PyAudio initialized (%s backend)", self.name)
 
     def get_default_microphone(self) -> int:
         """
@@ -24,40 +101,25 @@ class AudioCaptureManager:
         logger.info("Default microphone: %s (index=%d)", info['name'], info['index'])
         return info['index']
 
+    @abstractmethod
     def get_system_loopback(self) -> dict | None:
         """
-        Get the WASAPI loopback device info for system audio capture.
-        Returns the device info dict, or None if not found.
+        Get the device info used to capture system audio, or None if not available.
         """
-        try:
-            device = self.pa.get_default_wasapi_loopback()
-            logger.info("Loopback device found: %s (index=%d, rate=%.0f)",
-                        device['name'], device['index'], device['defaultSampleRate'])
-            return device
-        except Exception as e:
-            logger.warning("No loopback device available: %s", e)
-            return None
 
-    def open_stream(self, device_info: dict, sample_rate: int, 
-                    chunk_size: int) -> pyaudio.Stream:
+    def open_stream(self, device_info: dict, sample_rate: int,
+                    chunk_size: int) -> CallbackStream:
         """
-        Open a PyAudio input stream for the given device.
+        Open a callback-mode input stream for the given device.
         """
         channels = max(1, int(device_info.get('maxInputChannels', 1)))
 
         logger.debug("Opening stream: device=%s, channels=%d, rate=%d, chunk=%d",
                       device_info['name'], channels, sample_rate, chunk_size)
 
-        return self.pa.open(
-            format=pyaudio.paFloat32,
-            channels=channels,
-            rate=sample_rate,
-            input=True,
-            input_device_index=int(device_info['index']),
-            frames_per_buffer=chunk_size,
-        )
+        return CallbackStream(self.pa, int(device_info['index']), channels, sample_rate, chunk_size)
 
-    def open_mic_stream(self, sample_rate: int, chunk_size: int) -> tuple[pyaudio.Stream, int]:
+    def open_mic_stream(self, sample_rate: int, chunk_size: int) -> tuple[CallbackStream, int]:
         """
         Open a stream for the default microphone.
         Returns (stream, channels).
@@ -69,19 +131,15 @@ class AudioCaptureManager:
         logger.info("Mic stream opened: channels=%d, rate=%d", channels, sample_rate)
         return stream, channels
 
-    def open_loopback_stream(self, sample_rate: int, chunk_size: int) -> tuple[pyaudio.Stream, int, int] | None:
+    def open_loopback_stream(self, sample_rate: int, chunk_size: int) -> tuple[CallbackStream, int, int] | None:
         """
-        Open a stream for WASAPI loopback (system audio).
-        
-        WASAPI loopback only supports the device's native sample rate,
-        so we open at native rate and return it for downstream resampling.
-        
+        Open a stream for system audio at the device's native sample rate.
         Returns (stream, channels, actual_sample_rate) or None if not available.
         """
         loopback_info = self.get_system_loopback()
         if loopback_info is None:
             return None
-        
+
         channels = max(1, int(loopback_info.get('maxInputChannels', 1)))
         native_rate = int(loopback_info['defaultSampleRate'])
 
@@ -98,4 +156,113 @@ class AudioCaptureManager:
         Clean up the PyAudio instance.
         """
         self.pa.terminate()
-        logger.info("PyAudio terminated")
\ No newline at end of file
+        logger.info("PyAudio terminated")
+
+
+class AudioCaptureManager(CaptureBackend):
+    """
+    Windows capture backend using WASAPI loopback (pyaudiowpatch) for system audio.
+
+    WASAPI loopback only supports the device's native sample rate, so loopback streams are
+    opened at that rate and resampled downstream.
+    """
+    name = "wasapi"
+
+    def get_system_loopback(self) -> dict | None:
+        """
+        Get the WASAPI loopback device info for system audio capture.
+        Returns the device info dict, or None if not found.
+        """
+        try:
+            device = self.pa.get_default_wasapi_loopback()
+            logger.info("Loopback device found: %s (index=%d, rate=%.0f)",
+                        device['name'], device['index'], device['defaultSampleRate'])
+            return device
+        except Exception as e:
+            logger.warning("No loopback device available: %s", e)
+            return None
+
+
+class PulseCaptureManager(CaptureBackend):
+    """
+    Linux capture backend for PulseAudio and PipeWire (through pipewire-pulse) on ALSA.
+
+    System audio is captured from the monitor source of the default sink (or the source
+    given as `loopback_source`, e.g. the monitor of a null sink in tests). PortAudio reaches
+    it through the ALSA `pulse` device, with PULSE_SOURCE selecting the source to record.
+    """
+    name = "pulse"
+
+    def __init__(self, loopback_source: str | None = None):
+        super().__init__()
+        self.loopback_source = loopback_source
+
+    def _pulse_device(self) -> dict | None:
+        for i in range(self.pa.get_device_count()):
+            info = self.pa.get_device_info_by_index(i)
+            if info['name'] == "pulse" and info.get('maxInputChannels', 0) > 0:
+                return info
+        return None
+
+    @staticmethod
+    def _default_monitor_source() -> str | None:
+        if shutil.which("pactl") is None:
+            return None
+        try:
+            sink = subprocess.run(["pactl", "get-default-sink"], capture_output=True,
+                                  text=True, timeout=2).stdout.strip()
+            if not sink:
+                # pactl < 15 has no get-default-sink
+                info = subprocess.run(["pactl", "info"], capture_output=True, text=True, timeout=2).stdout
+                sink = next((line.split(":", 1)[1].strip() for line in info.splitlines()
+                             if line.startswith("Default Sink:")), "")
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Could not query the default sink: %s", e)
+            return None
+        return f"{sink}.monitor" if sink else None
+
+    def get_system_loopback(self) -> dict | None:
+        """
+        Get the device info of the `pulse` ALSA device, tagged with the monitor source.
+        Returns None if PulseAudio/PipeWire or a monitor source is not available.
+        """
+        device = self._pulse_device()
+        source = self.loopback_source or self._default_monitor_source()
+        if device is None or source is None:
+            logger.warning("No loopback source available (pulse device=%s, monitor=%s)",
+                           device is not None, source)
+            return None
+
+        device = dict(device, monitor_source=source)
+        logger.info("Loopback source found: %s via %s (index=%d, rate=%.0f)",
+                    source, device['name'], device['index'], device['defaultSampleRate'])
+        return device
+
+    def open_stream(self, device_info: dict, sample_rate: int, chunk_size: int) -> CallbackStream:
+        source = device_info.get('monitor_source')
+        if source is None:
+            return super().open_stream(device_info, sample_rate, chunk_size)
+
+        # The ALSA pulse plugin reads PULSE_SOURCE when the PCM is opened
+        previous = os.environ.get("PULSE_SOURCE")
+        os.environ["PULSE_SOURCE"] = source
+        try:
+            return super().open_stream(device_info, sample_rate, chunk_size)
+        finally:
+            if previous is None:
+                os.environ.pop("PULSE_SOURCE", None)
+            else:
+                os.environ["PULSE_SOURCE"] = previous
+
+
+def get_capture_backend(name: str = "auto", loopback_source: str | None = None) -> CaptureBackend:
+    """
+    Create the live capture backend: "wasapi", "pulse", or "auto" (by platform).
+    """
+    if name == "auto":
+        name = "wasapi" if sys.platform == "win32" else "pulse"
+    if name == "wasapi":
+        return AudioCaptureManager()
+    if name == "pulse":
+        return PulseCaptureManager(loopback_source)
+    raise ValueError(f"Unknown capture backend: {name}")
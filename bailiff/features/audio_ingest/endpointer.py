@@ -0,0 +1,159 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger("bailiff.audio.endpointer")
+
+
+@dataclass
+class SpeechSegment:
+    """
+    An utterance cut out of the mixed stream by the Endpointer.
+    """
+    chunks: list[np.ndarray]
+    start_time: float
+    speech_end: float   # timeline time at which the last speech chunk ended
+
+
+class Endpointer:
+    """
+    Turns per-chunk speech probabilities into utterances.
+
+    Probabilities are smoothed with an exponential moving average and compared against
+    separate start and stop thresholds (hysteresis). An utterance ends after `min_silence`
+    seconds below the stop threshold and is padded with up to `speech_pad` seconds of audio
+    on both sides; utterances with less than `min_speech` seconds of speech are discarded.
+    Speech longer than `max_segment` is split at its quietest chunk with a short overlap.
+    """
+    def __init__(self, chunk_duration: float,
+                 start_threshold: float = 0.5,
+                 stop_threshold: float = 0.35,
+                 smoothing: float = 0.5,
+                 min_silence: float = 0.5,
+                 speech_pad: float = 0.2,
+                 min_speech: float = 0.25,
+                 max_segment: float = 15.0,
+                 overlap: float = 0.5,
+                 search_window: float = 2.0):
+        self.chunk_duration = chunk_duration
+        self.start_threshold = start_threshold
+        self.stop_threshold = min(stop_threshold, start_threshold)
+        self.smoothing = smoothing
+
+        to_chunks = lambda seconds: int(round(seconds / chunk_duration))
+        self.silence_chunks = max(1, to_chunks(min_silence))
+        self.pad_chunks = min(to_chunks(speech_pad), self.silence_chunks)
+        self.min_speech_chunks = to_chunks(min_speech)
+        self.max_chunks = max(1, to_chunks(max_segment))
+        self.overlap_chunks = to_chunks(overlap)
+        self.search_chunks = max(1, to_chunks(search_window))
+        if self.max_chunks <= self.overlap_chunks + 1:
+            # A split must cut after the overlap and still leave a chunk to search
+            raise ValueError(f"max_segment ({max_segment}s) must be longer than overlap ({overlap}s) "
+                             f"plus two chunks of {chunk_duration}s")
+
+        self.probability = 0.0      # smoothed speech probability
+        self.in_speech = False
+        self._pre = deque(maxlen=self.pad_chunks)   # (chunk, timestamp) before speech starts
+        self._buffer = []
+        self._start = 0.0
+        self._speech_end = 0.0
+        self._speech_chunks = 0
+        self._silence = 0
+
+        # Counters
+        self.segments = 0
+        self.discarded = 0
+
+    @property
+    def buffered(self) -> list[np.ndarray]:
+        """Chunks of the utterance in progress (empty outside speech)."""
+        return self._buffer
+
+    @property
+    def start_time(self) -> float:
+        """Timeline position of the first buffered chunk."""
+        return self._start
+
+    def process(self, chunk: np.ndarray, prob: float, timestamp: float) -> list[SpeechSegment]:
+        """
+        Feed one chunk with its raw speech probability and timeline position.
+        Returns the utterances completed by this chunk (usually none).
+        """
+        self.probability += self.smoothing * (prob - self.probability)
+
+        if not self.in_speech:
+            if self.probability >= self.start_threshold:
+                self.in_speech = True
+                self._buffer = [c for c, _ in self._pre] + [chunk]
+                self._start = self._pre[0][1] if self._pre else timestamp
+                self._pre.clear()
+                self._speech_chunks = 1
+                self._silence = 0
+                self._speech_end = timestamp + self.chunk_duration
+            else:
+                self._pre.append((chunk, timestamp))
+            return []
+
+        self._buffer.append(chunk)
+        if self.probability >= self.stop_threshold:
+            self._speech_chunks += 1
+            self._silence = 0
+            self._speech_end = timestamp + self.chunk_duration
+            if len(self._buffer) >= self.max_chunks:
+                return [self._split()]
+            return []
+
+        self._silence += 1
+        if self._silence < self.silence_chunks:
+            return []
+        segment = self._finish()
+        return [segment] if segment else []
+
+    def flush(self) -> list[SpeechSegment]:
+        """
+        Close any utterance still in progress (end of stream).
+        """
+        if not self.in_speech:
+            return []
+        self._silence = 0
+        segment = self._finish()
+        return [segment] if segment else []
+
+    def _split(self) -> SpeechSegment:
+        """
+        Cut the buffer at its quietest chunk within the search window, keeping an overlap.
+        """
+        first = max(self.overlap_chunks + 1, len(self._buffer) - self.search_chunks)
+        candidates = np.stack(self._buffer[first:])
+        energy = np.einsum("ij,ij->i", candidates, candidates)
+        cut = first + int(np.argmin(energy)) + 1
+
+        logger.info("Max segment duration reached, splitting at %.2fs (overlap %.2fs)",
+                    cut * self.chunk_duration, self.overlap_chunks * self.chunk_duration)
+        segment = SpeechSegment(self._buffer[:cut], self._start, self._start + cut * self.chunk_duration)
+        self.segments += 1
+
+        keep = cut - self.overlap_chunks
+        self._buffer = self._buffer[keep:]
+        self._start += keep * self.chunk_duration
+        return segment
+
+    def _finish(self) -> SpeechSegment | None:
+        """
+        Close the current utterance, trimming trailing silence down to the padding.
+        """
+        self.in_speech = False
+        keep = len(self._buffer) - self._silence + self.pad_chunks
+        chunks, self._buffer = self._buffer[:keep], []
+
+        if self._speech_chunks < self.min_speech_chunks:
+            logger.debug("Discarding utterance with %d speech chunks (< %d)",
+                         self._speech_chunks, self.min_speech_chunks)
+            self.discarded += 1
+            return None
+
+        self.segments += 1
+        return SpeechSegment(chunks, self._start, self._speech_end)
@@ -0,0 +1,70 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("bailiff.audio.gate")
+
+
+class EnergyGate:
+    """
+    Cheap energy pre-gate in front of the neural VAD.
+
+    Tracks an adaptive noise floor from per-chunk RMS (falls quickly, rises slowly so it
+    follows changing background noise) and only lets chunks through to the VAD when their
+    energy rises `ratio` above that floor. A hangover keeps the gate open for a while after
+    the last loud chunk so quiet word endings still reach the model.
+
+    While the gate is open (or in hangover) the floor rises at `open_rise` only, far slower
+    than `rise`: otherwise long continuous speech would slowly become the floor and close
+    the gate on itself.
+    """
+    def __init__(self, ratio: float = 3.0, hangover_chunks: int = 10, min_rms: float = 1e-4,
+                 rise: float = 0.002, fall: float = 0.2, open_rise: float = 2e-5):
+        self.ratio = ratio
+        self.hangover_chunks = hangover_chunks
+        self.min_rms = min_rms
+        self.rise = rise
+        self.fall = fall
+        self.open_rise = open_rise
+
+        self.noise_floor = None
+        self._hangover = 0
+
+        # Counters
+        self.total = 0
+        self.skipped = 0
+
+    def process(self, chunks: np.ndarray) -> np.ndarray:
+        """
+        Gate a backlog of chunks, shape (n_chunks, chunk_size).
+        Returns a boolean mask of the chunks that should be scored by the VAD.
+        """
+        rms = np.sqrt(np.einsum("ij,ij->i", chunks, chunks) / chunks.shape[1])
+        mask = np.empty(len(rms), dtype=bool)
+
+        for i, level in enumerate(rms):
+            if self.noise_floor is None:
+                self.noise_floor = max(float(level), self.min_rms)
+
+            if level > max(self.noise_floor * self.ratio, self.min_rms):
+                self._hangover = self.hangover_chunks
+                mask[i] = True
+            elif self._hangover > 0:
+                self._hangover -= 1
+                mask[i] = True
+            else:
+                mask[i] = False
+
+            if level < self.noise_floor:
+                rate = self.fall
+            else:
+                rate = self.open_rise if mask[i] else self.rise
+            self.noise_floor = max(self.noise_floor + rate * (level - self.noise_floor), self.min_rms)
+
+        self.total += len(mask)
+        self.skipped += len(mask) - int(mask.sum())
+        return mask
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.total if self.total else 0.0
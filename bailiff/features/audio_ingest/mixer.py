@@ -0,0 +1,145 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("bailiff.audio.mixer")
+
+
+class AudioMixer:
+    """
+    Mixes the microphone with system loopback on a sample-count timeline.
+
+    The mic is the master clock: chunk N of the mix starts exactly `N * chunk_size` samples
+    after the first mic sample, so timestamps never include queueing delay. Loopback audio
+    goes through a jitter buffer and never blocks the mix: missing samples are replaced by
+    silence. Whenever loopback (re)starts, the buffer is primed to `target_latency` and its
+    settled fill level becomes the reference. Drift between the two device clocks shows up
+    as the smoothed fill moving away from that reference, and is corrected by consuming one
+    loopback sample more or less per chunk (linear interpolation). Without `correct_drift`
+    (both tracks on one clock, e.g. replayed files) the fill is left alone.
+    """
+    def __init__(self, chunk_size: int, sample_rate: int, target_latency: float = 0.1,
+                 max_latency: float = 0.5, smoothing: float = 0.02, correct_drift: bool = True):
+        self.chunk_size = chunk_size
+        self.sample_rate = sample_rate
+        self.target_fill = int(target_latency * sample_rate)
+        self.max_fill = max(int(max_latency * sample_rate), self.target_fill + chunk_size)
+        self.tolerance = chunk_size // 4
+        self.smoothing = smoothing
+        self.correct_drift = correct_drift
+
+        self.start_time = None
+        self.mic_samples = 0      # samples of mic audio mixed so far (the timeline)
+        self._jitter = np.empty(0, dtype=np.float32)
+        self._primed = False
+        self._fill = 0.0          # smoothed jitter buffer fill, in samples
+        self._reference = None    # settled fill level the drift control holds
+        self._settle = 0
+
+        # Counters
+        self.corrections = 0      # net samples skipped (+) or repeated (-) on loopback
+        self.underruns = 0
+        self.dropped = 0
+
+    @property
+    def drift_ppm(self) -> float:
+        """Estimated loopback clock drift relative to the mic, in parts per million."""
+        return self.corrections / self.mic_samples * 1e6 if self.mic_samples else 0.0
+
+    @property
+    def jitter_fill(self) -> int:
+        return len(self._jitter)
+
+    def timestamp(self, sample_index: int) -> float:
+        """Wall-clock time of a mic sample on the session timeline."""
+        return self.start_time + sample_index / self.sample_rate
+
+    def skip(self, n: int):
+        """
+        Advance the timeline by `n` mic samples that were lost before mixing, discarding
+        the loopback audio that played meanwhile.
+        """
+        self.mic_samples += n
+        self._jitter = self._jitter[min(n, len(self._jitter)):]
+
+    def push_system(self, data: np.ndarray):
+        """
+        Append loopback samples to the jitter buffer. Anything beyond `max_latency` is
+        dropped from the front so the loopback never lags the mic by more than that.
+        """
+        self._jitter = np.concatenate((self._jitter, data))
+        excess = len(self._jitter) - self.max_fill
+        if excess > 0:
+            self._jitter = self._jitter[excess:]
+            self.dropped += excess
+            self._primed = False
+
+    def _take_system(self, n: int) -> np.ndarray:
+        """
+        Take `n` loopback samples, corrected for clock drift, padded with silence if short.
+        """
+        available = len(self._jitter)
+        if not self._primed:
+            if available < self.target_fill + n:
+                return np.zeros(n, dtype=np.float32)
+            self._primed = True
+            self._fill = float(available)
+            self._reference = None
+            self._settle = int(1 / self.smoothing)
+
+        if available < n:
+            # Loopback stopped (WASAPI sends nothing while the system is silent)
+            out = np.zeros(n, dtype=np.float32)
+            if available:
+                out[:available] = self._jitter
+                self.underruns += 1
+            self._jitter = self._jitter[:0]
+            self._primed = False
+            return out
+
+        self._fill += self.smoothing * (available - self._fill)
+        take = n
+        if self._reference is None:
+            self._settle -= 1
+            if self._settle <= 0:
+                self._reference = self._fill
+        elif self.correct_drift:
+            error = self._fill - self._reference
+            if error > self.tolerance and available > n:
+                take = n + 1    # loopback clock runs fast: consume an extra sample
+            elif error < -self.tolerance:
+                take = n - 1    # loopback clock runs slow: stretch one sample
+            self.corrections += take - n
+
+        segment = self._jitter[:take]
+        self._jitter = self._jitter[take:]
+        if take == n:
+            return segment
+        positions = np.linspace(0, take - 1, n, dtype=np.float32)
+        return np.interp(positions, np.arange(take, dtype=np.float32), segment).astype(np.float32)
+
+    def align(self, mic_chunks: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Line up a backlog of mic chunks with the buffered loopback audio, without mixing.
+        Returns the mic and loopback chunks, each shape (n_chunks, chunk_size), and each
+        chunk's start time.
+        """
+        mic = np.empty((len(mic_chunks), self.chunk_size), dtype=np.float32)
+        system = np.empty_like(mic)
+        timestamps = np.empty(len(mic_chunks), dtype=np.float64)
+        for i, mic_data in enumerate(mic_chunks):
+            timestamps[i] = self.timestamp(self.mic_samples)
+            mic[i] = mic_data
+            system[i] = self._take_system(len(mic_data))
+            self.mic_samples += len(mic_data)
+        return mic, system, timestamps
+
+    def mix(self, mic_chunks: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Mix a backlog of mic chunks with the buffered loopback audio.
+        Returns the mixed chunks, shape (n_chunks, chunk_size), and each chunk's start time.
+        """
+        mixed, system, timestamps = self.align(mic_chunks)
+        mixed += system
+        mixed *= 0.5
+        return mixed, timestamps
@@ -1,26 +1,182 @@
+import time
+
 import numpy as np
-from scipy.signal import butter, lfilter, lfilter_zi
+from scipy.signal import butter, sosfilt
+
+
+class HighPassFilter:
+    """
+    Butterworth high-pass filter in second-order sections, run in float32.
+
+    Removes low-frequency noise (e.g., DC offset, rumble).
+    """
+    name = "highpass"
+    in_place = False
+
+    def __init__(self, sample_rate=16000, cutoff=85, order=5):
+        self.sos = butter(order, cutoff, btype='high', fs=sample_rate, output='sos').astype(np.float32)
+        self.zi = np.zeros((self.sos.shape[0], 2), dtype=np.float32)
+
+    def process(self, data: np.ndarray) -> np.ndarray:
+        data, self.zi = sosfilt(self.sos, data, zi=self.zi)
+        return data
+
+
+class AutomaticGainControl:
+    """
+    Normalizes the level of speech towards `target_rms`.
+
+    The gain follows the chunk RMS with a fast attack (level too high) and a slow release
+    (level too low), is limited to `max_gain`, and is ramped linearly across each chunk to
+    avoid audible steps. Chunks quieter than `gate_rms` leave the gain untouched so silence
+    is not pumped up to speech level.
+    """
+    name = "agc"
+    in_place = True
+
+    def __init__(self, target_rms=0.05, max_gain=10.0, attack=0.5, release=0.05, gate_rms=1e-3):
+        self.target_rms = target_rms
+        self.max_gain = max_gain
+        self.attack = attack
+        self.release = release
+        self.gate_rms = gate_rms
+        self.gain = 1.0
+        self._ramp = None
+
+    def process(self, data: np.ndarray) -> np.ndarray:
+        rms = float(np.sqrt(np.dot(data, data) / len(data)))
+        previous = self.gain
+        if rms > self.gate_rms:
+            desired = min(self.target_rms / rms, self.max_gain)
+            rate = self.attack if desired < self.gain else self.release
+            self.gain += rate * (desired - self.gain)
+
+        if self.gain == previous:
+            data *= np.float32(self.gain)
+            return data
+
+        if self._ramp is None or len(self._ramp) != len(data):
+            self._ramp = np.linspace(0.0, 1.0, len(data), dtype=np.float32)
+        gains = self._ramp * np.float32(self.gain - previous)
+        gains += np.float32(previous)
+        data *= gains
+        return data
+
+
+class SpectralNoiseGate:
+    """
+    Streaming spectral gate.
+
+    Runs a 50%-overlap sqrt-Hann STFT over the stream, tracks the noise magnitude of each
+    bin (follows decreases quickly, increases slowly) and attenuates bins that do not rise
+    `threshold` times above it. Output is delayed by half a frame; chunk sizes must be a
+    multiple of half the frame size.
+    """
+    name = "noise_gate"
+    in_place = False
+
+    def __init__(self, frame_size=512, threshold=2.0, floor=0.1, rise=0.01, fall=0.2):
+        self.frame_size = frame_size
+        self.hop = frame_size // 2
+        self.threshold = threshold
+        self.floor = floor
+        self.rise = rise
+        self.fall = fall
+
+        self.window = np.sqrt(np.hanning(frame_size + 1)[:frame_size]).astype(np.float32)
+        self.noise = None
+        self._input = np.zeros(frame_size - self.hop, dtype=np.float32)   # unprocessed tail
+        self._output = np.zeros(frame_size, dtype=np.float32)              # overlap-add state
+        self._frame = np.empty(frame_size, dtype=np.float32)
+
+    def _gate_frame(self, frame: np.ndarray) -> np.ndarray:
+        np.multiply(frame, self.window, out=self._frame)
+        spectrum = np.fft.rfft(self._frame)
+        magnitude = np.abs(spectrum)
+
+        if self.noise is None:
+            self.noise = magnitude.copy()
+        else:
+            rate = np.where(magnitude < self.noise, self.fall, self.rise)
+            self.noise += rate * (magnitude - self.noise)
+
+        gain = np.where(magnitude > self.threshold * self.noise, 1.0, self.floor)
+        spectrum *= gain
+        out = np.fft.irfft(spectrum, self.frame_size).astype(np.float32)
+        out *= self.window
+        return out
+
+    def process(self, data: np.ndarray) -> np.ndarray:
+        stream = np.concatenate((self._input, data))
+        out = np.empty(len(data), dtype=np.float32)
+        written = 0
+        start = 0
+        while start + self.frame_size <= len(stream):
+            self._output += self._gate_frame(stream[start:start + self.frame_size])
+            out[written:written + self.hop] = self._output[:self.hop]
+            self._output[:-self.hop] = self._output[self.hop:]
+            self._output[-self.hop:] = 0.0
+            written += self.hop
+            start += self.hop
+        self._input = stream[start:]
+        return out[:written] if written < len(data) else out
+
+
+STAGES = {
+    HighPassFilter.name: HighPassFilter,
+    AutomaticGainControl.name: AutomaticGainControl,
+    SpectralNoiseGate.name: SpectralNoiseGate,
+}
 
 
 class AudioPreprocessor:
     """
     Applies real-time preprocessing to audio chunks.
 
-    Currently implements a high-pass Butterworth filter to remove low-frequency noise (e.g., DC offset, rumble).
+    A configurable chain of stateful stages (`highpass`, `agc`, `noise_gate`), all working
+    in float32 on whole chunks. The input chunk is only copied when an in-place stage would
+    otherwise modify it. The time spent in each stage is accumulated in `timings`.
     """
-    def __init__(self, sample_rate=16000, cutoff=85):
+    def __init__(self, sample_rate=16000, cutoff=85, stages=("highpass",)):
         self.sample_rate = sample_rate
-        nyquist = 0.5 * sample_rate
-        normal_cutoff = cutoff / nyquist
-        self.b, self.a = butter(5, normal_cutoff, btype='high', analog=False)
-        self.zi = lfilter_zi(self.b, self.a)
+        self.stages = []
+        for name in stages:
+            if name not in STAGES:
+                raise ValueError(f"Unknown preprocessing stage: {name}")
+            if name == HighPassFilter.name:
+                self.stages.append(HighPassFilter(sample_rate, cutoff))
+            else:
+                self.stages.append(STAGES[name]())
 
-    def process(self, chunk_data: np.float32) -> np.float32:
+        self.timings = {stage.name: 0.0 for stage in self.stages}  # seconds, cumulative
+        self.chunks = 0
+
+    def process(self, chunk_data: np.ndarray) -> np.ndarray:
         """
         Processes the audio chunk.
         """
-        filtered_data, self.zi = lfilter(self.b, self.a, chunk_data, zi=self.zi)
-        return filtered_data.astype(np.float32)
+        data = np.asarray(chunk_data, dtype=np.float32)
+        owned = data is not chunk_data
+        for stage in self.stages:
+            start = time.perf_counter()
+            if stage.in_place and not owned:
+                data = data.copy()
+            data = stage.process(data)
+            owned = True
+            self.timings[stage.name] += time.perf_counter() - start
+        if not owned:
+            # Capture streams hand out views into their ring buffer; never queue those
+            data = data.copy()
+        self.chunks += 1
+        return data
+
+    def stage_times(self) -> dict[str, float]:
+        """
+        Mean processing time per chunk of each stage, in microseconds.
+        """
+        if not self.chunks:
+            return {name: 0.0 for name in self.timings}
+        return {name: total / self.chunks * 1e6 for name, total in self.timings.items()}
 
-def get_preprocessor(sample_rate=16000, cutoff=85):
-    return AudioPreprocessor(sample_rate, cutoff)
\ No newline at end of file
+def get_preprocessor(sample_rate=16000, cutoff=85, stages=("highpass",)):
+    return AudioPreprocessor(sample_rate, cutoff, stages)
@@ -0,0 +1,173 @@
+import logging
+import time
+import wave
+
+import numpy as np
+from scipy.signal import resample_poly
+
+logger = logging.getLogger("bailiff.audio.replay")
+
+
+def load_audio(path: str) -> tuple[np.ndarray, int]:
+    """
+    Load an audio file as float32 frames of shape (n_frames, channels).
+    WAV is read with the standard library; other formats (FLAC, ...) need `soundfile`.
+    """
+    try:
+        import soundfile
+    except ImportError:
+        soundfile = None
+
+    if soundfile is not None:
+        data, rate = soundfile.read(path, dtype="float32", always_2d=True)
+        return data, rate
+
+    if not path.lower().endswith(".wav"):
+        raise RuntimeError(f"Reading {path} requires the soundfile package")
+
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise RuntimeError(f"Unsupported WAV sample width: {width} bytes")
+    return data.reshape(-1, channels), rate
+
+
+class FileStream:
+    """
+    Stream over in-memory audio with the same read interface as a PyAudio input stream.
+
+    `speed` controls pacing: 1.0 delivers audio in real time, N delivers it N times faster
+    and 0 as fast as the consumer reads. `read` raises EOFError once the audio is exhausted.
+    """
+    def __init__(self, frames: np.ndarray, sample_rate: int, frames_per_buffer: int, speed: float = 1.0):
+        self.frames = np.ascontiguousarray(frames, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self._frames_per_buffer = frames_per_buffer
+        self.speed = speed
+        self._pos = 0
+        self._start = None
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        if self._pos >= len(self.frames):
+            raise EOFError("End of replayed audio")
+        if self._start is None:
+            self._start = time.monotonic()
+
+        block = self.frames[self._pos:self._pos + num_frames]
+        if len(block) < num_frames:
+            block = np.concatenate((block, np.zeros((num_frames - len(block), block.shape[1]), np.float32)))
+        self._pos += num_frames
+
+        if self.speed > 0:
+            delay = self._start + self._pos / self.sample_rate / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return block.tobytes()
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileCaptureProvider:
+    """
+    Capture provider that replays recorded mic and loopback tracks (WAV, or FLAC with
+    `soundfile`) through the same stream interface as AudioCaptureManager.
+
+    The mic track is resampled up front to the pipeline rate, while the loopback track is
+    delivered at its native rate like a WASAPI loopback device. Paced replay keeps the two
+    in step through the wall clock; at speed 0 the ingest service pulls loopback along with
+    each batch of mic audio instead.
+    """
+    def __init__(self, mic_path: str, loopback_path: str | None = None, speed: float = 1.0):
+        self.mic_path = mic_path
+        self.loopback_path = loopback_path
+        self.speed = speed
+        logger.info("Replaying mic=%s, loopback=%s, speed=%s",
+                    mic_path, loopback_path, speed if speed > 0 else "max")
+
+    def open_mic_stream(self, sample_rate: int, chunk_size: int) -> tuple[FileStream, int]:
+        frames, rate = load_audio(self.mic_path)
+        if rate != sample_rate:
+            frames = resample_poly(frames, sample_rate, rate, axis=0).astype(np.float32)
+        logger.info("Mic track loaded: %.1fs, channels=%d", len(frames) / sample_rate, frames.shape[1])
+        return FileStream(frames, sample_rate, chunk_size, self.speed), frames.shape[1]
+
+    def open_loopback_stream(self, sample_rate: int, chunk_size: int) -> tuple[FileStream, int, int] | None:
+        if not self.loopback_path:
+            return None
+        frames, rate = load_audio(self.loopback_path)
+        native_chunk = int(chunk_size * rate / sample_rate)
+        logger.info("Loopback track loaded: %.1fs, channels=%d, native_rate=%d",
+                    len(frames) / rate, frames.shape[1], rate)
+        return FileStream(frames, rate, native_chunk, self.speed), frames.shape[1], rate
+
+    def terminate(self):
+        pass
+
+
+if __name__ == "__main__":
+    """
+    Replay recorded tracks through the full SessionManager pipeline and report throughput.
+
+    Usage: python -m bailiff.features.audio_ingest.replay MIC.wav [LOOPBACK.wav] [SPEED]
+    """
+    import os
+    import queue
+    import sys
+
+    os.environ["BAILIFF_AUDIO__REPLAY_MIC"] = sys.argv[1]
+    if len(sys.argv) > 2:
+        os.environ["BAILIFF_AUDIO__REPLAY_LOOPBACK"] = sys.argv[2]
+    os.environ["BAILIFF_AUDIO__REPLAY_SPEED"] = sys.argv[3] if len(sys.argv) > 3 else "0"
+
+    from bailiff.core.config import settings
+    from bailiff.core.logging import setup_logging
+    from bailiff.core.session import SessionManager
+
+    setup_logging(log_file=settings.app.log_file)
+    mic_frames, mic_rate = load_audio(sys.argv[1])
+    audio_seconds = len(mic_frames) / mic_rate
+
+    manager = SessionManager(log_file=settings.app.log_file)
+    if manager.audio_config.replay_mic != sys.argv[1]:
+        # Without it ingest would quietly capture from the live devices and never finish
+        sys.exit("The session did not pick up the replay settings")
+    started = time.monotonic()
+    manager.start()
+    # Ingest, transcription and diarization all exit once the replayed audio is consumed
+    audio_stages = manager.processes[:3]
+
+    segments = []
+    last_arrival = time.monotonic()
+    idle_limit = settings.diarization.segment_timeout + 1.0
+    try:
+        while (any(p.is_alive() for p in audio_stages)
+               or time.monotonic() - last_arrival < idle_limit):
+            try:
+                segment = manager.q_merged.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            last_arrival = time.monotonic()
+            if not segment.is_final:
+                continue
+            segments.append(segment)
+            print(f"[{segment.start_time:.1f}s] {segment.speaker}: {segment.text}")
+    finally:
+        manager.stop()
+
+    elapsed = last_arrival - started
+    print(f"\n{len(segments)} segments from {audio_seconds:.1f}s of audio in {elapsed:.1f}s "
+          f"(real-time factor {elapsed / audio_seconds:.3f}, {audio_seconds / elapsed:.1f}x real time)")
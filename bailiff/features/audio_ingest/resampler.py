@@ -0,0 +1,141 @@
+import logging
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from scipy.signal import firwin
+
+logger = logging.getLogger("bailiff.audio.resampler")
+
+
+class StreamingResampler:
+    """
+    Stateful polyphase resampler for block-wise audio streams.
+
+    The anti-aliasing filter for the `source_rate -> target_rate` ratio is designed once and
+    split into its polyphase branches. Filter history and the fractional output position are
+    carried across blocks, so consecutive blocks resample exactly like one continuous signal
+    (no edge artifacts at block boundaries, no FFT per block).
+    """
+    def __init__(self, source_rate: int, target_rate: int, taps_per_phase: int = 32, beta: float = 8.0):
+        g = gcd(source_rate, target_rate)
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.up = target_rate // g
+        self.down = source_rate // g
+        self.taps = taps_per_phase
+
+        cutoff = 1.0 / max(self.up, self.down)
+        h = firwin(taps_per_phase * self.up, cutoff, window=("kaiser", beta)) * self.up
+        # _phases[p, k] = h[p + k * up], reversed along k to dot with chronological windows
+        self._phases = np.ascontiguousarray(
+            h.reshape(taps_per_phase, self.up).T[:, ::-1], dtype=np.float32
+        )
+
+        # Output n uses branch (n * down) % up, so the branch sequence repeats every `up`
+        # outputs; it is unrolled into a table that blocks can slice without gathering
+        self._phase_table = self._phases[:0]
+
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self.consumed = 0       # input samples seen
+        self.produced = 0       # output samples emitted
+
+        logger.debug("Resampler ready: %d -> %d Hz (up=%d, down=%d, taps=%d)",
+                     source_rate, target_rate, self.up, self.down, self._phases.size)
+
+    @property
+    def exact_output(self) -> Fraction:
+        """Exact (fractional) number of output samples corresponding to the input consumed."""
+        return Fraction(self.consumed * self.up, self.down)
+
+    @property
+    def lag(self) -> float:
+        """Fractional difference between `exact_output` and the samples emitted, in (-1, 0]."""
+        return float(self.exact_output - self.produced)
+
+    def _phase_rows(self, start: int, count: int) -> np.ndarray:
+        """
+        Filter branches for outputs `start .. start + count` (a contiguous view).
+        """
+        offset = start % self.up
+        if offset + count > len(self._phase_table):
+            length = offset + count + self.up
+            self._phase_table = self._phases[(np.arange(length) * self.down) % self.up]
+        return self._phase_table[offset:offset + count]
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        Resample one block of float32 samples. The output length varies by at most one
+        sample between blocks so that, over time, it tracks `exact_output`.
+        """
+        block = np.asarray(block, dtype=np.float32)
+        extended = np.concatenate((self._history, block))
+        last = self.consumed + len(block) - 1  # absolute index of the newest input sample
+
+        # Output n is centred on input sample (n * down) // up; emit all that are complete
+        count = (last * self.up + self.up - 1) // self.down + 1 - self.produced
+        if count > 0:
+            n = self.produced + np.arange(count)
+            windows = as_strided(extended, (len(block), self.taps),
+                                 (extended.strides[0],) * 2, writeable=False)
+            windows = windows[(n * self.down) // self.up - self.consumed]
+            out = np.einsum("nk,nk->n", windows, self._phase_rows(self.produced, count))
+        else:
+            out = np.empty(0, dtype=np.float32)
+
+        self._history = extended[len(extended) - (self.taps - 1):]
+        self.consumed += len(block)
+        self.produced += len(out)
+        return out
+
+    def reset(self):
+        self._history[:] = 0.0
+        self.consumed = 0
+        self.produced = 0
+
+
+if __name__ == "__main__":
+    """
+    Benchmark against the previous per-block FFT resampling path.
+    """
+    import time
+
+    from scipy.signal import resample
+
+    target_rate, chunk_size, seconds = 16000, 512, 60
+
+    for native_rate in (44100, 48000):
+        native_chunk = int(chunk_size * native_rate / target_rate)
+        t = np.arange(native_rate * seconds) / native_rate
+        signal = (0.5 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+        blocks = [signal[i:i + native_chunk]
+                  for i in range(0, len(signal) - native_chunk + 1, native_chunk)]
+        audio_seconds = len(blocks) * native_chunk / native_rate
+
+        start = time.perf_counter()
+        fft_out = np.concatenate([resample(b, chunk_size).astype(np.float32) for b in blocks])
+        fft_time = time.perf_counter() - start
+
+        resampler = StreamingResampler(native_rate, target_rate)
+        start = time.perf_counter()
+        poly_out = np.concatenate([resampler.process(b) for b in blocks])
+        poly_time = time.perf_counter() - start
+
+        # Reference: the same sine sampled directly at the target rate, aligned for filter delay
+        delay = (resampler.taps * resampler.up - 1) / 2 / resampler.up / native_rate
+        def error_db(out, shift):
+            ref_t = np.arange(len(out)) / target_rate - shift
+            ref = 0.5 * np.sin(2 * np.pi * 440.0 * ref_t)
+            skip = resampler.taps
+            err = np.sqrt(np.mean((out[skip:] - ref[skip:]) ** 2))
+            return 20 * np.log10(err / np.sqrt(np.mean(ref[skip:] ** 2)))
+
+        print(f"{native_rate} Hz -> {target_rate} Hz, {audio_seconds:.0f}s of audio, {len(blocks)} blocks")
+        print(f"  scipy.signal.resample : {fft_time * 1e3:8.1f} ms "
+              f"({fft_time / len(blocks) * 1e6:6.1f} us/block), "
+              f"{len(fft_out)} samples, error {error_db(fft_out, 0.0):6.1f} dB")
+        print(f"  StreamingResampler    : {poly_time * 1e3:8.1f} ms "
+              f"({poly_time / len(blocks) * 1e6:6.1f} us/block), "
+              f"{len(poly_out)} samples (exact {float(resampler.exact_output):.2f}), "
+              f"error {error_db(poly_out, delay):6.1f} dB")
@@ -2,20 +2,31 @@ import logging
 import queue
 import threading
 import time
+from collections import deque
 from multiprocessing import Process
 from multiprocessing import Queue as ProcessQueue
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 import numpy as np
-from scipy.signal import resample
 
-from bailiff.core.config import AudioConfig
-from bailiff.core.events import AudioChunk
+from bailiff.core.config import AudioConfig, settings
+from bailiff.core.cpu_budget import StageThreads, apply_threads
+from bailiff.core.events import AudioChunk, AudioChunkRef
 from bailiff.core.logging import setup_logging
-from bailiff.features.audio_ingest.capture import AudioCaptureManager
+from bailiff.core.queues import BLOCK, DROP_OLDEST, BoundedQueue
+from bailiff.core.readiness import ReadinessReporter, load_parallel
+from bailiff.core.shared_audio import AudioBroadcast, SharedAudioBuffer
+from bailiff.features.audio_ingest.endpointer import Endpointer
+from bailiff.features.audio_ingest.gate import EnergyGate
+from bailiff.features.audio_ingest.mixer import AudioMixer
 from bailiff.features.audio_ingest.preprocessor import AudioPreprocessor
+from bailiff.features.audio_ingest.replay import FileCaptureProvider
+from bailiff.features.audio_ingest.resampler import StreamingResampler
 from bailiff.features.audio_ingest.vad import VADEngine
 
+if TYPE_CHECKING:
+    from bailiff.features.audio_ingest.capture import CaptureBackend
+
 logger = logging.getLogger("bailiff.audio.service")
 
 
@@ -24,30 +35,113 @@ class AudioIngestService:
     Service for capturing and preprocessing audio from microphone and system loopback.
 
     Manages concurrent capture threads, performs VAD (Voice Activity Detection), and queues
-    valid speech chunks for downstream processing.
+    valid speech chunks for downstream processing. When a SharedAudioBuffer is given, speech
+    is written to it once and only AudioChunkRef descriptors are queued.
+
+    With a `start_gate` (an Event set once the downstream models are loaded), capture only
+    begins when the gate opens, or after `start_timeout` seconds.
     """
     def __init__(self, 
                  output_queue: ProcessQueue, 
                  config: AudioConfig, 
                  vad_factory: Callable[[], VADEngine] | None = None, 
-                 device_provider: AudioCaptureManager | None = None):
+                 device_provider: "CaptureBackend | FileCaptureProvider | None" = None,
+                 audio_buffer: SharedAudioBuffer | None = None,
+                 readiness: ReadinessReporter | None = None,
+                 start_gate=None,
+                 start_timeout: float = 120.0,
+                 warmup: bool = False,
+                 vad_threads: int = 1):
         self.output_queue = output_queue
         self.config = config
+        self.audio_buffer = audio_buffer
+        self.readiness = readiness
+        self.start_gate = start_gate
+        self.start_timeout = start_timeout
+        self.warmup = warmup
         self.vad_factory = vad_factory or (
-            lambda: VADEngine(threshold=config.vad_threshold, sample_rate=config.sample_rate)
+            lambda: VADEngine(threshold=config.vad_threshold, sample_rate=config.sample_rate,
+                              backend=config.vad_backend, onnx_path=config.vad_onnx_path,
+                              threads=vad_threads)
         )
-        self.device_provider = device_provider or AudioCaptureManager()
+        if device_provider is None:
+            # Imported lazily: PyAudio is only needed for live capture
+            from bailiff.features.audio_ingest.capture import get_capture_backend
+            device_provider = get_capture_backend(config.capture_backend, config.loopback_source)
+        self.device_provider = device_provider
+
+        # "mixed" averages mic and loopback into one stream; "separate" endpoints each source
+        # on its own so downstream consumers know whether speech came from the local user
+        if config.source_mode not in ("mixed", "separate"):
+            raise ValueError(f"Unknown source mode: {config.source_mode}")
+        self.sources = ["mixed"] if config.source_mode == "mixed" else ["mic", "loopback"]
+
+        chunk_duration = config.chunk_size / config.sample_rate
+        self.endpointers = {
+            source: Endpointer(
+                chunk_duration,
+                start_threshold=config.vad_threshold,
+                stop_threshold=config.vad_stop_threshold,
+                smoothing=config.vad_smoothing,
+                min_silence=config.silence_limit,
+                speech_pad=config.speech_pad,
+                min_speech=config.min_speech_duration,
+                max_segment=config.max_segment_duration,
+                overlap=config.segment_overlap,
+                search_window=config.split_search_window,
+            )
+            for source in self.sources
+        }
+        self.endpoint_latencies = deque(maxlen=100)
+
+        # Partial transcripts: audio of the utterance in progress is published in increments
+        self.partial_chunks = round(config.partial_interval / chunk_duration) if config.partial_interval > 0 else 0
+        if self.partial_chunks and not hasattr(output_queue, "offer"):
+            logger.warning("Partial transcripts need an AudioBroadcast output, disabling them")
+            self.partial_chunks = 0
+        self._published = {source: 0 for source in self.sources}  # chunks of each utterance already sent
+
+        self.energy_gates = {}
+        if config.energy_gate:
+            self.energy_gates = {
+                source: EnergyGate(ratio=config.energy_gate_ratio,
+                                   hangover_chunks=round(config.energy_gate_hangover / chunk_duration))
+                for source in self.sources
+            }
+
+        # Unpaced replay reads both files as fast as it can, so their reader threads drift
+        # apart freely: loopback is instead pulled in step with each mic batch, with room
+        # in the jitter buffer for a whole batch on top of its target fill
+        replay = isinstance(device_provider, FileCaptureProvider)
+        self._lockstep = replay and device_provider.speed <= 0
+        max_latency = 0.5
+        if self._lockstep:
+            max_latency = max(max_latency, config.jitter_buffer + (config.vad_max_batch + 1) * chunk_duration)
+        self.mixer = AudioMixer(config.chunk_size, config.sample_rate,
+                                target_latency=config.jitter_buffer, max_latency=max_latency,
+                                correct_drift=not self._lockstep)
 
         self._stop_event = threading.Event()
-        self._mic_queue = queue.Queue()
-        self._sys_queue = queue.Queue()
+        # Bounded: if processing stalls, a live device's oldest audio is dropped (and accounted
+        # for on the timeline) rather than growing memory and latency without limit. Replayed
+        # files can wait, so their readers are held back instead and no audio is lost
+        capture_chunks = max(1, int(config.capture_queue * config.sample_rate / config.chunk_size))
+        capture_policy = BLOCK if replay else DROP_OLDEST
+        self._mic_queue = BoundedQueue("mic", capture_chunks, capture_policy, local=True)
+        self._sys_queue = BoundedQueue("loopback", capture_chunks, capture_policy, local=True)
+        self._mic_dropped = 0
+        self._start_times = {}  # wall time of the first sample captured by each worker
+        self._finished = set()  # workers whose stream has ended
+        self._has_loopback = False
+        self._chunk_count = 0
 
-    def _capture_worker(self, stream, channels: int, target_queue: queue.Queue,
+    def _capture_worker(self, stream, channels: int, target_queue: BoundedQueue,
                         source_rate: int | None = None, target_rate: int | None = None,
                         name: str = "unknown"):
         """
         Worker thread that captures audio from a PyAudio stream and puts it into a queue.
-        If source_rate != target_rate, resamples the audio to target_rate.
+        If source_rate != target_rate, resamples the audio to target_rate with a streaming
+        polyphase resampler and re-blocks the output into exact chunk_size chunks.
         """
         worker_log = logging.getLogger(f"bailiff.audio.worker.{name}")
 
@@ -56,13 +150,15 @@ class AudioIngestService:
             return
 
         needs_resample = (source_rate and target_rate and source_rate != target_rate)
+        resampler = StreamingResampler(source_rate, target_rate) if needs_resample else None
+        pending = np.empty(0, dtype=np.float32)
         
-        # Initialize Preprocessor (High-pass filter)
+        # Initialize Preprocessor (high-pass filter, AGC, noise gate as configured)
         # Use target_rate if available (resampling happens first), otherwise source_rate (or config default)
         # Note: We process *after* resampling, so we should always use the target sample rate of the processing pipeline
         # if we are resampling to it.
         effective_rate = target_rate if target_rate else (source_rate if source_rate else self.config.sample_rate)
-        preprocessor = AudioPreprocessor(sample_rate=effective_rate)
+        preprocessor = AudioPreprocessor(sample_rate=effective_rate, stages=self.config.preprocessing)
 
         # Read size matches the stream's frames_per_buffer (may differ from chunk_size for loopback)
         read_size = stream._frames_per_buffer
@@ -76,123 +172,259 @@ class AudioIngestService:
             while not self._stop_event.is_set():
                 try:
                     raw_data = stream.read(read_size, exception_on_overflow=False)
+                    if name not in self._start_times:
+                        self._start_times[name] = time.time() - read_size / (source_rate or self.config.sample_rate)
                     data = np.frombuffer(raw_data, dtype=np.float32)
 
                     # Convert to mono if multi-channel
                     if channels > 1:
                         data = data.reshape(-1, channels).mean(axis=1)
 
-                    # Resample to target rate and exact chunk_size
-                    if needs_resample:
-                        data = resample(data, self.config.chunk_size).astype(np.float32)
-                        
-                    # Apply Preprocessing (High-pass filter)
-                    data = preprocessor.process(data)
+                    # Apply Preprocessing
+                    if resampler is None:
+                        chunks = [preprocessor.process(data)]
+                    else:
+                        # Resampled blocks carry a fractional number of chunks; keep the
+                        # remainder so the stream stays sample-accurate against the mic
+                        pending = np.concatenate((pending, preprocessor.process(resampler.process(data))))
+                        n_full = len(pending) // self.config.chunk_size
+                        chunks = np.split(pending[:n_full * self.config.chunk_size], n_full) if n_full else []
+                        pending = pending[n_full * self.config.chunk_size:]
 
-                    chunk_count += 1
-                    if chunk_count % 100 == 1:
-                        level = np.abs(data).max()
-                        worker_log.debug("chunk #%d, shape=%s, level=%.4f, qsize=%d",
-                                         chunk_count, data.shape, level, target_queue.qsize())
+                    for data in chunks:
+                        chunk_count += 1
+                        if chunk_count % 100 == 1:
+                            level = np.abs(data).max()
+                            worker_log.debug("chunk #%d, shape=%s, level=%.4f, qsize=%d",
+                                             chunk_count, data.shape, level, target_queue.qsize())
+                            worker_log.debug("Preprocessing per chunk: %s", ", ".join(
+                                f"{stage}={us:.0f}us" for stage, us in preprocessor.stage_times().items()))
 
-                    target_queue.put(data)
+                        self._enqueue(target_queue, data)
+                except EOFError:
+                    worker_log.info("End of stream")
+                    break
+                except TimeoutError:
+                    # WASAPI loopback delivers nothing while the system is silent
+                    worker_log.debug("No audio from device, waiting")
                 except Exception as e:
                     if not self._stop_event.is_set():
                         worker_log.error("Capture error: %s", e, exc_info=True)
         finally:
+            self._finished.add(name)
             worker_log.info("Stopping after %d chunks", chunk_count)
             stream.stop_stream()
             stream.close()
 
-    def _process_audio_stream(self, vad_engine):
+    def _enqueue(self, target_queue: BoundedQueue, data: np.ndarray):
+        """
+        Put a captured chunk, waiting for room on a blocking queue until the service stops.
+        """
+        while not self._stop_event.is_set():
+            try:
+                target_queue.put(data, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _pull_loopback(self, samples: int):
+        """
+        Fill the jitter buffer up to `samples`, waiting for the loopback reader unless its
+        stream has ended. The rest stays queued, holding the reader back.
+        """
+        while self.mixer.jitter_fill < samples and not self._stop_event.is_set():
+            ended = "loopback" in self._finished
+            try:
+                self.mixer.push_system(self._sys_queue.get(block=not ended, timeout=0.5))
+            except queue.Empty:
+                if ended:
+                    break
+
+    def _process_audio_stream(self, vad_engines: dict[str, VADEngine]):
         """
         Process audio stream and detect speech.
+        `vad_engines` holds one (stateful) VAD engine per source.
         """
-        buffer = []
-        silence_chunk = np.zeros(self.config.chunk_size, dtype=np.float32)
-        process_count = 0
-        speech_count = 0
+        mixer = self.mixer
+        separate = self.config.source_mode == "separate"
         
-        logger.info("Audio processing started: chunk_size=%d, sample_rate=%d, silence_limit=%.2fs",
-                     self.config.chunk_size, self.config.sample_rate, self.config.silence_limit)
+        logger.info("Audio processing started: chunk_size=%d, sample_rate=%d, silence_limit=%.2fs, sources=%s",
+                     self.config.chunk_size, self.config.sample_rate, self.config.silence_limit, self.sources)
 
         while not self._stop_event.is_set():
             # Master Clock (mic)
             try:
-                mic_data = self._mic_queue.get(timeout=1.0)
+                mic_backlog = [self._mic_queue.get(timeout=1.0)]
             except queue.Empty:
+                if "mic" in self._finished:
+                    logger.info("Mic stream ended")
+                    break
                 logger.debug("Mic queue empty (timeout)")
                 continue
 
-            # Slave Clock (system)
-            try:
-                sys_data = self._sys_queue.get(timeout=1.0)
-            except queue.Empty:
-                sys_data = silence_chunk
-            
-            # Mixing
-            mixed_data = (mic_data + sys_data) / 2.0
-            
-            process_count += 1
-            mic_level = np.abs(mic_data).max()
-            sys_level = np.abs(sys_data).max()
-            mix_level = np.abs(mixed_data).max()
-
-            # VAD
-            is_speech = vad_engine.is_speech(mixed_data)
-
-            if process_count % 50 == 1:
-                logger.debug("chunk #%d | mic=%.4f sys=%.4f mix=%.4f | speech=%s buffer=%d total_speech=%d",
-                             process_count, mic_level, sys_level, mix_level,
-                             is_speech, len(buffer), speech_count)
-
-            if is_speech:
-                speech_count += 1
-                buffer.append(mixed_data)
-                if len(buffer) == 1:
-                    logger.info("Speech started (chunk #%d)", process_count)
+            # Take whatever else has queued up so VAD scores the backlog in one call
+            while len(mic_backlog) < self.config.vad_max_batch:
+                try:
+                    mic_backlog.append(self._mic_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if mixer.start_time is None:
+                mixer.start_time = self._start_times.get("mic", time.time())
+
+            # Audio dropped from the mic queue still happened: keep the timeline in step
+            dropped = self._mic_queue.stats().dropped
+            if dropped > self._mic_dropped:
+                logger.warning("Processing fell behind, %d mic chunk(s) dropped", dropped - self._mic_dropped)
+                mixer.skip((dropped - self._mic_dropped) * self.config.chunk_size)
+                self._mic_dropped = dropped
+
+            # Slave Clock (system): whatever loopback has delivered goes into the jitter buffer
+            if self._lockstep and self._has_loopback:
+                self._pull_loopback(mixer.target_fill + len(mic_backlog) * self.config.chunk_size)
             else:
-                current_duration = len(buffer) * self.config.chunk_size / self.config.sample_rate
-
-                if current_duration > self.config.silence_limit:
-                    logger.info("Speech ended, flushing: %d chunks, %.2fs", len(buffer), current_duration)
-                    self._flush_buffer(buffer)
-                    buffer = []
-                elif buffer:
-                    buffer.append(mixed_data)
-
-                    if len(buffer) > 10:
-                        logger.debug("Buffer overflow (>10 silence chunks), clearing")
-                        buffer = []
-                    
-            
-    def _flush_buffer(self, buffer):
+                while True:
+                    try:
+                        mixer.push_system(self._sys_queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            if separate:
+                mic_chunks, system_chunks, timestamps = mixer.align(mic_backlog)
+                streams = {"mic": mic_chunks}
+                if self._has_loopback:
+                    streams["loopback"] = system_chunks
+            else:
+                mixed_chunks, timestamps = mixer.mix(mic_backlog)
+                streams = {"mixed": mixed_chunks}
+
+            for source, chunks in streams.items():
+                self._endpoint(source, chunks, timestamps, vad_engines[source])
+
+            self._chunk_count += len(mic_backlog)
+            if self._chunk_count % 50 < len(mic_backlog):
+                logger.debug("Mixer: jitter=%d samples, drift=%.1f ppm, underruns=%d, dropped=%d, backlog=%d",
+                             mixer.jitter_fill, mixer.drift_ppm, mixer.underruns, mixer.dropped, len(mic_backlog))
+                for source, gate in self.energy_gates.items():
+                    logger.debug("Energy gate (%s): floor=%.5f, skipped %d/%d VAD calls (%.0f%%)", source,
+                                 gate.noise_floor, gate.skipped, gate.total, gate.skip_ratio * 100)
+
+        for source, endpointer in self.endpointers.items():
+            for segment in endpointer.flush():
+                self._flush_buffer(segment.chunks, segment.start_time, source)
+
+    def _endpoint(self, source: str, chunks: np.ndarray, timestamps: np.ndarray, vad_engine: VADEngine):
+        """
+        Score a backlog of chunks from one source and feed them to that source's endpointer.
+        """
+        endpointer = self.endpointers[source]
+        gate = self.energy_gates.get(source)
+
+        # VAD (only on chunks the energy gate lets through)
+        if gate is None:
+            speech_probs = vad_engine.speech_probs(chunks)
+        else:
+            gate_mask = gate.process(chunks)
+            speech_probs = np.zeros(len(chunks), dtype=np.float32)
+            if gate_mask.any():
+                speech_probs[gate_mask] = vad_engine.speech_probs(chunks[gate_mask])
+
+        for chunk, speech_prob, chunk_time in zip(chunks, speech_probs, timestamps):
+            was_speech = endpointer.in_speech
+            segments = endpointer.process(chunk, float(speech_prob), chunk_time)
+
+            if endpointer.in_speech and not was_speech:
+                logger.info("Speech started (%s, p=%.2f smoothed=%.2f)", source, speech_prob, endpointer.probability)
+
+            for segment in segments:
+                self._flush_buffer(segment.chunks, segment.start_time, source)
+                self._published[source] = 0
+                if not endpointer.in_speech:
+                    # Time from the end of speech to the flush, including queueing upstream
+                    latency = time.time() - segment.speech_end
+                    self.endpoint_latencies.append(latency)
+                    logger.info("Speech ended (%s): endpoint latency %.3fs (mean %.3fs over last %d)",
+                                source, latency, np.mean(self.endpoint_latencies), len(self.endpoint_latencies))
+
+            if self.partial_chunks and endpointer.in_speech:
+                buffered = endpointer.buffered
+                published = self._published[source]
+                if len(buffered) - published >= self.partial_chunks:
+                    chunk_duration = self.config.chunk_size / self.config.sample_rate
+                    # An increment a consumer had no room for is sent again with the next one
+                    if self._flush_buffer(buffered[published:], endpointer.start_time + published * chunk_duration,
+                                          source, is_final=False):
+                        self._published[source] = len(buffered)
+
+    def _flush_buffer(self, buffer, timestamp: float, source: str = "mixed", is_final: bool = True) -> bool:
         """
         Flush the buffer to the output queue.
+        `timestamp` is the timeline position of the first buffered sample. With
+        `is_final=False` the buffer is the latest audio of an utterance still in progress,
+        only offered to the consumers; returns False if one of them had no room for it.
         """
         if not buffer:
-            return
-        
-        full_audio = np.concatenate(buffer)
-        duration = len(full_audio) / self.config.sample_rate
-        timestamp = time.time() - duration
+            return True
         
+        audio_chunk = None
+        if self.audio_buffer is not None:
+            try:
+                # Write straight from the chunk list into shared memory, no concatenation
+                length = sum(len(b) for b in buffer)
+                offset = self.audio_buffer.write(buffer)
+                full_audio = self.audio_buffer.read(offset, length)
+                duration = length / self.config.sample_rate
+                audio_chunk = AudioChunkRef(
+                    offset=offset,
+                    length=length,
+                    sample_rate=self.config.sample_rate,
+                    timestamp=timestamp,
+                    duration=duration,
+                    is_speech=True,
+                    source=source,
+                    is_final=is_final,
+                )
+            except ValueError as e:
+                logger.warning("Falling back to pickled audio: %s", e)
+
+        if audio_chunk is None:
+            full_audio = np.concatenate(buffer)
+            duration = len(full_audio) / self.config.sample_rate
+            audio_chunk = AudioChunk(
+                data=full_audio,
+                sample_rate=self.config.sample_rate,
+                timestamp=timestamp,
+                duration=duration,
+                is_speech=True,
+                source=source,
+                is_final=is_final,
+            )
+
+        if not is_final:
+            return self.output_queue.offer(audio_chunk)
+
         rms = np.sqrt(np.mean(full_audio ** 2))
         peak = np.abs(full_audio).max()
-        logger.info("Flushing buffer: %d chunks, %.2fs, peak=%.4f, rms=%.4f",
-                     len(buffer), duration, peak, rms)
-
-        audio_chunk = AudioChunk(
-            data=full_audio,
-            sample_rate=self.config.sample_rate,
-            timestamp=timestamp,
-            duration=duration,
-            is_speech=True
-        )
+        logger.info("Flushing buffer (%s): %d chunks, %.2fs, peak=%.4f, rms=%.4f",
+                     source, len(buffer), duration, peak, rms)
         
         self.output_queue.put(audio_chunk)
-        logger.debug("AudioChunk queued (output_queue size ~%d)", self.output_queue.qsize())
+        logger.debug("AudioChunk published (output backlog ~%d)", self.output_queue.qsize())
+        return True
         
+    def _load_vad(self) -> dict[str, VADEngine]:
+        """
+        One VAD engine per source (Silero keeps recurrent state), loaded side by side.
+        """
+        engines = load_parallel({f"Silero VAD ({source})": self.vad_factory for source in self.sources},
+                                self.readiness)
+        vad_engines = dict(zip(self.sources, engines.values()))
+        if self.warmup:
+            for vad_engine in vad_engines.values():
+                vad_engine.speech_probs(np.zeros((1, self.config.chunk_size), dtype=np.float32))
+                vad_engine.reset()
+        return vad_engines
+
     def run(self):
         """
         Entry point for the service.
@@ -200,7 +432,16 @@ class AudioIngestService:
         logger.info("Starting service: sample_rate=%d, chunk_size=%d, vad_threshold=%.2f",
                      self.config.sample_rate, self.config.chunk_size, self.config.vad_threshold)
 
-        vad_engine = self.vad_factory()
+        try:
+            vad_engines = self._load_vad()
+        except Exception as e:
+            if self.readiness is not None:
+                self.readiness.failed(e)
+            raise
+        if self.readiness is not None:
+            self.readiness.ready("waiting for the pipeline" if self.start_gate is not None else "")
+        if self.start_gate is not None and not self.start_gate.wait(self.start_timeout):
+            logger.warning("Pipeline not ready after %.0fs, capturing anyway", self.start_timeout)
         provider = self.device_provider
         
         # Open mic stream
@@ -217,6 +458,7 @@ class AudioIngestService:
         )
         if loopback_result is not None:
             sys_stream, sys_channels, sys_native_rate = loopback_result
+            self._has_loopback = True
         else:
             logger.warning("No loopback device found, system audio will not be captured")
         
@@ -237,7 +479,10 @@ class AudioIngestService:
         logger.info("Capture threads started")
         
         try:
-            self._process_audio_stream(vad_engine)
+            self._process_audio_stream(vad_engines)
+            if not self._stop_event.is_set():
+                # The source ran out (e.g. replayed files): signal end of stream downstream
+                self.output_queue.put(None)
         except KeyboardInterrupt:
             logger.info("KeyboardInterrupt received")
         finally:
@@ -246,15 +491,36 @@ class AudioIngestService:
             mic_thread.join()
             sys_thread.join()
             provider.terminate()
+            for q in (self._mic_queue, self._sys_queue):
+                stats = q.stats()
+                logger.info("Capture queue %s: %d dropped, wait mean %.3fs max %.3fs",
+                            stats.name, stats.dropped, stats.mean_wait, stats.max_wait)
+            for source, gate in self.energy_gates.items():
+                logger.info("Energy gate (%s) skipped %d/%d VAD calls (%.0f%%)", source, gate.skipped,
+                            gate.total, gate.skip_ratio * 100)
+            if self.audio_buffer is not None:
+                self.audio_buffer.close()
             logger.info("Shutdown complete")
             
 
-def run_ingest_service(output_queue: ProcessQueue, config: AudioConfig, log_file: str | None = None):
+def run_ingest_service(output_queue: "ProcessQueue | AudioBroadcast", config: AudioConfig, log_file: str | None = None,
+                       audio_buffer_name: str | None = None, readiness: ReadinessReporter | None = None,
+                       start_gate=None, threads: StageThreads | None = None):
     """
     Run the ingest service.
+    `output_queue` is either a plain queue or an AudioBroadcast publishing to every audio consumer.
     """
     setup_logging(log_file=log_file)
-    service = AudioIngestService(output_queue, config)
+    apply_threads(threads)
+    audio_buffer = SharedAudioBuffer.attach(audio_buffer_name) if audio_buffer_name else None
+    device_provider = None
+    if config.replay_mic:
+        device_provider = FileCaptureProvider(config.replay_mic, config.replay_loopback, config.replay_speed)
+    service = AudioIngestService(output_queue, config, device_provider=device_provider,
+                                 audio_buffer=audio_buffer, readiness=readiness, start_gate=start_gate,
+                                 start_timeout=settings.pipeline.ready_timeout,
+                                 warmup=settings.pipeline.warmup,
+                                 vad_threads=threads.intra_op if threads else 1)
     service.run()
     
 if __name__ == "__main__":
@@ -265,7 +531,7 @@ if __name__ == "__main__":
 
     audio_queue = ProcessQueue()
 
-    p = Process(target=run_ingest_service, args=(audio_queue, AudioConfig()))
+    p = Process(target=run_ingest_service, args=(audio_queue, settings.audio))
     p.start()
     
     try:
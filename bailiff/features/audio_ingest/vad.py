@@ -3,35 +3,111 @@ import logging
 import numpy as np
 import torch
 
+from bailiff.core.model_registry import SILERO_VAD, SILERO_VAD_ONNX, ModelRegistry
+
 logger = logging.getLogger("bailiff.audio.vad")
 
 
+class _OnnxSileroModel:
+    """
+    Silero VAD running directly on ONNX Runtime with explicit recurrent state.
+
+    Mirrors the context handling of Silero's own ONNX wrapper: every window is prefixed
+    with the tail of the previous one.
+    """
+    def __init__(self, model_path: str, sample_rate: int, threads: int = 1):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.sr = np.array(sample_rate, dtype=np.int64)
+        self.context_size = 64 if sample_rate == 16000 else 32
+        self.reset_states()
+
+    def reset_states(self):
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros((1, self.context_size), dtype=np.float32)
+
+    def probs(self, chunks: np.ndarray) -> np.ndarray:
+        out = np.empty(len(chunks), dtype=np.float32)
+        for i, chunk in enumerate(chunks):
+            x = np.concatenate((self.context, chunk[None, :]), axis=1)
+            prob, self.state = self.session.run(None, {"input": x, "state": self.state, "sr": self.sr})
+            self.context = x[:, -self.context_size:]
+            out[i] = prob[0, 0]
+        return out
+
+
 class VADEngine:
     """
     Voice Activity Detection (VAD) engine using Silero VAD.
 
-    Detects speech in audio chunks to filter out silence and background noise.
+    Detects speech in audio chunks to filter out silence and background noise. Chunks can be
+    scored one by one (`is_speech`) or as a backlog in a single call (`speech_probs`); Silero's
+    recurrent state carries over either way. The model runs on PyTorch (via torch.hub) or
+    directly on ONNX Runtime.
     """
-    def __init__(self, model_name: str = "snakers4/silero-vad", 
-                 threshold: float = 0.6, 
-                 sample_rate: int = 16000):
-        self.model, self.utils = torch.hub.load(model_name, 
-                                                model='silero_vad', 
-                                                force_reload=False,
-                                                onnx=False)
+    def __init__(self, model_name: str = "snakers4/silero-vad",
+                 threshold: float = 0.6,
+                 sample_rate: int = 16000,
+                 backend: str = "torch",
+                 onnx_path: str | None = None,
+                 threads: int = 1):
         self.threshold = threshold
         self.sample_rate = sample_rate
-        self.to_tensor = lambda x: torch.from_numpy(x)
+        self.backend = backend
+
+        registry = ModelRegistry()
+
+        if backend == "onnx":
+            onnx_path = onnx_path or registry.resolve(SILERO_VAD_ONNX, model_name)
+            if not onnx_path:
+                raise ValueError("The onnx VAD backend requires a model path (audio.vad_onnx_path) "
+                                 "or a prefetched model (bailiff models prefetch --convert)")
+            self.model = _OnnxSileroModel(onnx_path, sample_rate, threads)
+        elif backend == "torch":
+            # A prefetched copy of the repository loads without contacting GitHub
+            local_repo = registry.resolve(SILERO_VAD, model_name)
+            self.model, self.utils = torch.hub.load(local_repo or model_name,
+                                                    model='silero_vad',
+                                                    source='local' if local_repo else 'github',
+                                                    force_reload=False,
+                                                    onnx=False)
+        else:
+            raise ValueError(f"Unknown VAD backend: {backend}")
+
+        logger.info("VAD engine loaded: model=%s, backend=%s, threshold=%.2f, sample_rate=%d",
+                     onnx_path or model_name, backend, threshold, sample_rate)
+
+    def speech_probs(self, chunks: np.ndarray) -> np.ndarray:
+        """
+        Score consecutive chunks of one stream, shape (n_chunks, chunk_size), in order.
+        Returns a float32 vector of speech probabilities.
+        """
+        chunks = np.ascontiguousarray(chunks, dtype=np.float32).reshape(len(chunks), -1)
+        if self.backend == "onnx":
+            return self.model.probs(chunks)
+
+        # Silero's batch axis means independent streams, so the chunks run sequentially
+        # through the recurrent state; results are only synchronised once at the end
+        x = torch.from_numpy(chunks)
+        with torch.inference_mode():
+            probs = torch.cat([self.model(x[i:i + 1], self.sample_rate) for i in range(len(x))])
+        return probs.flatten().numpy()
 
-        logger.info("VAD engine loaded: model=%s, threshold=%.2f, sample_rate=%d",
-                     model_name, threshold, sample_rate)
-    
     def is_speech(self, audio_chunk: np.ndarray) -> bool:
         """
         Detect speech in an audio chunk.
         Returns True if speech is detected, False otherwise.
         """
-        audio_tensor = self.to_tensor(audio_chunk.flatten())
-        speech_prob = self.model(audio_tensor, self.sample_rate).item()
+        return bool(self.speech_probs(audio_chunk.reshape(1, -1))[0] > self.threshold)
 
-        return speech_prob > self.threshold
\ No newline at end of file
+    def reset(self):
+        """
+        Clear the recurrent state, e.g. between unrelated streams.
+        """
+        self.model.reset_states()
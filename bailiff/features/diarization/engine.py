@@ -1,4 +1,5 @@
 import logging
+import queue
 from multiprocessing.queues import Queue as ProcessQueue
 
 import numpy as np
@@ -6,6 +7,8 @@ import torch
 from speechbrain.pretrained import EncoderClassifier
 
 from bailiff.core.events import AudioChunk, DiarizationResult
+from bailiff.core.model_registry import ECAPA, ModelRegistry
+from bailiff.features.diarization.centroids import SpeakerCentroids
 
 logger = logging.getLogger("bailiff.features.diarization.engine")
 
@@ -16,21 +19,36 @@ class DiarizationEngine:
     Receives AudioChunk objects from `audio_queue`, extracts embeddings,
     clusters them using a simple algorithm with cosine similarity, 
     and pushes DiarizationResult objects to `output_queue`.
+
+    In separate-source mode, chunks from the mic are labeled `local_speaker` without computing
+    an embedding; only loopback speech is clustered.
+
+    Known speakers live in a SpeakerCentroids store; pass one (e.g. `SpeakerCentroids.load`)
+    to start from enrolled voices.
+
+    When chunks pile up, up to `max_batch` of them are taken at once and embedded together
+    (padded, with `wav_lens`); speakers are still assigned one chunk at a time, in order.
     """
+    MAX_PADDING = 0.25   # padding allowed in a batch, relative to its shortest chunk
 
     def __init__(self, audio_queue: ProcessQueue, output_queue: ProcessQueue, 
                  model_source: str = "speechbrain/spkrec-ecapa-voxceleb", threshold: float = 0.3,
-                 inertia_weight: float = 0.1):
+                 inertia_weight: float = 0.1, local_speaker: str | None = "You",
+                 max_batch: int = 8, centroids: SpeakerCentroids | None = None):
         self.audio_queue = audio_queue
         self.output_queue = output_queue
         self.threshold = threshold
         self.inertia_weight = inertia_weight
+        self.local_speaker = local_speaker
+        self.max_batch = max(1, max_batch)
         
         logger.info("Initializing SpeechBrain Speaker Embedding with model: %s", model_source)
         
+        local_path = ModelRegistry().resolve(ECAPA, model_source)
+
         try:
             self.classifier = EncoderClassifier.from_hparams(
-                source=model_source, 
+                source=local_path or model_source, 
                 run_opts={"device": "cpu"} # Force CPU unless we add GPU support config
             )
             logger.info("SpeechBrain Classifier initialized successfully.")
@@ -38,18 +56,17 @@ class DiarizationEngine:
             logger.error("Failed to initialize SpeechBrain Classifier: %s", e)
             raise
 
-        # Clustering state
-        self.speakers = {} # { "Speaker 0": { "count": 10, "embedding": [vector...] } }
-        self.next_id = 0
+        # Clustering state: one unit-norm centroid per speaker, matched with a single matvec
+        self.centroids = centroids if centroids is not None else SpeakerCentroids()
+        self.next_id = len(self.centroids)
         self.last_speaker = None
         
-    def _compute_embedding(self, audio_chunk: AudioChunk):
+    @staticmethod
+    def _samples(audio_chunk: AudioChunk) -> np.ndarray:
         """
-        Computes the speaker embedding for a given AudioChunk using SpeechBrain.
+        Mono float32 samples of a chunk.
         """
-        # SpeechBrain expects a tensor of shape (batch, time)
         # AudioChunk.data is numpy array, likely (samples,) or (channels, samples)
-        
         samples = audio_chunk.data
         if samples.ndim > 1:
             # If multi-channel, mix down or take first channel. Taking first for simplicity.
@@ -58,23 +75,70 @@ class DiarizationEngine:
         # Ensure float32
         if samples.dtype != np.float32:
             samples = samples.astype(np.float32)
+        return samples
+
+    def warmup(self):
+        """
+        One throwaway embedding, so that the first utterance does not pay for the first
+        forward pass.
+        """
+        self.embed_batch([AudioChunk(np.zeros(16000, dtype=np.float32), 16000, 0.0, 1.0)])
+
+    def _compute_embedding(self, audio_chunk: AudioChunk):
+        """
+        Computes the speaker embedding for a given AudioChunk using SpeechBrain.
+        """
+        return self._encode([self._samples(audio_chunk)])[0]
+
+    def embed_batch(self, chunks: list[AudioChunk]) -> list[np.ndarray]:
+        """
+        Speaker embeddings of several chunks, in their order.
+
+        Chunks are sorted by length and grouped so that no batch pads its shortest chunk by
+        more than MAX_PADDING; each group is one forward pass.
+        """
+        samples = [self._samples(chunk) for chunk in chunks]
+        order = sorted(range(len(samples)), key=lambda i: len(samples[i]))
+        embeddings = [None] * len(samples)
+        start = 0
+        while start < len(order):
+            limit = max(1, len(samples[order[start]])) * (1 + self.MAX_PADDING)
+            end = start + 1
+            while end < len(order) and end - start < self.max_batch and len(samples[order[end]]) <= limit:
+                end += 1
+            group = order[start:end]
+            for i, emb in zip(group, self._encode([samples[i] for i in group])):
+                embeddings[i] = emb
+            start = end
+        return embeddings
+
+    def _encode(self, batch: list[np.ndarray]) -> list[np.ndarray]:
+        """
+        One forward pass over zero-padded signals. `wav_lens` (relative lengths) makes
+        SpeechBrain's feature normalisation and attentive pooling ignore the padding.
+        """
+        # SpeechBrain expects a tensor of shape (batch, time)
+        longest = max(max(len(s) for s in batch), 1)
+        signal = np.zeros((len(batch), longest), dtype=np.float32)
+        for row, samples in zip(signal, batch):
+            row[:len(samples)] = samples
+        wav_lens = torch.tensor([len(s) / longest for s in batch], dtype=torch.float32)
 
-        # Create tensor and add batch dimension: (1, samples)
-        signal = torch.from_numpy(samples).unsqueeze(0)
-        
-        # Compute embedding
         # encode_batch returns (batch, 1, embedding_dim)
         with torch.no_grad():
-            embeddings = self.classifier.encode_batch(signal)
-            
-        # Return as flattened numpy array
-        return embeddings.squeeze().cpu().numpy()
+            embeddings = self.classifier.encode_batch(torch.from_numpy(signal), wav_lens)
+        return list(embeddings.squeeze(1).cpu().numpy())
 
     def identify(self, audio_chunk: AudioChunk) -> str:
         """
         Identifies the speaker in the given audio chunk.
         """
-        emb = self._compute_embedding(audio_chunk)
+        return self.assign(self._compute_embedding(audio_chunk))
+
+    def assign(self, emb: np.ndarray | None) -> str:
+        """
+        Match an embedding to a known speaker, or register a new one.
+        """
         if emb is None: 
             return "unknown"
         
@@ -84,66 +148,135 @@ class DiarizationEngine:
         else:
             return "unknown"
 
-        best_speaker = None
-        max_similarity = -1.0
-
-        for spk_id, data in self.speakers.items():
-            centroid = data['embedding']
-            sim = np.dot(emb, centroid)
-            
-            if spk_id == self.last_speaker:
-                sim += self.inertia_weight
-            
-            if sim > max_similarity:
-                max_similarity = sim
-                best_speaker = spk_id
+        scores = self.centroids.scores(emb)
+        if self.last_speaker in self.centroids:
+            scores[self.centroids.index(self.last_speaker)] += self.inertia_weight
+        best = int(np.argmax(scores)) if len(scores) else -1
+        max_similarity = float(scores[best]) if best >= 0 else -1.0
 
         if max_similarity > self.threshold:
-            count = self.speakers[best_speaker]['count']
-            old_emb = self.speakers[best_speaker]['embedding']
-            
-            new_emb = (old_emb * count + emb) / (count + 1)
-            new_norm = np.linalg.norm(new_emb)
-            if new_norm > 0:
-                new_emb = new_emb / new_norm 
-            
-            self.speakers[best_speaker]['embedding'] = new_emb
-            self.speakers[best_speaker]['count'] += 1
-            
+            best_speaker = self.centroids.ids[best]
+            self.centroids.update(best, emb)
             self.last_speaker = best_speaker
             logger.debug("Matched %s with similarity %.4f", best_speaker, max_similarity)
             return best_speaker
-            
-        else:
-            new_name = f"Speaker {self.next_id}"
-            self.speakers[new_name] = {
-                "count": 1,
-                "embedding": emb
-            }
-            logger.debug("New speaker %s created. Max similarity was %.4f (Threshold: %.2f)", new_name, max_similarity, self.threshold)
-            self.next_id += 1
-            self.last_speaker = new_name
-            return new_name
+
+        while f"Speaker {self.next_id}" in self.centroids:
+            self.next_id += 1   # taken by a loaded speaker
+        new_name = f"Speaker {self.next_id}"
+        self.centroids.add(new_name, emb)
+        logger.debug("New speaker %s created. Max similarity was %.4f (Threshold: %.2f)", new_name, max_similarity, self.threshold)
+        self.next_id += 1
+        self.last_speaker = new_name
+        return new_name
+
+    def _next_batch(self) -> tuple[list[AudioChunk], bool]:
+        """
+        Wait for a chunk, then take the ones already queued behind it (up to `max_batch`).
+        Returns the chunks and whether the stream continues.
+        """
+        chunk = self.audio_queue.get()
+        if chunk is None:
+            return [], False
+        batch = [chunk]
+        while len(batch) < self.max_batch:
+            try:
+                chunk = self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                return batch, False
+            batch.append(chunk)
+        return batch, True
+
+    def label(self, chunks: list[AudioChunk]) -> list[str]:
+        """
+        Speakers of consecutive chunks: embeddings are computed in batches, then speakers are
+        assigned in arrival order, as if the chunks had been embedded one by one.
+        """
+        local = [chunk.source == "mic" and bool(self.local_speaker) for chunk in chunks]
+        embeddings = iter(self.embed_batch([c for c, is_local in zip(chunks, local) if not is_local]))
+        return [self.local_speaker if is_local else self.assign(next(embeddings)) for is_local in local]
 
     def run(self):
         """Block until the audio source stream completes (poison pill)."""
-        logger.info("Diarization engine running (SpeechBrain ECAPA-TDNN)")
+        logger.info("Diarization engine running (SpeechBrain ECAPA-TDNN, batches of up to %d)", self.max_batch)
         
-        while True:
-            chunk: AudioChunk = self.audio_queue.get()
-            if chunk is None:
-                logger.info("Received poison pill, stopping diarization engine.")
-                break
-                
-            speaker = self.identify(chunk)
-            
-            result = DiarizationResult(
-                speaker=speaker,
-                start_time=chunk.timestamp,
-                end_time=chunk.timestamp + chunk.duration
-            )
-            
-            logger.debug("Speaker %s [%.2f–%.2f]", speaker, result.start_time, result.end_time) 
-            self.output_queue.put(result)
+        running = True
+        while running:
+            batch, running = self._next_batch()
+            if len(batch) > 1:
+                logger.debug("Embedding %d queued chunks together", len(batch))
+
+            for chunk, speaker in zip(batch, self.label(batch)):
+                self._emit(chunk, speaker)
+
+        logger.info("Received poison pill, diarization engine finished")
+
+    def _emit(self, chunk: AudioChunk, speaker: str):
+        result = DiarizationResult(
+            speaker=speaker,
+            start_time=chunk.timestamp,
+            end_time=chunk.timestamp + chunk.duration,
+            source=chunk.source,
+        )
+        
+        logger.debug("Speaker %s [%.2f–%.2f]", speaker, result.start_time, result.end_time) 
+        self.output_queue.put(result)
+
+
+if __name__ == "__main__":
+    """
+    Batched vs one-by-one embedding on a simulated backlog.
+
+    Usage: python -m bailiff.features.diarization.engine SPEECH.wav [MAX_BATCH]
+    Cuts the file into 1.5-4 s utterances, embeds them one at a time and in batches, and
+    reports throughput, the lowest cosine similarity between the two embeddings of an
+    utterance and whether both paths assign the same speakers.
+    """
+    import sys
+    import time
+
+    from scipy.signal import resample_poly
+
+    from bailiff.core.config import settings
+    from bailiff.features.audio_ingest.replay import load_audio
+
+    frames, rate = load_audio(sys.argv[1])
+    audio = frames.mean(axis=1).astype(np.float32)
+    if rate != 16000:
+        audio = resample_poly(audio, 16000, rate).astype(np.float32)
+    rng = np.random.default_rng(0)
+    chunks, start = [], 0
+    while start < len(audio):
+        length = int(rng.uniform(1.5, 4.0) * 16000)
+        chunks.append(AudioChunk(audio[start:start + length], 16000, start / 16000, len(audio[start:start + length]) / 16000))
+        start += length
+    max_batch = int(sys.argv[2]) if len(sys.argv) > 2 else settings.diarization.max_batch
+
+    engine = DiarizationEngine(None, None, model_source=settings.models.voice_embedding,
+                               threshold=settings.diarization.threshold,
+                               inertia_weight=settings.diarization.inertia_weight, max_batch=max_batch)
+    engine.warmup()
+
+    started = time.perf_counter()
+    single = [engine.embed_batch([chunk])[0] for chunk in chunks]
+    single_time = time.perf_counter() - started
+    started = time.perf_counter()
+    batched = []
+    for i in range(0, len(chunks), max_batch):
+        batched += engine.embed_batch(chunks[i:i + max_batch])
+    batched_time = time.perf_counter() - started
+
+    similarity = min(float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))) for a, b in zip(single, batched))
+    labels = []
+    for embeddings in (single, batched):
+        engine.centroids, engine.next_id, engine.last_speaker = SpeakerCentroids(), 0, None
+        labels.append([engine.assign(emb) for emb in embeddings])
 
-        logger.info("Diarization engine finished")
+    audio_seconds = len(audio) / 16000
+    print(f"{len(chunks)} utterances, {audio_seconds:.0f}s of audio")
+    print(f"one by one:       {single_time:6.2f}s ({audio_seconds / single_time:6.1f}x real time)")
+    print(f"batches of {max_batch:2d}:   {batched_time:6.2f}s ({audio_seconds / batched_time:6.1f}x real time)")
+    print(f"lowest cosine similarity {similarity:.5f}; same speakers: {labels[0] == labels[1]} "
+          f"({len(set(labels[0]))} speakers)")
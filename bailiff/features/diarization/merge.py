@@ -1,6 +1,7 @@
 import logging
 import queue
 import time
+from dataclasses import replace
 
 from bailiff.core.events import DiarizationResult, TranscriptionSegment
 
@@ -14,7 +15,9 @@ class MergeService:
     Merges transcription segments with diarization results.
 
     Aligns text from the transcription queue with speaker labels from the diarization queue
-    based on timestamps. Handles latency differences by buffering and waiting for matching
+    based on timestamps (and source, when mic and loopback are processed separately): each
+    segment takes the speaker whose result overlaps it the most.
+    Handles latency differences by buffering and waiting for matching
     events within a configurable timeout.
     """
     def __init__(self, tx_queue, diar_queue, output_queue, merge_timeout=8.0, segment_timeout=3.0):
@@ -53,49 +56,50 @@ class MergeService:
     def _handle_segment(self, segment, arrival, now):
         """Checks if the segment matches one of the diarization results
         and forwards it to the output queue."""
+
+        # Partial transcripts are shown right away; the final segment gets the speaker
+        if not segment.is_final:
+            self.pending_segments = [
+                (s, a) for s, a in self.pending_segments if s is not segment
+            ]
+            self.output_queue.put(segment)
+            return
         
         # Check if the segment matches a diarization result
+        best, best_overlap = None, 0.0
         for diarization_result in self.diar_timeline:
-            if diarization_result.start_time <= segment.start_time <= diarization_result.end_time:
-                self.pending_segments = [
-                    (s, a) for s, a in self.pending_segments if s is not segment
-                ]
-                self.output_queue.put(
-                    TranscriptionSegment(
-                        text=segment.text,
-                        start_time=segment.start_time,
-                        end_time=segment.end_time,
-                        duration=segment.duration,
-                        speaker=diarization_result.speaker
-                    )
-                )
-                return
+            if diarization_result.source != segment.source:
+                continue
+            overlap = (min(diarization_result.end_time, segment.end_time)
+                       - max(diarization_result.start_time, segment.start_time))
+            if best is None or overlap > best_overlap:
+                best, best_overlap = diarization_result, overlap
+        if best is not None and (best_overlap > 0 or best.start_time <= segment.start_time <= best.end_time):
+            self.pending_segments = [
+                (s, a) for s, a in self.pending_segments if s is not segment
+            ]
+            self.output_queue.put(replace(segment, speaker=best.speaker))
+            return
         
         # If timed out waiting for diarization, forward as unknown
         if now - arrival >= self.segment_timeout:
             self.pending_segments = [
                 (s, a) for s, a in self.pending_segments if s is not segment
             ]
-            self.output_queue.put(
-                TranscriptionSegment(
-                    text=segment.text,
-                    start_time=segment.start_time,
-                    end_time=segment.end_time,
-                    duration=segment.duration,
-                    speaker="unknown"
-                )
-            )
+            self.output_queue.put(replace(segment, speaker="unknown"))
 
         
     def prune_timeline(self):
         """Removes diarization results that are older than the merge timeout"""
         self.diar_timeline = [dr for dr in self.diar_timeline if dr.end_time > time.time() - self.merge_timeout]
 
-def run_merge_service(tx_queue, diar_queue, output_queue, log_file: str | None = None):
+def run_merge_service(tx_queue, diar_queue, output_queue, log_file: str | None = None, readiness=None):
     from bailiff.core.logging import setup_logging
     from bailiff.core.config import settings
     
     setup_logging(log_file=log_file)
+    if readiness is not None:
+        readiness.ready()
     service = MergeService(
         tx_queue, 
         diar_queue, 
@@ -3,7 +3,9 @@ from multiprocessing import Queue as ProcessQueue
 from typing import Callable
 
 from bailiff.core.config import settings
+from bailiff.core.cpu_budget import StageThreads, apply_threads
 from bailiff.core.logging import setup_logging
+from bailiff.core.readiness import ReadinessReporter
 from bailiff.features.diarization.engine import DiarizationEngine
 
 logger = logging.getLogger("bailiff.features.diarization.service")
@@ -18,20 +20,38 @@ class DiarizationService:
     def __init__(self, 
                  input_queue: ProcessQueue, 
                  output_queue: ProcessQueue,
-                 engine_factory: Callable[..., DiarizationEngine] | None = None):
+                 engine_factory: Callable[..., DiarizationEngine] | None = None,
+                 readiness: ReadinessReporter | None = None,
+                 warmup: bool = False):
         self.input_queue = input_queue
         self.output_queue = output_queue
+        self.readiness = readiness
+        self.warmup = warmup
         self.engine_factory = engine_factory or (
             lambda iq, oq: DiarizationEngine(
                 iq, oq,
+                model_source=settings.models.voice_embedding,
                 threshold=settings.diarization.threshold,
                 inertia_weight=settings.diarization.inertia_weight,
+                local_speaker=settings.diarization.local_speaker,
+                max_batch=settings.diarization.max_batch,
             )
         )
 
     def run(self):
         logger.info("Starting diarization service")
-        engine = self.engine_factory(self.input_queue, self.output_queue)
+        if self.readiness is not None:
+            self.readiness.loading("SpeechBrain ECAPA")
+        try:
+            engine = self.engine_factory(self.input_queue, self.output_queue)
+            if self.warmup:
+                engine.warmup()
+        except Exception as e:
+            if self.readiness is not None:
+                self.readiness.failed(e)
+            raise
+        if self.readiness is not None:
+            self.readiness.ready()
         logger.info("Diarization engine initialized, streaming...")
         engine.run()
         logger.info("Diarization service stopped")
@@ -40,7 +60,11 @@ class DiarizationService:
 def run_diarization_service(
         input_queue: ProcessQueue, 
         output_queue: ProcessQueue,
-        log_file: str | None = None):
+        log_file: str | None = None,
+        readiness: ReadinessReporter | None = None,
+        threads: StageThreads | None = None):
     setup_logging(log_file=log_file)
-    service = DiarizationService(input_queue, output_queue)
+    apply_threads(threads)
+    service = DiarizationService(input_queue, output_queue, readiness=readiness,
+                                 warmup=settings.pipeline.warmup)
     service.run()
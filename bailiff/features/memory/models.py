@@ -12,6 +12,7 @@ class Sessions(Base):
     name = Column(String)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
+    language = Column(String)   # detected transcription language
     
     transcripts = relationship("Transcripts", back_populates="session", cascade="all, delete-orphan")
 
@@ -29,6 +30,7 @@ class Transcripts(Base):
     start_time = Column(Float) # changed from DateTime to Float to match audio timestamps
     end_time = Column(Float)   # changed from DateTime to Float
     speaker = Column(String)
+    decoder = Column(String)   # model and beam size that produced the text
     
     session = relationship("Sessions", back_populates="transcripts")
 
@@ -3,9 +3,11 @@ import queue
 from multiprocessing.queues import Queue as ProcessQueue
 from typing import Callable
 
+from bailiff.core.cpu_budget import StageThreads, apply_threads
 from bailiff.core.db import SessionLocal
 from bailiff.core.events import SearchRequest, TranscriptionSegment
 from bailiff.core.logging import setup_logging
+from bailiff.core.readiness import ReadinessReporter, load_parallel
 from bailiff.features.memory.storage import MeetingStorage
 from bailiff.features.memory.vector_db import VectorMemory
 
@@ -18,19 +20,38 @@ class MemoryService:
     Coordinates saving transcripts to SQL (persistent storage) and VectorDB (semantic search),
     and handles search requests from the assistant.
     """
-    def __init__(self, input_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int):
+    def __init__(self, input_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int,
+                 readiness: ReadinessReporter | None = None, warmup: bool = False):
         self.input_queue = input_queue
         self.rag_queue = rag_queue
         self.session_id = session_id
         self.current_session = None
         self.sql_db = None
         self.vector_db = None
+        self.readiness = readiness
+        self.warmup = warmup
+
+    def _load_vector_db(self) -> VectorMemory:
+        vector_db = VectorMemory()
+        if self.warmup:
+            # The ONNX embedder is only loaded on first use
+            vector_db.embedding_fn(["warm up"])
+        return vector_db
     
     def run(self):
-        # Initialize resources in the process
-        db_session = SessionLocal()
-        self.sql_db = MeetingStorage(db=db_session)
-        self.vector_db = VectorMemory()
+        # Initialize resources in the process, side by side
+        try:
+            loaded = load_parallel({
+                "SQLite": lambda: MeetingStorage(db=SessionLocal()),
+                "Chroma": self._load_vector_db,
+            }, self.readiness)
+        except Exception as e:
+            if self.readiness is not None:
+                self.readiness.failed(e)
+            raise
+        self.sql_db, self.vector_db = loaded["SQLite"], loaded["Chroma"]
+        if self.readiness is not None:
+            self.readiness.ready()
 
         try:
             # Load existing session
@@ -66,7 +87,11 @@ class MemoryService:
             if self.sql_db and self.sql_db.db:
                 self.sql_db.db.close()
 
-def run_memory_service(input_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int, log_file: str):
+def run_memory_service(input_queue: ProcessQueue, rag_queue: ProcessQueue, session_id: int, log_file: str,
+                       readiness: ReadinessReporter | None = None, threads: StageThreads | None = None):
+    from bailiff.core.config import settings
     setup_logging(log_file=log_file)
-    service = MemoryService(input_queue=input_queue, rag_queue=rag_queue, session_id=session_id)
+    apply_threads(threads)
+    service = MemoryService(input_queue=input_queue, rag_queue=rag_queue, session_id=session_id,
+                            readiness=readiness, warmup=settings.pipeline.warmup)
     service.run()
@@ -42,13 +42,25 @@ class MeetingStorage:
             text=segment.text,
             start_time=segment.start_time,
             end_time=segment.end_time,
-            speaker=segment.speaker
+            speaker=segment.speaker,
+            decoder=segment.decoder,
         )
         self.db.add(transcript)
         self.db.commit()
         logger.debug("Saved transcript segment for session %d", session_id)
         return transcript
 
+    def set_session_language(self, session_id: int, language: str | None):
+        """
+        Store the transcription language of a session.
+        """
+        session = self.get_session(session_id)
+        if session is None or session.language == language:
+            return
+        session.language = language
+        self.db.commit()
+        logger.info("Session %d language: %s", session_id, language)
+
     def get_sessions(self):
         return self.db.query(Sessions).order_by(Sessions.start_time.desc()).all()
 
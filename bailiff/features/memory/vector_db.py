@@ -5,6 +5,7 @@ import chromadb
 from chromadb.utils import embedding_functions
 
 from bailiff.core.events import TranscriptionSegment 
+from bailiff.core.model_registry import CHROMA_EMBEDDING, EMBEDDING, ModelRegistry
 
 logger = logging.getLogger("bailiff.memory.vector_db")
 
@@ -22,6 +23,10 @@ class VectorMemory:
     def __init__(self, persist_path: str = "./chromadb"):
         self.client = chromadb.PersistentClient(persist_path)
         self.embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        local_path = ModelRegistry().resolve(EMBEDDING, CHROMA_EMBEDDING)
+        if local_path is not None:
+            # Use the prefetched ONNX model instead of Chroma's download cache
+            self.embedding_fn.DOWNLOAD_PATH = local_path
 
         # We use a single collection and filter by session_id in metadata when needed
         self.collection = self.client.get_or_create_collection(
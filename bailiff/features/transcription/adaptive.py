@@ -0,0 +1,104 @@
+import logging
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger("bailiff.transcription.adaptive")
+
+
+@dataclass(frozen=True)
+class DecodeProfile:
+    """
+    How to decode: beam size, and whether to use the smaller fallback model.
+    """
+    name: str
+    beam_size: int
+    fallback: bool = False
+
+
+class AdaptiveDecoder:
+    """
+    Chooses a decode profile from the transcription load.
+
+    Profiles go from full quality (beam search with the main model) to greedy decoding and,
+    if a fallback model is loaded, greedy decoding with the smaller model. After every
+    decode the controller is told the input backlog and how long the decode took; it moves
+    one step down when utterances pile up (`max_backlog`) or decoding is slower than
+    `max_rtf` seconds per second of audio, and one step back up once the queue is empty and
+    the current profile runs below `recover_rtf`.
+
+    Each level needs `hold` decodes before the next change. A profile that proved too slow
+    is not retried for `retry_after` seconds, so the controller does not flap between two
+    levels.
+    """
+    def __init__(self,
+                 beam_size: int = 5,
+                 fallback: bool = False,
+                 max_backlog: int = 4,
+                 max_rtf: float = 0.8,
+                 recover_rtf: float = 0.5,
+                 hold: int = 3,
+                 retry_after: float = 60.0,
+                 smoothing: float = 0.3):
+        self.profiles = [DecodeProfile("full", beam_size), DecodeProfile("greedy", 1)]
+        if fallback:
+            self.profiles.append(DecodeProfile("fallback", 1, fallback=True))
+        self.max_backlog = max_backlog
+        self.max_rtf = max_rtf
+        self.recover_rtf = recover_rtf
+        self.hold = hold
+        self.retry_after = retry_after
+        self.smoothing = smoothing
+
+        self.level = 0
+        self._decodes = 0                                 # decodes since the last change
+        self._rtf: dict[int, tuple[float, float]] = {}   # level -> (smoothed RTF, measured at)
+
+    @property
+    def profile(self) -> DecodeProfile:
+        return self.profiles[self.level]
+
+    def observe(self, backlog: int, audio_seconds: float, decode_seconds: float) -> DecodeProfile:
+        """
+        Record one decode with the current profile and return the profile for the next one.
+        """
+        now = time.monotonic()
+        if audio_seconds > 0:
+            rtf = decode_seconds / audio_seconds
+            previous = self._rtf.get(self.level)
+            if previous is not None:
+                rtf = previous[0] + self.smoothing * (rtf - previous[0])
+            self._rtf[self.level] = (rtf, now)
+        self._decodes += 1
+
+        rtf = self._rtf.get(self.level, (0.0, now))[0]
+        if self._decodes < self.hold:
+            return self.profile
+
+        if (backlog >= self.max_backlog or rtf > self.max_rtf) and self.level < len(self.profiles) - 1:
+            self._change(self.level + 1, backlog, rtf)
+        elif backlog == 0 and rtf < self.recover_rtf and self.level > 0:
+            upper_rtf, measured = self._rtf.get(self.level - 1, (0.0, now))
+            if upper_rtf <= self.max_rtf or now - measured > self.retry_after:
+                self._rtf.pop(self.level - 1, None)   # measure it afresh
+                self._change(self.level - 1, backlog, rtf)
+        return self.profile
+
+    def _change(self, level: int, backlog: int, rtf: float):
+        logger.info("Decoding %s -> %s (backlog %d, %.2fs per audio second)",
+                    self.profile.name, self.profiles[level].name, backlog, rtf)
+        self.level = level
+        self._decodes = 0
+
+
+def create_adaptive_decoder(config) -> AdaptiveDecoder | None:
+    """
+    Controller configured from a TranscriptionConfig, or None when decoding is fixed.
+    """
+    if not config.adaptive_decoding:
+        return None
+    return AdaptiveDecoder(
+        fallback=config.fallback_model is not None,
+        max_backlog=config.degrade_backlog,
+        max_rtf=config.degrade_rtf,
+        recover_rtf=config.recover_rtf,
+    )
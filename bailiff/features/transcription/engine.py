@@ -1,56 +1,177 @@
 import logging
+from dataclasses import dataclass, field
 
+import faster_whisper
 import numpy as np
 from faster_whisper import WhisperModel
+from packaging.version import Version
 
 from bailiff.core.config import settings
+from bailiff.core.events import WordTiming
+from bailiff.core.model_registry import WHISPER, ModelRegistry
 
 logger = logging.getLogger("bailiff.transcription.engine")
 
+
+@dataclass
+class WhisperSegment:
+    """
+    A segment decoded by Whisper, timed in seconds from the start of its audio.
+    """
+    start: float
+    end: float
+    text: str
+    words: list[WordTiming] = field(default_factory=list)
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+    compression_ratio: float = 1.0
+
+
+def _to_segment(seg, offset: float = 0.0) -> WhisperSegment:
+    words = [WordTiming(w.word.strip(), w.start - offset, w.end - offset, w.probability)
+             for w in (seg.words or [])]
+    return WhisperSegment(seg.start - offset, seg.end - offset, seg.text.strip(), words,
+                          seg.avg_logprob, seg.no_speech_prob, seg.compression_ratio)
+
+
 class WhisperEngine:
     """
     Wrapper for the Faster-Whisper transcription model.
 
-    Loads the specified Whisper model and provides a method to transcribe audio chunks.
+    Loads the specified Whisper model and provides methods to transcribe audio chunks, one
+    at a time or several together through faster-whisper's batched pipeline. Transcriptions
+    come back as timed segments, with per-word timings when `word_timestamps` is set.
     """
+    SAMPLE_RATE = 16000
+    MAX_CLIP = 30.0   # seconds; Whisper's input window
     def __init__(self, 
                 model_size: str = settings.transcription.model_size, 
                 device: str = settings.transcription.device,
                 compute_type: str = settings.transcription.compute_type,
                 language: str | None = settings.transcription.language,
+                cpu_threads: int = settings.transcription.cpu_threads,
+                num_workers: int = 1,
+                word_timestamps: bool = settings.transcription.word_timestamps,
                 ):
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
         self.language = language
+        self.cpu_threads = cpu_threads  # 0 lets CTranslate2 choose
+        self.num_workers = num_workers  # concurrent decodes; the services decode one batch at a time
+        self.word_timestamps = word_timestamps
         self.model = None
+        self.batched = None
+        self.detected: tuple[str, float] | None = None  # (language, probability) of the last auto-detection
 
     def load(self):
         """
         Load the Whisper model.
         """
+        local_path = ModelRegistry().resolve(WHISPER, self.model_size)
         self.model = WhisperModel(
-            self.model_size,
+            local_path or self.model_size,
             device=self.device,
-            compute_type=self.compute_type
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,
+            local_files_only=settings.app.offline,
         )
-        logger.info("Whisper model loaded: %s", self.model_size)
+        logger.info("Whisper model loaded: %s (cpu_threads=%d, num_workers=%d)",
+                    self.model_size, self.cpu_threads, self.num_workers)
+
+        # Batches pass clip_timestamps in seconds, which BatchedInferencePipeline only accepts
+        # from 1.2 on (1.1 reads them as sample offsets)
+        if Version(faster_whisper.__version__) >= Version("1.2"):
+            self.batched = faster_whisper.BatchedInferencePipeline(model=self.model)
+        else:
+            logger.warning("faster-whisper %s predates 1.2, batches run sequentially",
+                           faster_whisper.__version__)
 
-    def transcribe(self, audio: np.ndarray) -> str:
+    def transcribe(self, audio: np.ndarray, beam_size: int = 5) -> list[WhisperSegment]:
         """
-        Transcribe the given audio.
+        Transcribe the given audio into segments timed from its start.
         """
         if self.model is None:
             raise RuntimeError("Whisper model not loaded. Call load() first.")
 
         segments, info = self.model.transcribe(
             audio,
-            beam_size=5,
+            beam_size=beam_size,
             language=self.language,
             condition_on_previous_text=False,
+            word_timestamps=self.word_timestamps,
         )
         
-        text = " ".join([seg.text for seg in segments]).strip()
-        logger.info("Transcription: %s", text)
+        results = [_to_segment(seg) for seg in segments]
+        self._record_language(info)
+        logger.info("Transcription: %s", " ".join(seg.text for seg in results))
+
+        return results
+
+    def transcribe_partial(self, audio: np.ndarray) -> str:
+        """
+        Quick greedy decode of an utterance still in progress, for partial transcripts.
+        """
+        if self.model is None:
+            raise RuntimeError("Whisper model not loaded. Call load() first.")
+
+        segments, info = self.model.transcribe(
+            audio,
+            beam_size=1,
+            language=self.language,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+        )
+        return " ".join([seg.text for seg in segments]).strip()
+
+    def transcribe_batch(self, audios: list[np.ndarray], beam_size: int = 5) -> list[list[WhisperSegment]]:
+        """
+        Transcribe several independent utterances in one batched decode.
+        Returns the segments of each utterance (timed from its own start), in the same order.
+        """
+        if self.model is None:
+            raise RuntimeError("Whisper model not loaded. Call load() first.")
+        if len(audios) == 1 or self.batched is None:
+            return [self.transcribe(audio, beam_size) for audio in audios]
+
+        # Lay the utterances end to end and hand the batched pipeline one clip per
+        # utterance (split at Whisper's 30 s window), instead of letting its VAD re-segment
+        clips, owners, offsets = [], [], []
+        max_samples = int(self.MAX_CLIP * self.SAMPLE_RATE)
+        offset = 0
+        for index, audio in enumerate(audios):
+            offsets.append(offset / self.SAMPLE_RATE)
+            for start in range(0, len(audio), max_samples):
+                end = min(start + max_samples, len(audio))
+                clips.append({"start": (offset + start) / self.SAMPLE_RATE,
+                              "end": (offset + end) / self.SAMPLE_RATE})
+                owners.append(index)
+            offset += len(audio)
+
+        segments, info = self.batched.transcribe(
+            np.concatenate(audios),
+            beam_size=beam_size,
+            language=self.language,
+            condition_on_previous_text=False,
+            vad_filter=False,
+            clip_timestamps=clips,
+            batch_size=len(clips),
+            without_timestamps=False,
+            word_timestamps=self.word_timestamps,
+        )
+
+        self._record_language(info)
+        clip_ends = np.array([clip["end"] for clip in clips])
+        results = [[] for _ in audios]
+        for seg in segments:
+            clip = min(int(np.searchsorted(clip_ends, seg.start, side="right")), len(clips) - 1)
+            owner = owners[clip]
+            results[owner].append(_to_segment(seg, offsets[owner]))
+
+        logger.info("Batch transcription of %d utterances (%d clips): %s", len(audios), len(clips),
+                    [" ".join(seg.text for seg in result) for result in results])
+        return results
 
-        return text
\ No newline at end of file
+    def _record_language(self, info):
+        self.detected = (info.language, info.language_probability) if self.language is None else None
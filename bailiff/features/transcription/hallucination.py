@@ -0,0 +1,106 @@
+import logging
+import string
+from collections import Counter
+
+from bailiff.features.transcription.engine import WhisperSegment
+
+logger = logging.getLogger("bailiff.transcription.hallucination")
+
+NO_SPEECH = "no_speech"
+LOW_CONFIDENCE = "low_confidence"
+COMPRESSION = "compression_ratio"
+BLOCKLIST = "blocklist"
+REPETITION = "repetition"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(word.strip(string.punctuation).lower() for word in text.split())
+
+
+class HallucinationFilter:
+    """
+    Rejects Whisper segments that are likely hallucinated rather than spoken.
+
+    - `no_speech`: Whisper thinks the audio is silence and is unsure of the text
+      (no_speech_prob above `no_speech_threshold` and avg_logprob below `log_prob_threshold`).
+    - `low_confidence`: avg_logprob below `min_log_prob`, even if speech was detected.
+    - `compression_ratio`: text that compresses too well, i.e. looping output.
+    - `blocklist`: stock phrases from subtitled training data ("subtitles by", ...).
+    - `repetition`: a phrase of up to four words repeated `max_repeats` times in a row.
+
+    Rejections are counted per reason in `rejected`.
+    """
+    MAX_PHRASE_WORDS = 4
+
+    def __init__(self,
+                 no_speech_threshold: float = 0.6,
+                 log_prob_threshold: float = -1.0,
+                 min_log_prob: float = -1.5,
+                 compression_ratio_threshold: float = 2.4,
+                 blocklist: list[str] | None = None,
+                 max_repeats: int = 4):
+        self.no_speech_threshold = no_speech_threshold
+        self.log_prob_threshold = log_prob_threshold
+        self.min_log_prob = min_log_prob
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.blocklist = [_normalize(phrase) for phrase in (blocklist or []) if phrase.strip()]
+        self.max_repeats = max_repeats
+        self.rejected = Counter()
+
+    def check(self, segment: WhisperSegment) -> str | None:
+        """
+        Reason the segment should be rejected, or None to keep it.
+        """
+        reason = self._reason(segment)
+        if reason is not None:
+            self.rejected[reason] += 1
+            logger.debug("Rejected segment (%s): %s", reason, segment.text)
+        return reason
+
+    def filter(self, segments: list[WhisperSegment]) -> list[WhisperSegment]:
+        return [segment for segment in segments if self.check(segment) is None]
+
+    def _reason(self, segment: WhisperSegment) -> str | None:
+        if segment.no_speech_prob > self.no_speech_threshold and segment.avg_logprob < self.log_prob_threshold:
+            return NO_SPEECH
+        if segment.avg_logprob < self.min_log_prob:
+            return LOW_CONFIDENCE
+        if segment.compression_ratio > self.compression_ratio_threshold:
+            return COMPRESSION
+
+        text = _normalize(segment.text)
+        padded = f" {text} "
+        if any(f" {phrase} " in padded for phrase in self.blocklist):
+            return BLOCKLIST
+        if self._repeats(text.split()):
+            return REPETITION
+        return None
+
+    def _repeats(self, words: list[str]) -> bool:
+        for n in range(1, self.MAX_PHRASE_WORDS + 1):
+            for start in range(n):
+                run = 1
+                for i in range(start + n, len(words) - n + 1, n):
+                    if words[i:i + n] == words[i - n:i]:
+                        run += 1
+                        if run >= self.max_repeats:
+                            return True
+                    else:
+                        run = 1
+        return False
+
+
+def create_hallucination_filter(config) -> HallucinationFilter | None:
+    """
+    Filter configured from a TranscriptionConfig, or None when filtering is disabled.
+    """
+    if not config.filter_hallucinations:
+        return None
+    return HallucinationFilter(
+        no_speech_threshold=config.no_speech_threshold,
+        log_prob_threshold=config.log_prob_threshold,
+        min_log_prob=config.min_log_prob,
+        compression_ratio_threshold=config.compression_ratio_threshold,
+        blocklist=config.hallucination_blocklist,
+        max_repeats=config.max_repeats,
+    )
@@ -0,0 +1,104 @@
+import logging
+import multiprocessing
+from collections import defaultdict
+
+logger = logging.getLogger("bailiff.transcription.language")
+
+
+class SessionLanguage:
+    """
+    Language of the current session, shared between processes (all transcription workers
+    and the SessionManager, which stores it on the session row).
+    """
+    SIZE = 16
+
+    def __init__(self, language: str | None = None):
+        self._value = multiprocessing.Array("c", self.SIZE)
+        if language:
+            self.set(language)
+
+    def get(self) -> str | None:
+        return self._value.value.decode() or None
+
+    def set(self, language: str | None):
+        self._value.value = (language or "").encode()[:self.SIZE - 1]
+
+
+class LanguageDetector:
+    """
+    Detects the session language once instead of on every utterance.
+
+    While the language is unknown, Whisper detects it per utterance and each detection is a
+    vote weighted by its probability. The language is locked once it has `votes` detections,
+    at least `confidence` of the total weight and an average probability of `confidence`.
+    After that every `recheck_every`-th utterance is detected again; two confident detections
+    of another language in a row switch the session to it.
+    """
+    SWITCH_AFTER = 2
+
+    def __init__(self, shared: SessionLanguage, votes: int = 3, confidence: float = 0.8, recheck_every: int = 25):
+        self.shared = shared
+        self.votes = votes
+        self.confidence = confidence
+        self.recheck_every = recheck_every
+
+        self._weights = defaultdict(float)
+        self._counts = defaultdict(int)
+        self._decodes = 0
+        self._strikes = 0
+
+    def next_language(self, utterances: int = 1) -> str | None:
+        """
+        Language to decode the next `utterances` utterances (one decode call) with, or None
+        to let Whisper detect it. The re-check window counts utterances, not calls, so it
+        does not depend on how they are batched.
+        """
+        previous = self._decodes
+        self._decodes += utterances
+        locked = self.shared.get()
+        if locked is None or (self.recheck_every and
+                              previous // self.recheck_every != self._decodes // self.recheck_every):
+            return None
+        return locked
+
+    def observe(self, language: str, probability: float):
+        """
+        Record a language detected by Whisper.
+        """
+        locked = self.shared.get()
+        if locked is not None:
+            self._recheck(locked, language, probability)
+            return
+
+        self._weights[language] += probability
+        self._counts[language] += 1
+        total = sum(self._weights.values())
+        weight, count = self._weights[language], self._counts[language]
+        if count >= self.votes and weight / total >= self.confidence and weight / count >= self.confidence:
+            logger.info("Session language locked: %s (%d votes, %.0f%% of the weight)",
+                        language, count, 100 * weight / total)
+            self.shared.set(language)
+
+    def _recheck(self, locked: str, language: str, probability: float):
+        if language == locked or probability < self.confidence:
+            self._strikes = 0
+            return
+        self._strikes += 1
+        if self._strikes >= self.SWITCH_AFTER:
+            logger.info("Session language changed: %s -> %s", locked, language)
+            self.shared.set(language)
+            self._strikes = 0
+
+
+def create_language_detector(config, shared: SessionLanguage | None) -> LanguageDetector | None:
+    """
+    Detector configured from a TranscriptionConfig, or None when the language is fixed.
+    """
+    if config.language is not None or shared is None:
+        return None
+    return LanguageDetector(
+        shared,
+        votes=config.language_votes,
+        confidence=config.language_confidence,
+        recheck_every=config.language_recheck,
+    )
@@ -0,0 +1,50 @@
+import string
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+def _normalize(word: str) -> str:
+    return word.strip(string.punctuation).lower()
+
+
+class LocalAgreement:
+    """
+    Commits the words of a growing utterance that consecutive hypotheses agree on.
+
+    Each decode of the (longer) audio gives a new hypothesis; the longest common prefix of
+    the last two is stable enough to show. Committed words are never retracted.
+    """
+    def __init__(self):
+        self.committed: list[str] = []
+        self._previous: list[str] = []
+
+    def update(self, hypothesis: list[str]) -> list[str]:
+        agreed = 0
+        for previous, current in zip(self._previous, hypothesis):
+            if _normalize(previous) != _normalize(current):
+                break
+            agreed += 1
+        if agreed > len(self.committed):
+            self.committed = hypothesis[:agreed]
+        self._previous = hypothesis
+        return self.committed
+
+
+@dataclass
+class PartialUtterance:
+    """
+    Audio received so far for an utterance still in progress, and its agreed text.
+    """
+    start_time: float
+    end_time: float
+    audio: list[np.ndarray] = field(default_factory=list)
+    agreement: LocalAgreement = field(default_factory=LocalAgreement)
+    sent_words: int = 0     # committed words already published
+    stale: bool = False     # audio arrived since the last decode
+
+    def append(self, data: np.ndarray, end_time: float):
+        # Copy: the data may be a view into the shared ring buffer
+        self.audio.append(np.array(data, dtype=np.float32))
+        self.end_time = end_time
+        self.stale = True
@@ -0,0 +1,423 @@
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import Queue as ProcessQueue
+
+from bailiff.core.cpu_budget import StageThreads, apply_threads
+from bailiff.core.events import AudioChunk, TranscriptionSegment
+from bailiff.core.queues import BLOCK, BoundedQueue
+from bailiff.core.readiness import ReadinessReporter
+from bailiff.features.transcription.engine import WhisperEngine
+from bailiff.features.transcription.adaptive import create_adaptive_decoder
+from bailiff.features.transcription.hallucination import create_hallucination_filter
+from bailiff.features.transcription.language import SessionLanguage, create_language_detector
+from bailiff.features.transcription.service import OverlapTrimmer, TranscriptionService, fallback_engine_factory
+
+logger = logging.getLogger("bailiff.transcription.pool")
+
+
+@dataclass
+class WorkerResult:
+    """
+    Outcome of one dispatched chunk (or a partial transcript, with `seq` None).
+    """
+    worker: int
+    seq: int | None
+    segments: list[TranscriptionSegment]
+    start_time: float = 0.0   # span of the chunk, for seam trimming
+    end_time: float = 0.0
+    done: bool = False
+
+
+class TranscriptionWorker(TranscriptionService):
+    """
+    Pool member: a TranscriptionService that reports every numbered chunk to the pool's
+    result queue, including chunks that produced no text or failed to decode, so the pool
+    can reorder them. Seam trimming is left to the pool, since consecutive chunks land on
+    different workers.
+    """
+    def __init__(self, worker_id: int, input_queue: BoundedQueue, result_queue: ProcessQueue,
+                 upstream_backlog=None, heartbeats=None, **kwargs):
+        super().__init__(input_queue, result_queue, trim_overlap=False, **kwargs)
+        self.worker_id = worker_id
+        self.heartbeats = heartbeats
+        if upstream_backlog is not None:
+            # The work queue holds two chunks at most; the real backlog waits upstream
+            self.backlog = lambda: upstream_backlog.value + input_queue.qsize()
+
+    def _emit(self, chunk: AudioChunk, segments: list[TranscriptionSegment]):
+        self.output_queue.put(WorkerResult(self.worker_id, chunk.seq, segments,
+                                           chunk.timestamp, chunk.timestamp + chunk.duration))
+
+    def _emit_failed(self, chunks: list[AudioChunk]):
+        for chunk in chunks:
+            self._emit(chunk, [])
+
+    def _emit_partial(self, segment: TranscriptionSegment):
+        self.output_queue.put(WorkerResult(self.worker_id, None, [segment]))
+
+    def _beat(self):
+        # Runs beside loading and decoding; stops only with the process
+        while True:
+            self.heartbeats[self.worker_id] = time.time()
+            time.sleep(TranscriptionPool.HEARTBEAT_INTERVAL)
+
+    def run(self):
+        if self.heartbeats is not None:
+            threading.Thread(target=self._beat, name="heartbeat", daemon=True).start()
+        try:
+            super().run()
+        finally:
+            self.output_queue.put(WorkerResult(self.worker_id, None, [], done=True))
+
+
+class TranscriptionPool:
+    """
+    Dispatcher and reorder buffer for a pool of TranscriptionWorker processes.
+
+    Final chunks are numbered and sent to the live worker with the fewest outstanding
+    chunks; partial audio always goes to the same worker per source, which keeps its partial
+    state. Results come back in any order and are released to `output_queue` strictly by
+    sequence number, so downstream stages still see segments in time order.
+
+    A worker that stops (failed to load, or crashed out of its loop) is dropped from
+    dispatch and its outstanding chunks go to the others. So is a worker whose process died
+    without reporting it (OOM, SIGKILL), once its entry in `heartbeats` (a shared array of
+    timestamps) goes stale. A result missing for longer than MISSING_TIMEOUT is skipped so
+    one lost chunk cannot hold back the rest of the session. Partial audio is only offered:
+    a busy worker skips it, and the rest of that utterance's partials, until its final chunk.
+
+    The depth of the upstream queue is published in `backlog` (a shared integer), so the
+    workers' adaptive decoders see the same backlog a single service would.
+    """
+    MISSING_TIMEOUT = 60.0   # seconds the reorder buffer waits for a missing result
+    PUT_TIMEOUT = 1.0        # seconds between liveness checks while a work queue is full
+    HEARTBEAT_INTERVAL = 1.0 # seconds between a worker's heartbeats
+    HEARTBEAT_TIMEOUT = 15.0 # seconds without a heartbeat before a worker is given up
+
+    def __init__(self, input_queue, output_queue, work_queues: list[BoundedQueue], result_queue: ProcessQueue,
+                 backlog=None, heartbeats=None):
+        self.input_queue = input_queue
+        self.backlog = backlog
+        self.heartbeats = heartbeats
+        self.output_queue = output_queue
+        self.work_queues = work_queues
+        self.result_queue = result_queue
+        self.trimmer = OverlapTrimmer()
+
+        self._outstanding = [0] * len(work_queues)
+        self._alive = [True] * len(work_queues)
+        self._assigned: dict[int, tuple[int, AudioChunk]] = {}   # seq -> (worker, chunk) awaiting a result
+        self._lock = threading.Lock()
+        self._last_final = {}   # source -> end time of the last released final segment
+        self._skip_partials = set()   # sources whose utterance lost a partial increment
+
+    def _publish_backlog(self):
+        if self.backlog is not None:
+            self.backlog.value = self.input_queue.qsize()
+
+    def _live_workers(self) -> list[int]:
+        return [i for i, alive in enumerate(self._alive) if alive]
+
+    def _partial_worker(self, source: str) -> int | None:
+        with self._lock:
+            alive = self._live_workers()
+        return alive[sum(source.encode()) % len(alive)] if alive else None
+
+    def _check_heartbeats(self):
+        """
+        Retire workers whose process stopped beating without reporting that it stopped.
+        """
+        if self.heartbeats is None:
+            return
+        now = time.time()
+        for worker in self._live_workers():
+            last = self.heartbeats[worker]
+            if last and now - last > self.HEARTBEAT_TIMEOUT:
+                logger.error("Transcription worker %d stopped responding %.0fs ago", worker, now - last)
+                self._retire(worker)
+
+    def _dispatch(self, chunk: AudioChunk):
+        """
+        Send a numbered chunk to the least busy live worker. With no worker left, the chunk
+        is reported as failed so the reorder buffer moves past it.
+        """
+        while True:
+            with self._lock:
+                alive = self._live_workers()
+                if not alive:
+                    break
+                worker = min(alive, key=self._outstanding.__getitem__)
+                self._outstanding[worker] += 1
+                self._assigned[chunk.seq] = (worker, chunk)
+            try:
+                self.work_queues[worker].put(chunk, timeout=self.PUT_TIMEOUT)
+            except queue.Full:
+                # Busy or dead: take it back and choose again
+                with self._lock:
+                    self._outstanding[worker] -= 1
+                    self._assigned.pop(chunk.seq, None)
+                self._publish_backlog()
+                self._check_heartbeats()
+                continue
+            with self._lock:
+                if self._alive[worker] or self._assigned.get(chunk.seq, (None,))[0] != worker:
+                    return
+                # The worker stopped while we were putting; its queue is never read again
+                self._outstanding[worker] -= 1
+                del self._assigned[chunk.seq]
+
+        logger.error("No transcription worker left, dropping chunk #%d", chunk.seq)
+        self.result_queue.put(WorkerResult(-1, chunk.seq, [], chunk.timestamp, chunk.timestamp + chunk.duration))
+
+    def _retire(self, worker: int):
+        """
+        Stop dispatching to a worker and hand its outstanding chunks to the others.
+        """
+        with self._lock:
+            if not self._alive[worker]:
+                return
+            self._alive[worker] = False
+            orphans = [chunk for seq, (w, chunk) in sorted(self._assigned.items()) if w == worker]
+            for chunk in orphans:
+                del self._assigned[chunk.seq]
+            self._outstanding[worker] = 0
+        if orphans:
+            logger.warning("Transcription worker %d stopped, re-dispatching %d chunk(s)", worker, len(orphans))
+        for chunk in orphans:
+            self._dispatch(chunk)
+
+    def run(self):
+        logger.info("Transcription pool dispatching to %d workers", len(self.work_queues))
+        collector = threading.Thread(target=self._collect, name="transcription-reorder")
+        collector.start()
+
+        seq = 0
+        try:
+            while True:
+                chunk = self.input_queue.get()
+                self._publish_backlog()
+                if chunk is None:
+                    break
+                if not chunk.is_final:
+                    self._dispatch_partial(chunk)
+                    continue
+
+                self._skip_partials.discard(chunk.source)
+                chunk.seq = seq
+                seq += 1
+                self._dispatch(chunk)
+        finally:
+            with self._lock:
+                alive = self._live_workers()
+            for i in alive:
+                self.work_queues[i].put(None)
+            collector.join()
+            logger.info("Transcription pool stopped after %d chunks", seq)
+
+    def _dispatch_partial(self, chunk: AudioChunk):
+        """
+        Offer partial audio to its source's worker, never waiting: finals must not queue
+        behind it. Once an increment is dropped, the utterance gets no more partials.
+        """
+        if chunk.source in self._skip_partials:
+            return
+        self._check_heartbeats()
+        worker = self._partial_worker(chunk.source)
+        if worker is not None and not self.work_queues[worker].offer(chunk):
+            logger.debug("Transcription worker %d busy, skipping partials of %s", worker, chunk.source)
+            self._skip_partials.add(chunk.source)
+
+    def _collect(self):
+        """
+        Reorder buffer: hold results until every earlier sequence number has arrived, or
+        was given up on after MISSING_TIMEOUT.
+        """
+        pending: dict[int, WorkerResult] = {}
+        next_seq = 0
+        waiting_since = None
+        while self._live_workers():
+            try:
+                result: WorkerResult = self.result_queue.get(timeout=self.PUT_TIMEOUT)
+            except queue.Empty:
+                result = None
+                self._check_heartbeats()
+
+            if result is not None and result.done:
+                self._retire(result.worker)
+                continue
+
+            if result is not None and result.seq is None:
+                # Partial transcript: drop it if its utterance was already finalized
+                segment = result.segments[0]
+                if segment.start_time >= self._last_final.get(segment.source, float("-inf")):
+                    self.output_queue.put(segment)
+                continue
+
+            if result is not None:
+                with self._lock:
+                    if result.worker >= 0 and self._assigned.get(result.seq, (None,))[0] == result.worker:
+                        del self._assigned[result.seq]
+                        self._outstanding[result.worker] -= 1
+                if result.seq < next_seq:
+                    logger.warning("Result for chunk #%d arrived after it was skipped, dropping it", result.seq)
+                    continue
+                pending[result.seq] = result
+                if len(pending) > 1:
+                    logger.debug("Reorder buffer holding %d results, waiting for #%d", len(pending), next_seq)
+
+            if pending and next_seq not in pending:
+                waiting_since = waiting_since or time.monotonic()
+                if time.monotonic() - waiting_since > self.MISSING_TIMEOUT:
+                    logger.warning("No result for chunk #%d after %.0fs, skipping to #%d",
+                                   next_seq, self.MISSING_TIMEOUT, min(pending))
+                    next_seq = min(pending)
+
+            released = next_seq
+            next_seq = self._release(pending, next_seq)
+            if next_seq != released:
+                waiting_since = None
+
+        # Every worker has stopped: nothing else will arrive
+        if pending:
+            self._release(pending, min(pending), skip_gaps=True)
+
+    def _release(self, pending: dict[int, WorkerResult], next_seq: int, skip_gaps: bool = False) -> int:
+        """
+        Publish consecutive results from `next_seq` on; returns the next sequence number awaited.
+        """
+        while next_seq in pending or (skip_gaps and pending):
+            if next_seq not in pending:
+                next_seq = min(pending)
+            result = pending.pop(next_seq)
+            next_seq += 1
+            if not result.segments:
+                continue
+            source = result.segments[0].source
+            for segment in self.trimmer.trim(source, result.start_time, result.end_time, result.segments):
+                self.output_queue.put(segment)
+            self._last_final[source] = result.end_time
+        return next_seq
+
+
+def worker_threads(workers: int, cpu_threads: int) -> int:
+    """
+    CPU threads per worker: the configured value, or the cores split evenly across workers.
+    """
+    if cpu_threads > 0 or workers <= 1:
+        return cpu_threads
+    return max(1, (os.cpu_count() or workers) // workers)
+
+
+def run_transcription_worker(worker_id: int, input_queue: BoundedQueue, result_queue: ProcessQueue,
+                             cpu_threads: int = 0, log_file: str | None = None,
+                             session_language: SessionLanguage | None = None,
+                             readiness: ReadinessReporter | None = None,
+                             threads: StageThreads | None = None, upstream_backlog=None, heartbeats=None):
+    from bailiff.core.config import settings
+    from bailiff.core.logging import setup_logging
+    setup_logging(log_file=log_file)
+    apply_threads(threads)
+    num_workers = threads.inter_op if threads else 1
+    worker = TranscriptionWorker(
+        worker_id, input_queue, result_queue,
+        upstream_backlog=upstream_backlog,
+        heartbeats=heartbeats,
+        engine_factory=lambda: WhisperEngine(cpu_threads=cpu_threads, num_workers=num_workers),
+        batch_size=settings.transcription.batch_size,
+        batch_wait=settings.transcription.batch_wait,
+        hallucination_filter=create_hallucination_filter(settings.transcription),
+        adaptive=create_adaptive_decoder(settings.transcription),
+        fallback_factory=fallback_engine_factory(settings.transcription, cpu_threads),
+        language_detector=create_language_detector(settings.transcription, session_language),
+        readiness=readiness,
+        warmup=settings.pipeline.warmup,
+    )
+    worker.run()
+
+
+def run_transcription_pool(input_queue, output_queue, work_queues: list[BoundedQueue],
+                           result_queue: ProcessQueue, log_file: str | None = None,
+                           readiness: ReadinessReporter | None = None, backlog=None, heartbeats=None):
+    from bailiff.core.logging import setup_logging
+    setup_logging(log_file=log_file)
+    if readiness is not None:
+        readiness.ready("dispatching to workers")
+    TranscriptionPool(input_queue, output_queue, work_queues, result_queue, backlog, heartbeats).run()
+
+
+def create_work_queues(workers: int) -> list[BoundedQueue]:
+    # Small per-worker queues keep dispatch balanced; the backlog stays upstream where it
+    # can be coalesced
+    return [BoundedQueue(f"transcription-{i}", 2, BLOCK) for i in range(workers)]
+
+
+if __name__ == "__main__":
+    """
+    Throughput scaling of the worker pool.
+
+    Usage: python -m bailiff.features.transcription.pool SPEECH.wav [MAX_WORKERS]
+    Cuts the file into 5 s utterances and reports audio seconds transcribed per wall-clock
+    second for 1, 2, 4, ... workers.
+    """
+    import multiprocessing
+    import sys
+    import time
+
+    import numpy as np
+    from scipy.signal import resample_poly
+
+    from bailiff.core.config import settings
+    from bailiff.features.audio_ingest.replay import load_audio
+
+    frames, rate = load_audio(sys.argv[1])
+    audio = frames.mean(axis=1).astype(np.float32)
+    if rate != WhisperEngine.SAMPLE_RATE:
+        audio = resample_poly(audio, WhisperEngine.SAMPLE_RATE, rate).astype(np.float32)
+    step = 5 * WhisperEngine.SAMPLE_RATE
+    chunks = [AudioChunk(audio[i:i + step], WhisperEngine.SAMPLE_RATE, i / WhisperEngine.SAMPLE_RATE,
+                         len(audio[i:i + step]) / WhisperEngine.SAMPLE_RATE)
+              for i in range(0, len(audio), step)]
+    audio_seconds = len(audio) / WhisperEngine.SAMPLE_RATE
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    print(f"{len(chunks)} utterances, {audio_seconds:.0f}s of audio, model {settings.transcription.model_size}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        input_queue, output_queue, result_queue = BoundedQueue("input"), BoundedQueue("text"), ProcessQueue()
+        work_queues = create_work_queues(workers)
+        threads = worker_threads(workers, settings.transcription.cpu_threads)
+        processes = [multiprocessing.Process(target=run_transcription_worker,
+                                             args=(i, q, result_queue, threads), daemon=True)
+                     for i, q in enumerate(work_queues)]
+        for p in processes:
+            p.start()
+
+        # Warm up: every worker loads its model before the clock starts
+        # (one chunk each: a queued chunk is pickled in the background, so it must not change)
+        for i, q in enumerate(work_queues):
+            q.put(AudioChunk(np.zeros(WhisperEngine.SAMPLE_RATE, np.float32), WhisperEngine.SAMPLE_RATE,
+                             -1.0, 1.0, seq=-1 - i))
+        for _ in work_queues:
+            result_queue.get()
+
+        pool = threading.Thread(target=TranscriptionPool(input_queue, output_queue, work_queues, result_queue).run)
+        started = time.perf_counter()
+        pool.start()
+        for chunk in chunks:
+            input_queue.put(chunk)
+        input_queue.put(None)
+        pool.join()
+        elapsed = time.perf_counter() - started
+        for p in processes:
+            p.join()
+
+        speed = audio_seconds / elapsed
+        baseline = baseline or speed
+        print(f"workers={workers:2d} threads/worker={threads:2d}: {elapsed:6.1f}s, "
+              f"{speed:5.1f}x real time, scaling {speed / baseline:.2f}x")
+        workers *= 2
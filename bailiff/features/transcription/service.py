@@ -1,68 +1,385 @@
 import logging
+import queue
+import string
 import time
 from multiprocessing import Process, Queue as ProcessQueue
 from typing import Callable
 
-from bailiff.core.events import AudioChunk, TranscriptionSegment
-from bailiff.features.transcription.engine import WhisperEngine
+import numpy as np
+
+from bailiff.core.cpu_budget import StageThreads, apply_threads
+from bailiff.core.events import AudioChunk, TranscriptionSegment, WordTiming
+from bailiff.core.readiness import ReadinessReporter, load_parallel
+from bailiff.features.transcription.adaptive import AdaptiveDecoder, create_adaptive_decoder
+from bailiff.features.transcription.engine import WhisperEngine, WhisperSegment
+from bailiff.features.transcription.hallucination import HallucinationFilter, create_hallucination_filter
+from bailiff.features.transcription.language import LanguageDetector, SessionLanguage, create_language_detector
+from bailiff.features.transcription.partials import PartialUtterance
 
 logger = logging.getLogger("bailiff.transcription.service")
 
-# TODO: Add a hallucination detection mechanism to avoid non-sense transcriptions, such as "Subtitles by "
+class OverlapTrimmer:
+    """
+    Drops words repeated at the seam of overlapping chunks of the same source (long speech
+    split by the ingest service with an overlap).
+    """
+    MAX_OVERLAP_WORDS = 8
+
+    def __init__(self):
+        self._last = {}   # source -> (words, end time) of the previous transcription
+
+    def trim(self, source: str, start_time: float, end_time: float,
+             segments: list[TranscriptionSegment]) -> list[TranscriptionSegment]:
+        """
+        If the chunk overlaps the previous one from the same source, drop the longest run of
+        leading words that repeats the end of the previous transcription (along with their
+        word timings, and segments left empty).
+        """
+        n = self._overlap(source, start_time, end_time, [w for seg in segments for w in seg.text.split()])
+        trimmed = []
+        for segment in segments:
+            words = segment.text.split()
+            if n >= len(words):
+                n -= len(words)
+                continue
+            if n:
+                segment.text = " ".join(words[n:])
+                if len(segment.words) == len(words):
+                    segment.words = segment.words[n:]
+                    segment.start_time = segment.words[0].start_time
+                n = 0
+            trimmed.append(segment)
+        return trimmed
+
+    def _overlap(self, source: str, start_time: float, end_time: float, words: list[str]) -> int:
+        """
+        Number of leading `words` repeated from the previous transcription of `source`.
+        """
+        duplicated = 0
+        last_words, last_end = self._last.get(source, ([], 0.0))
+        if last_words and start_time < last_end:
+            normalize = lambda w: w.strip(string.punctuation).lower()
+            previous = [normalize(w) for w in last_words[-self.MAX_OVERLAP_WORDS:]]
+            current = [normalize(w) for w in words[:self.MAX_OVERLAP_WORDS]]
+            for n in range(min(len(previous), len(current)), 0, -1):
+                if previous[-n:] == current[:n]:
+                    logger.debug("Dropping %d duplicated word(s) at seam: %s", n, " ".join(words[:n]))
+                    duplicated = n
+                    break
+
+        self._last[source] = (words, end_time)
+        return duplicated
+
 
 class TranscriptionService:
     """
     Background service for audio transcription.
 
     Consumes audio chunks from the input queue, transcribes them using the WhisperEngine,
-    and pushes the resulting text segments to the output queue.
+    and pushes one text segment per Whisper segment to the output queue, timed on the session
+    clock (with word timings when enabled). Segments the HallucinationFilter rejects are never
+    published, and words repeated at the seam of overlapping chunks (long speech split by the
+    ingest service) are dropped.
+
+    When utterances back up, every chunk that is ready (up to `batch_size`, waiting at most
+    `batch_wait` seconds for more) is decoded in one batch; segments keep their order.
+
+    With an AdaptiveDecoder, decoding degrades (greedy, then the smaller fallback model from
+    `fallback_factory`) while the service falls behind real time and recovers when it catches
+    up; every segment records the decoder that produced it.
+
+    Without a configured language, a LanguageDetector picks the session language from the
+    first utterances and later ones are decoded in it, skipping per-utterance detection.
+
+    Audio of utterances still in progress (`is_final=False`) is accumulated per source and
+    re-decoded whenever the queue is idle; words that two successive decodes agree on are
+    published as partial segments (`is_final=False`) until the final chunk arrives.
     """
+    PARTIAL_GAP = 0.05  # seconds; a larger jump between increments starts a new utterance
+
     def __init__(self, 
                  input_queue: ProcessQueue, 
                  output_queue: ProcessQueue, 
-                 engine_factory: Callable[[], WhisperEngine] = lambda: WhisperEngine()):
+                 engine_factory: Callable[[], WhisperEngine] = lambda: WhisperEngine(),
+                 batch_size: int = 8,
+                 batch_wait: float = 0.05,
+                 trim_overlap: bool = True,
+                 hallucination_filter: HallucinationFilter | None = None,
+                 adaptive: AdaptiveDecoder | None = None,
+                 fallback_factory: Callable[[], WhisperEngine] | None = None,
+                 language_detector: LanguageDetector | None = None,
+                 readiness: ReadinessReporter | None = None,
+                 warmup: bool = False,
+                 backlog: Callable[[], int] | None = None):
         self.input_queue = input_queue
         self.output_queue = output_queue
         self.engine_factory = engine_factory
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.trimmer = OverlapTrimmer() if trim_overlap else None
+        self.hallucination_filter = hallucination_filter
+        self.adaptive = adaptive
+        self.fallback_factory = fallback_factory
+        self.fallback_engine = None
+        self.language_detector = language_detector
+        self.readiness = readiness
+        self.warmup = warmup
+        self.backlog = backlog or self.input_queue.qsize   # utterances waiting, seen by the adaptive decoder
+        self._partials: dict[str, PartialUtterance] = {}
 
     def run(self):
         logger.info("Starting transcription service")
 
-        self.engine = self.engine_factory()
-        self.engine.load()
+        try:
+            self._load_engines()
+        except Exception as e:
+            if self.readiness is not None:
+                self.readiness.failed(e)
+            raise
+        if self.readiness is not None:
+            self.readiness.ready()
 
         logger.info("Transcription service started")
         
-        while True:
+        running = True
+        while running:
+            batch, emitted = [], 0
             try:
                 chunk: AudioChunk = self.input_queue.get()
 
                 if chunk is None:
-                    logger.info("Transcription service stopped")
                     break
 
+                if not chunk.is_final:
+                    self._add_partial(chunk)
+                    self._decode_partials()
+                    continue
+
+                self._partials.pop(chunk.source, None)
+                batch, running = self._collect_batch(chunk)
+
+                engine, beam_size = self._decoder()
+                decoder = f"{engine.model_size} beam={beam_size}"
+                if self.language_detector is not None:
+                    engine.language = self.language_detector.next_language(len(batch))
                 start_time = time.time()
-                text = self.engine.transcribe(chunk.data)
-                
-                if text:
-                    end_time = time.time()
-                    duration = end_time - start_time
-
-                    segment = TranscriptionSegment(
-                        text=text,
-                        start_time=chunk.timestamp,
-                        end_time=chunk.timestamp + chunk.duration,
-                        duration=duration,
-                    )
-
-                    logger.info("Transcription: %s (%.2fs)", text, duration)
-                    self.output_queue.put(segment)
+                decoded = self._decode_batch(engine, batch, beam_size)
+                end_time = time.time()
+                if self.language_detector is not None and engine.detected is not None:
+                    self.language_detector.observe(*engine.detected)
+                duration = end_time - start_time
+                audio_seconds = sum(c.duration for c in batch)
+                if len(batch) > 1:
+                    logger.info("Decoded batch of %d chunks (%.1fs of audio) in %.2fs",
+                                len(batch), audio_seconds, duration)
+                if self.adaptive is not None:
+                    self.adaptive.observe(self.backlog(), audio_seconds, duration)
+
+                for chunk, whisper_segments in zip(batch, decoded):
+                    if whisper_segments is None:
+                        self._emit_failed([chunk])
+                        emitted += 1
+                        continue
+                    if self.hallucination_filter is not None:
+                        whisper_segments = self.hallucination_filter.filter(whisper_segments)
+                    segments = self._to_transcriptions(chunk, whisper_segments, duration, decoder)
+                    if self.trimmer is not None:
+                        segments = self.trimmer.trim(chunk.source, chunk.timestamp,
+                                                   chunk.timestamp + chunk.duration, segments)
+                    for segment in segments:
+                        logger.info("Transcription: %s (%.2fs)", segment.text, duration)
+                    self._emit(chunk, segments)
+                    emitted += 1
+
+                self._decode_partials()
             except Exception as e:
                 logger.error("Error in transcription service: %s", e)
+                self._emit_failed(batch[emitted:])
                 continue
 
-def run_transcription_service(input_queue: ProcessQueue, output_queue: ProcessQueue, log_file: str | None = None):
+        if self.hallucination_filter is not None and self.hallucination_filter.rejected:
+            logger.info("Rejected %d hallucinated segment(s): %s",
+                        sum(self.hallucination_filter.rejected.values()),
+                        dict(self.hallucination_filter.rejected))
+        logger.info("Transcription service stopped")
+
+    def _load_engines(self):
+        """
+        Load the main and fallback models side by side, warming them up if requested.
+        """
+        self.engine = self.engine_factory()
+        loaders = {f"Whisper {self.engine.model_size}": lambda: self._load_engine(self.engine)}
+        if self.fallback_factory is not None:
+            self.fallback_engine = self.fallback_factory()
+            loaders[f"Whisper {self.fallback_engine.model_size} (fallback)"] = (
+                lambda: self._load_engine(self.fallback_engine))
+        load_parallel(loaders, self.readiness)
+
+    def _load_engine(self, engine: WhisperEngine):
+        engine.load()
+        if self.warmup:
+            # The first decode allocates buffers and compiles kernels; pay for it now
+            engine.transcribe(np.zeros(WhisperEngine.SAMPLE_RATE, dtype=np.float32), beam_size=1)
+
+    def _decode_batch(self, engine: WhisperEngine, batch: list[AudioChunk],
+                      beam_size: int) -> list[list[WhisperSegment] | None]:
+        """
+        Decode the batch in one call. If that fails, decode its utterances one at a time so
+        that only the ones that fail on their own are lost (None in the result).
+        """
+        if len(batch) > 1:
+            try:
+                return engine.transcribe_batch([c.data for c in batch], beam_size)
+            except Exception as e:
+                logger.warning("Batched decode of %d chunks failed (%s), decoding them one by one",
+                               len(batch), e)
+        decoded = []
+        for chunk in batch:
+            try:
+                decoded.append(engine.transcribe(chunk.data, beam_size))
+            except Exception as e:
+                logger.error("Decoding chunk at %.2fs failed: %s", chunk.timestamp, e)
+                decoded.append(None)
+        return decoded
+
+    def _decoder(self) -> tuple[WhisperEngine, int]:
+        """
+        Engine and beam size for the next decode.
+        """
+        if self.adaptive is None:
+            return self.engine, 5
+        profile = self.adaptive.profile
+        engine = self.fallback_engine if profile.fallback and self.fallback_engine is not None else self.engine
+        return engine, profile.beam_size
+
+    @staticmethod
+    def _to_transcriptions(chunk: AudioChunk, whisper_segments: list[WhisperSegment],
+                           duration: float, decoder: str | None = None) -> list[TranscriptionSegment]:
+        """
+        Place the engine's segments (timed from the start of the chunk) on the session clock.
+        """
+        end = chunk.timestamp + chunk.duration
+        clock = lambda t: min(chunk.timestamp + max(t, 0.0), end)
+        return [
+            TranscriptionSegment(
+                text=seg.text,
+                start_time=clock(seg.start),
+                end_time=clock(seg.end),
+                duration=duration,
+                source=chunk.source,
+                words=[WordTiming(w.word, clock(w.start_time), clock(w.end_time), w.probability)
+                       for w in seg.words],
+                decoder=decoder,
+            )
+            for seg in whisper_segments if seg.text
+        ]
+
+    def _collect_batch(self, first: AudioChunk) -> tuple[list[AudioChunk], bool]:
+        """
+        Gather the chunks ready after `first`, up to `batch_size` or `batch_wait` seconds.
+        With nothing else queued, `first` is decoded right away.
+        Returns the batch and whether the stream continues (False once None was received).
+        """
+        batch = [first]
+        if self.backlog() == 0:
+            return batch, True
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.input_queue.get(timeout=remaining) if remaining > 0 else self.input_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, False
+            if not item.is_final:
+                self._add_partial(item)
+                continue
+            self._partials.pop(item.source, None)
+            batch.append(item)
+        return batch, True
+
+    def _add_partial(self, chunk: AudioChunk):
+        """
+        Append in-progress audio to the partial utterance of its source.
+        """
+        partial = self._partials.get(chunk.source)
+        if partial is None or abs(chunk.timestamp - partial.end_time) > self.PARTIAL_GAP:
+            partial = self._partials[chunk.source] = PartialUtterance(chunk.timestamp, chunk.timestamp)
+        partial.append(chunk.data, chunk.timestamp + chunk.duration)
+
+    def _decode_partials(self):
+        """
+        Re-decode partial utterances with new audio, unless more work is already queued
+        (partials must never delay final transcriptions).
+        """
+        for source, partial in list(self._partials.items()):
+            if not partial.stale or self.input_queue.qsize() > 0:
+                continue
+            partial.stale = False
+
+            if self.language_detector is not None:
+                self.engine.language = self.language_detector.shared.get()
+            start_time = time.time()
+            words = self.engine.transcribe_partial(np.concatenate(partial.audio)).split()
+            committed = partial.agreement.update(words)
+            if len(committed) <= partial.sent_words:
+                continue
+            partial.sent_words = len(committed)
+
+            self._emit_partial(TranscriptionSegment(
+                text=" ".join(committed),
+                start_time=partial.start_time,
+                end_time=partial.end_time,
+                duration=time.time() - start_time,
+                is_final=False,
+                source=source,
+            ))
+            logger.debug("Partial (%s): %s", source, " ".join(committed))
+
+    def _emit(self, chunk: AudioChunk, segments: list[TranscriptionSegment]):
+        """
+        Publish the transcription of a final chunk (no segments when it produced no text).
+        """
+        for segment in segments:
+            self.output_queue.put(segment)
+
+    def _emit_failed(self, chunks: list[AudioChunk]):
+        """
+        Final chunks whose decoding failed; they produce no transcription.
+        """
+
+    def _emit_partial(self, segment: TranscriptionSegment):
+        self.output_queue.put(segment)
+
+def run_transcription_service(input_queue: ProcessQueue, output_queue: ProcessQueue, log_file: str | None = None,
+                              session_language: SessionLanguage | None = None,
+                              readiness: ReadinessReporter | None = None,
+                              threads: StageThreads | None = None):
     from bailiff.core.logging import setup_logging
     setup_logging(log_file=log_file)
-    service = TranscriptionService(input_queue, output_queue)
-    service.run()
\ No newline at end of file
+    apply_threads(threads)
+    from bailiff.core.config import settings
+    cpu_threads = threads.intra_op if threads else settings.transcription.cpu_threads
+    num_workers = threads.inter_op if threads else 1
+    service = TranscriptionService(input_queue, output_queue,
+                                   engine_factory=lambda: WhisperEngine(cpu_threads=cpu_threads, num_workers=num_workers),
+                                   batch_size=settings.transcription.batch_size,
+                                   batch_wait=settings.transcription.batch_wait,
+                                   hallucination_filter=create_hallucination_filter(settings.transcription),
+                                   adaptive=create_adaptive_decoder(settings.transcription),
+                                   fallback_factory=fallback_engine_factory(settings.transcription, cpu_threads),
+                                   language_detector=create_language_detector(settings.transcription, session_language),
+                                   readiness=readiness,
+                                   warmup=settings.pipeline.warmup)
+    service.run()
+
+
+def fallback_engine_factory(config, cpu_threads: int | None = None) -> Callable[[], WhisperEngine] | None:
+    """
+    Factory of the smaller model used under load, or None when no fallback model is set.
+    """
+    if not config.adaptive_decoding or config.fallback_model is None:
+        return None
+    threads = config.cpu_threads if cpu_threads is None else cpu_threads
+    return lambda: WhisperEngine(model_size=config.fallback_model, cpu_threads=threads)
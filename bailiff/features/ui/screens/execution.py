@@ -76,6 +76,13 @@ class ExecutionScreen(Screen):
         self.run_worker(self.monitor_transcription, thread=True)
         self.run_worker(self.monitor_answers, thread=True)
 
+        self._lagging = False
+        self._dropped = 0
+        self.set_interval(2.0, self.monitor_pipeline)
+
+        self._failed_stages = set()
+        self._startup_timer = self.set_interval(0.5, self.monitor_startup)
+
     def monitor_transcription(self):
         """
         Monitor the merged (transcription + diarization) queue and update the UI.
@@ -83,6 +90,7 @@ class ExecutionScreen(Screen):
         """
         logger.info("Starting transcription monitor")
         transcript_list = self.query_one("#transcript", VerticalScroll)
+        live_items = {}  # source -> item showing the partial transcript in progress
 
         while True:
             try:
@@ -99,16 +107,86 @@ class ExecutionScreen(Screen):
             if segment is None:
                 break
 
+            # Partial transcripts (and the final segment that completes them) update in place
+            item = live_items.pop(segment.source, None)
+            if not segment.is_final:
+                if item is not None:
+                    live_items[segment.source] = item
+                    self.app.call_from_thread(item.update_segment, segment)
+                    continue
+                item = live_items[segment.source] = TranscriptItem(segment)
+                self.app.call_from_thread(transcript_list.mount, item)
+                self.app.call_from_thread(item.scroll_visible)
+                continue
+
             # Forward to memory service
             try:
                 self.session_manager.q_memory.put(segment)
             except Exception as e:
                 logger.error("Error forwarding to memory queue: %s", e)
 
+            if item is not None:
+                self.app.call_from_thread(item.update_segment, segment)
+                continue
             item = TranscriptItem(segment)
             self.app.call_from_thread(transcript_list.mount, item)
             self.app.call_from_thread(item.scroll_visible)
 
+    def monitor_startup(self):
+        """
+        Show which stages are still loading their models, until the pipeline is ready or
+        every stage has either loaded or failed.
+        """
+        if not hasattr(self, 'session_manager'):
+            return
+        statuses = self.session_manager.stage_status()
+
+        for status in statuses:
+            if status.state == "failed" and status.stage not in self._failed_stages:
+                self._failed_stages.add(status.stage)
+                self.notify(f"{status.stage} failed to start: {status.detail}", severity="error")
+
+        ready_time = self.session_manager.time_to_ready
+        if ready_time is not None:
+            self.sub_title = ""
+            self.notify(f"Ready in {ready_time:.1f}s")
+            self._startup_timer.stop()
+            return
+
+        failed = self.session_manager.startup_failed
+        if failed:
+            self.sub_title = "Failed to start: " + ", ".join(s.stage for s in failed)
+            self.notify(f"Started without {len(failed)} stage(s), see the log for details",
+                        severity="error", timeout=10)
+            self._startup_timer.stop()
+            return
+
+        loading = [s for s in statuses if s.state == "loading"]
+        done = len(statuses) - len(loading)
+        self.sub_title = f"Loading {done}/{len(statuses)}: " + ", ".join(
+            f"{s.stage} ({s.detail})" if s.detail else s.stage for s in loading)
+
+    def monitor_pipeline(self):
+        """
+        Warn when the pipeline falls behind real time or starts dropping audio.
+        """
+        if not hasattr(self, 'session_manager'):
+            return
+        status = self.session_manager.pipeline_status()
+
+        lagging = self.session_manager.is_lagging()
+        if lagging and not self._lagging:
+            slowest = max(status, key=lambda s: s.last_wait)
+            self.notify(f"Falling behind real time: {slowest.name} is {slowest.last_wait:.0f}s late",
+                        severity="warning")
+        self._lagging = lagging
+
+        dropped = sum(s.dropped for s in status)
+        if dropped > self._dropped:
+            self.notify(f"Pipeline overloaded: {dropped - self._dropped} utterance(s) dropped",
+                        severity="warning")
+            self._dropped = dropped
+
     def monitor_answers(self):
         """
         Monitor the answer queue and update the UI.
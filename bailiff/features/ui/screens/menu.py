@@ -4,7 +4,8 @@ from textual.containers import Container, Horizontal, Vertical
 from textual.screen import Screen
 from textual.widgets import Button, Footer, Header, Label, Static
 
-from bailiff.features.audio_ingest.capture import AudioCaptureManager
+from bailiff.core.config import settings
+from bailiff.features.audio_ingest.capture import get_capture_backend
 from bailiff.features.ui.screens.execution import ExecutionScreen
 from bailiff.features.ui.screens.list_meetings import ListMeetingsScreen
 
@@ -124,7 +125,7 @@ class MenuScreen(Screen):
         Check for audio devices in a background thread to avoid blocking UI.
         """
         try:
-            mgr = AudioCaptureManager()
+            mgr = get_capture_backend(settings.audio.capture_backend, settings.audio.loopback_source)
             
             # Check mic
             try:
@@ -22,7 +22,21 @@ class TranscriptItem(Static):
             
         super().__init__(**kwargs)
     
+    def update_segment(self, segment: TranscriptionSegment):
+        """
+        Replace the displayed segment (a partial transcript being refined or finalized).
+        """
+        self.segment = segment
+        self.text_content = segment.text
+        self.refresh(layout=True)
+
     def render(self) -> Text:
+        if self.segment and not self.segment.is_final:
+           return Text.assemble(
+               (f"[{self.segment.start_time:.1f}s - {self.segment.end_time:.1f}s] ", "dim"),
+               ("[…] ", "dim magenta"),
+               (self.text_content, "italic"),
+           )
         if self.segment:
            return Text.assemble(
                (f"[{self.segment.start_time:.1f}s - {self.segment.end_time:.1f}s] ", "dim"),
@@ -1,9 +1,63 @@
-from bailiff.features.ui.app import BailiffApp
+import argparse
+import sys
+
+
+def models_command(args) -> int:
+    """
+    `bailiff models ...`: manage the local model registry.
+    """
+    from bailiff.core.logging import setup_logging
+    from bailiff.core.model_registry import ModelRegistry, prefetch_all
+
+    setup_logging()
+    registry = ModelRegistry()
+
+    if args.action == "prefetch":
+        entries = prefetch_all(registry, convert=args.convert, only=args.only)
+        for entry in entries:
+            print(f"{entry.kind:16} {entry.source:50} {entry.format:12} {len(entry.files)} files")
+        print(f"Models stored in {registry.root}")
+        return 0
+
+    entries = registry.entries()
+    if not entries:
+        print(f"No models in {registry.root}; run `bailiff models prefetch`")
+        return 0 if args.action == "list" else 1
+
+    failed = 0
+    for key, entry in entries.items():
+        status = ""
+        if args.action == "verify":
+            bad = registry.verify(key)
+            failed += bool(bad)
+            status = "ok" if not bad else f"{len(bad)} file(s) missing or modified"
+        print(f"{entry.kind:16} {entry.source:50} {entry.format:12} {status}")
+    return 1 if failed else 0
+
 
 def main():
     """
     Entry point for the Bailiff application.
     """
+    parser = argparse.ArgumentParser(prog="bailiff", description="AI-powered meeting assistant")
+    commands = parser.add_subparsers(dest="command")
+
+    models = commands.add_parser("models", help="Manage locally stored models")
+    actions = models.add_subparsers(dest="action", required=True)
+    prefetch = actions.add_parser("prefetch", help="Download (and optionally convert) every configured model")
+    prefetch.add_argument("--convert", action="store_true",
+                          help="Convert to faster formats: CTranslate2 for Transformers Whisper checkpoints, "
+                               "ONNX for Silero VAD")
+    prefetch.add_argument("--only", nargs="+", choices=["whisper", "silero-vad", "ecapa", "embedding"],
+                          help="Only fetch these models")
+    actions.add_parser("list", help="List stored models")
+    actions.add_parser("verify", help="Check stored models against their checksums")
+
+    args = parser.parse_args()
+    if args.command == "models":
+        sys.exit(models_command(args))
+
+    from bailiff.features.ui.app import BailiffApp
     app = BailiffApp()
     app.run()
 
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from bailiff.features.diarization.centroids import SpeakerCentroids
+
+
+def unit(x: np.ndarray) -> np.ndarray:
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def test_scores_and_top_k_follow_similarity():
+    store = SpeakerCentroids()
+    eye = np.eye(4, dtype=np.float32)
+    for i in range(4):
+        store.add(f"Speaker {i}", eye[i])
+    query = unit(np.array([0.1, 0.9, 0.4, 0.0]))
+    np.testing.assert_allclose(store.scores(query), query)
+    assert [speaker for speaker, _ in store.top_k(query, 2)] == ["Speaker 1", "Speaker 2"]
+    assert len(store.top_k(query, 10)) == 4
+    assert SpeakerCentroids().top_k(query) == []
+
+
+def test_duplicate_speaker_is_rejected():
+    store = SpeakerCentroids()
+    store.add("a", unit(np.ones(3)))
+    with pytest.raises(ValueError):
+        store.add("a", unit(np.ones(3)))
+
+
+def test_update_keeps_unit_norm_weighted_centroid():
+    store = SpeakerCentroids()
+    i = store.add("a", np.array([1.0, 0.0], dtype=np.float32))
+    store.update(i, np.array([0.0, 1.0], dtype=np.float32))
+    store.update(i, np.array([0.0, 1.0], dtype=np.float32))
+    centroid = store.centroids[i]
+    assert np.linalg.norm(centroid) == pytest.approx(1.0)
+    assert centroid[1] > centroid[0] > 0
+    assert store.counts[i] == 3
+
+
+def test_variance_matches_numpy():
+    rng = np.random.default_rng(0)
+    embeddings = unit(rng.normal(size=(20, 8)))
+    store = SpeakerCentroids()
+    i = store.add("a", embeddings[0])
+    for emb in embeddings[1:]:
+        store.update(i, emb)
+    np.testing.assert_allclose(store.variance("a"), embeddings.var(axis=0, ddof=1), rtol=1e-4, atol=1e-6)
+    assert store.spread("a") == pytest.approx(float(embeddings.var(axis=0, ddof=1).mean()), rel=1e-4)
+
+
+def test_capacity_grows_without_losing_rows():
+    rng = np.random.default_rng(1)
+    embeddings = unit(rng.normal(size=(10, 6)))
+    store = SpeakerCentroids(capacity=2)
+    for n, emb in enumerate(embeddings):
+        store.add(f"s{n}", emb)
+    assert store.capacity >= 10 and len(store) == 10
+    np.testing.assert_array_equal(store.centroids, embeddings)
+    assert store.index("s7") == 7 and "s7" in store
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(2)
+    store = SpeakerCentroids()
+    for n, emb in enumerate(unit(rng.normal(size=(3, 5)))):
+        store.add(f"s{n}", emb)
+    store.update(0, unit(rng.normal(size=5)))
+    path = str(tmp_path / "speakers.npz")
+    store.save(path)
+
+    loaded = SpeakerCentroids.load(path)
+    assert loaded.ids == store.ids
+    np.testing.assert_array_equal(loaded.centroids, store.centroids)
+    np.testing.assert_array_equal(loaded.variance("s0"), store.variance("s0"))
+    loaded.add("s3", unit(rng.normal(size=5)))
+    assert len(loaded) == 4
+
+
+def test_empty_store_round_trip(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    SpeakerCentroids(dim=4).save(path)
+    loaded = SpeakerCentroids.load(path)
+    assert len(loaded) == 0 and loaded.centroids.shape == (0, 4)
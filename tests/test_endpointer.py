@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from bailiff.core.config import AudioConfig
+from bailiff.features.audio_ingest.endpointer import Endpointer
+
+CHUNK = 0.1   # seconds per chunk in these tests
+
+
+def feed(endpointer: Endpointer, probs: list[float], energies: list[float] | None = None):
+    """Feed one chunk per probability; returns every completed segment."""
+    segments = []
+    for i, prob in enumerate(probs):
+        level = energies[i] if energies else prob
+        data = np.full(4, level, dtype=np.float32)
+        segments += endpointer.process(data, prob, i * CHUNK)
+    return segments
+
+
+def make(**kwargs) -> Endpointer:
+    options = dict(smoothing=1.0, min_silence=0.3, speech_pad=0.2, min_speech=0.2)
+    options.update(kwargs)
+    return Endpointer(CHUNK, **options)
+
+
+def test_utterance_is_padded_and_trimmed():
+    endpointer = make()
+    segments = feed(endpointer, [0.0] * 5 + [1.0] * 5 + [0.0] * 5)
+    assert len(segments) == 1
+    segment = segments[0]
+    assert segment.start_time == pytest.approx(0.3)      # two chunks of padding before speech
+    assert segment.speech_end == pytest.approx(1.0)
+    assert len(segment.chunks) == 2 + 5 + 2               # padding, speech, padding
+    assert not endpointer.in_speech
+
+
+def test_short_speech_is_discarded():
+    endpointer = make(min_speech=0.5)
+    assert feed(endpointer, [0.0, 1.0, 1.0, 0.0, 0.0, 0.0]) == []
+    assert endpointer.discarded == 1
+
+
+def test_hysteresis_keeps_utterance_open_between_thresholds():
+    endpointer = make(start_threshold=0.6, stop_threshold=0.3)
+    segments = feed(endpointer, [0.7] + [0.4] * 10 + [0.0] * 3)
+    assert len(segments) == 1
+    assert segments[0].speech_end == pytest.approx(1.1)
+
+
+def test_flush_closes_open_utterance():
+    endpointer = make()
+    assert feed(endpointer, [1.0] * 4) == []
+    segments = endpointer.flush()
+    assert len(segments) == 1 and len(segments[0].chunks) == 4
+    assert endpointer.flush() == []
+
+
+def test_long_speech_is_split_at_quietest_chunk_with_overlap():
+    endpointer = make(max_segment=1.0, overlap=0.2, search_window=0.5)
+    energies = [1.0] * 7 + [0.1] + [1.0] * 2
+    segments = feed(endpointer, [1.0] * 10, energies)
+    assert len(segments) == 1
+    first = segments[0]
+    assert len(first.chunks) == 8                          # cut right after the quiet chunk
+    assert first.speech_end == pytest.approx(0.8)
+    assert endpointer.start_time == pytest.approx(0.6)     # next segment repeats the overlap
+    assert len(endpointer.buffered) == 4
+
+    segments = feed(endpointer, [1.0] * 30)
+    assert segments and all(len(s.chunks) <= endpointer.max_chunks for s in segments)
+
+
+@pytest.mark.parametrize("max_segment, overlap", [(0.3, 0.5), (0.3, 0.2), (0.1, 0.0)])
+def test_split_without_room_is_rejected(max_segment, overlap):
+    with pytest.raises(ValueError):
+        make(max_segment=max_segment, overlap=overlap)
+
+
+def test_smallest_valid_split_does_not_crash():
+    endpointer = make(max_segment=0.3, overlap=0.1)
+    segments = feed(endpointer, [1.0] * 20)
+    assert segments and all(len(s.chunks) <= 3 for s in segments)
+
+
+def test_audio_config_rejects_unsplittable_segments():
+    with pytest.raises(ValidationError):
+        AudioConfig(max_segment_duration=0.3, segment_overlap=0.5)
+    with pytest.raises(ValidationError):
+        AudioConfig(segment_overlap=-1.0)
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("faster_whisper")
+
+from bailiff.core.events import TranscriptionSegment, WordTiming
+from bailiff.features.transcription.service import OverlapTrimmer
+
+
+def segment(text: str, start: float, end: float, source: str = "mixed", timed: bool = False) -> TranscriptionSegment:
+    words = []
+    if timed:
+        step = (end - start) / len(text.split())
+        words = [WordTiming(w, start + i * step, start + (i + 1) * step) for i, w in enumerate(text.split())]
+    return TranscriptionSegment(text, start, end, end - start, source=source, words=words)
+
+
+def test_repeated_words_at_seam_are_dropped():
+    trimmer = OverlapTrimmer()
+    trimmer.trim("mixed", 0.0, 15.0, [segment("we should ship the release on Friday", 0.0, 15.0)])
+    trimmed = trimmer.trim("mixed", 14.5, 20.0, [segment("on friday, and then rest", 14.5, 20.0)])
+    assert [s.text for s in trimmed] == ["and then rest"]
+
+
+def test_word_timings_follow_the_trim():
+    trimmer = OverlapTrimmer()
+    trimmer.trim("mixed", 0.0, 10.0, [segment("see you tomorrow", 0.0, 10.0)])
+    trimmed = trimmer.trim("mixed", 9.5, 12.0, [segment("tomorrow morning then", 9.5, 12.0, timed=True)])
+    assert [w.word for w in trimmed[0].words] == ["morning", "then"]
+    assert trimmed[0].start_time == trimmed[0].words[0].start_time
+
+
+def test_fully_repeated_segments_are_removed():
+    trimmer = OverlapTrimmer()
+    trimmer.trim("mixed", 0.0, 10.0, [segment("thanks everyone", 0.0, 10.0)])
+    trimmed = trimmer.trim("mixed", 9.5, 12.0, [segment("everyone", 9.5, 10.0), segment("bye", 10.0, 12.0)])
+    assert [s.text for s in trimmed] == ["bye"]
+
+
+def test_no_trim_without_time_overlap_or_across_sources():
+    trimmer = OverlapTrimmer()
+    trimmer.trim("mic", 0.0, 10.0, [segment("good morning", 0.0, 10.0, "mic")])
+    after_gap = trimmer.trim("mic", 12.0, 14.0, [segment("morning again", 12.0, 14.0, "mic")])
+    assert [s.text for s in after_gap] == ["morning again"]
+
+    other = trimmer.trim("loopback", 13.5, 16.0, [segment("again we start", 13.5, 16.0, "loopback")])
+    assert [s.text for s in other] == ["again we start"]
@@ -0,0 +1,63 @@
+import queue
+
+import pytest
+
+pytest.importorskip("faster_whisper")
+
+from bailiff.core.events import TranscriptionSegment
+from bailiff.core.queues import BoundedQueue
+from bailiff.features.transcription.pool import TranscriptionPool, WorkerResult
+
+
+def make_pool(workers: int = 2) -> TranscriptionPool:
+    work_queues = [BoundedQueue(f"w{i}", 2, local=True) for i in range(workers)]
+    return TranscriptionPool(BoundedQueue("in", local=True), queue.Queue(), work_queues, queue.Queue())
+
+
+def result(worker: int, seq: int, text: str | None = None, final: bool = True) -> WorkerResult:
+    start = seq * 2.0
+    segments = [TranscriptionSegment(text, start, start + 1.0, 1.0, is_final=final)] if text else []
+    return WorkerResult(worker, seq if final else None, segments, start, start + 1.0)
+
+
+def collect(pool: TranscriptionPool, results: list[WorkerResult]) -> list[str]:
+    for r in results:
+        pool.result_queue.put(r)
+    for worker in range(len(pool.work_queues)):
+        pool.result_queue.put(WorkerResult(worker, None, [], done=True))
+    pool._collect()
+    return [s.text for s in pool.output_queue.queue]
+
+
+def test_results_are_released_in_sequence_order():
+    pool = make_pool()
+    texts = collect(pool, [result(1, 2, "two"), result(0, 0, "zero"), result(1, 3, "three"),
+                           result(0, 1, "one")])
+    assert texts == ["zero", "one", "two", "three"]
+
+
+def test_empty_and_failed_chunks_do_not_hold_back_the_rest():
+    pool = make_pool()
+    texts = collect(pool, [result(1, 1), result(0, 2, "two"), result(0, 0, "zero")])
+    assert texts == ["zero", "two"]
+
+
+def test_missing_result_is_skipped_after_timeout(monkeypatch):
+    pool = make_pool()
+    monkeypatch.setattr(TranscriptionPool, "MISSING_TIMEOUT", -1.0)
+    texts = collect(pool, [result(0, 0, "zero"), result(0, 2, "two"), result(1, 1, "late")])
+    # #1 was given up on before it arrived, so its late result is dropped
+    assert texts == ["zero", "two"]
+
+
+def test_remaining_results_are_released_when_workers_stop():
+    pool = make_pool()
+    texts = collect(pool, [result(0, 1, "one"), result(0, 3, "three")])
+    assert texts == ["one", "three"]
+
+
+def test_partials_of_finalized_utterances_are_dropped():
+    pool = make_pool()
+    texts = collect(pool, [result(0, 0, "partial zero", final=False), result(0, 0, "zero"),
+                           result(1, 0, "stale partial", final=False)])
+    assert texts == ["partial zero", "zero"]
@@ -0,0 +1,112 @@
+import queue
+
+import numpy as np
+import pytest
+
+from bailiff.core.events import AudioChunk
+from bailiff.core.queues import BLOCK, COALESCE, DROP_OLDEST, BoundedQueue, merge_audio_chunks
+
+RATE = 16000
+
+
+def chunk(timestamp: float, duration: float = 1.0, value: float = 0.0, source: str = "mixed",
+          is_final: bool = True) -> AudioChunk:
+    data = np.full(int(duration * RATE), value, dtype=np.float32)
+    return AudioChunk(data, RATE, timestamp, duration, source=source, is_final=is_final)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueue("q", 2, policy="newest")
+
+
+def test_block_put_waits_for_room():
+    q = BoundedQueue("q", 2, BLOCK, local=True)
+    q.put(1)
+    q.put(2)
+    with pytest.raises(queue.Full):
+        q.put(3, timeout=0.01)
+    assert q.get() == 1
+    q.put(3, timeout=0.01)
+    assert [q.get(), q.get()] == [2, 3]
+    assert q.stats().dropped == 0
+
+
+def test_drop_oldest_keeps_newest_items():
+    q = BoundedQueue("q", 3, DROP_OLDEST, local=True)
+    for i in range(5):
+        q.put(i)
+    assert [q.get_nowait() for _ in range(3)] == [2, 3, 4]
+    stats = q.stats()
+    assert (stats.put, stats.dropped) == (5, 2)
+
+
+def test_drop_oldest_never_drops_end_of_stream():
+    q = BoundedQueue("q", 1, DROP_OLDEST, local=True)
+    q.put(None)
+    with pytest.raises(queue.Full):
+        q.put(None, timeout=0.01)
+    assert q.get() is None
+
+
+def test_offer_skips_when_full_whatever_the_policy():
+    for policy in (BLOCK, DROP_OLDEST, COALESCE):
+        q = BoundedQueue("q", 1, policy, local=True)
+        assert q.offer(1)
+        assert not q.offer(2)
+        assert q.get() == 1
+        assert q.stats().dropped == 1
+
+
+def test_coalesce_merges_contiguous_chunks():
+    q = BoundedQueue("q", 4, COALESCE, local=True)
+    for i in range(3):
+        q.put(chunk(float(i), value=i))
+    merged = q.get()
+    assert (merged.timestamp, merged.duration) == (0.0, 3.0)
+    np.testing.assert_array_equal(merged.data[::RATE], [0.0, 1.0, 2.0])
+    assert q.empty()
+    assert q.stats().merged == 2
+
+
+def test_coalesce_keeps_sources_gaps_and_partials_apart():
+    q = BoundedQueue("q", 8, COALESCE, local=True, max_gap=1.0)
+    q.put(chunk(0.0, source="mic"))
+    q.put(chunk(1.0, source="loopback"))
+    q.put(chunk(5.0, source="loopback"))                 # 3s after the previous one
+    q.put(chunk(6.0, source="loopback", is_final=False))
+    got = [q.get_nowait() for _ in range(4)]
+    assert [(c.source, c.timestamp) for c in got] == [("mic", 0.0), ("loopback", 1.0),
+                                                        ("loopback", 5.0), ("loopback", 6.0)]
+    assert q.stats().merged == 0
+
+
+def test_coalesce_respects_max_duration():
+    q = BoundedQueue("q", 8, COALESCE, local=True, max_coalesce=2.0)
+    for i in range(4):
+        q.put(chunk(float(i)))
+    assert [q.get_nowait().duration for _ in range(2)] == [2.0, 2.0]
+
+
+def test_coalesce_holds_back_at_most_one_item():
+    q = BoundedQueue("q", 4, COALESCE, local=True)
+    q.put(chunk(0.0, source="mic"))
+    q.put(chunk(0.0, source="loopback"))
+    q.put(chunk(1.0, source="loopback"))
+    q.put(chunk(2.0, source="loopback"))
+    assert q.get().source == "mic"
+    # The loopback chunk that stopped the merge waits outside; the rest stay in the queue
+    assert len(q._pending) == 1
+    assert q._queue.qsize() == 2
+    assert q.get().duration == 3.0
+
+
+def test_merge_audio_chunks_fills_gaps_and_drops_overlap():
+    first = chunk(0.0, value=1.0)
+    gap = merge_audio_chunks(first, chunk(1.5, value=2.0))
+    assert gap.duration == 2.5
+    assert gap.data[int(1.25 * RATE)] == 0.0
+
+    overlap = merge_audio_chunks(first, chunk(0.5, value=2.0))
+    assert overlap.duration == 1.5
+    assert overlap.data[RATE - 1] == 1.0 and overlap.data[RATE] == 2.0
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from bailiff.features.audio_ingest.resampler import StreamingResampler
+
+
+def signal(rate: int, seconds: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds)) / rate
+    tone = 0.5 * np.sin(2 * np.pi * 440.0 * t) + 0.05 * rng.standard_normal(len(t))
+    return tone.astype(np.float32)
+
+
+@pytest.mark.parametrize("source_rate", [44100, 48000, 22050, 8000])
+def test_streaming_matches_one_shot(source_rate):
+    audio = signal(source_rate)
+    expected = StreamingResampler(source_rate, 16000).process(audio)
+
+    resampler = StreamingResampler(source_rate, 16000)
+    rng = np.random.default_rng(1)
+    bounds = np.sort(rng.choice(np.arange(1, len(audio)), size=200, replace=False))
+    blocks = np.split(audio, bounds)
+    streamed = np.concatenate([resampler.process(block) for block in blocks])
+
+    np.testing.assert_allclose(streamed, expected, atol=1e-5)
+    assert resampler.consumed == len(audio)
+
+
+@pytest.mark.parametrize("source_rate, block", [(44100, 1411), (48000, 1536), (48000, 1)])
+def test_output_tracks_exact_length(source_rate, block):
+    resampler = StreamingResampler(source_rate, 16000)
+    audio = signal(source_rate, 0.5)
+    for start in range(0, len(audio), block):
+        resampler.process(audio[start:start + block])
+        assert -1.0 < resampler.lag <= 1.0
+
+
+def test_reset_restarts_the_stream():
+    resampler = StreamingResampler(48000, 16000)
+    audio = signal(48000, 0.1)
+    first = resampler.process(audio)
+    resampler.reset()
+    np.testing.assert_array_equal(resampler.process(audio), first)